@@ -10,5 +10,6 @@ Version: 1.0.0
 """
 
 ## 版本日志
-- v1.0.0 2025-12-28: 初始版本 - 成功
-- v1.1.0 2025-12-28: 添加差速控制器模块 - 待测试
\ No newline at end of file
+# - v1.0.0 2025-12-28: 初始版本 - 成功
+# - v1.1.0 2025-12-28: 添加差速控制器模块 - 待测试
+# - v1.2.0 2026-10-17: 添加车队控制器模块(fleet_controller)，以数组结构向量化控制N辆车 - 成功
@@ -6,12 +6,29 @@ This module implements the control algorithm for the electronic differential
 system based on the rollover risk predictions from the ML model. It adjusts
 wheel speeds to prevent rollover during turns and sudden movements.
 
-Version: 1.0.0
+Version: 1.8.2
 """
 
+## 版本日志
+# - v1.0.0 2025-12-28: 初始版本 - 待测试
+# - v1.1.0 2026-10-17: 控制步骤使用扁平特征向量 - 成功
+# - v1.2.0 2026-10-17: 新增model_path热启动，reset_control()重新加载模型 - 成功
+# - v1.3.0 2026-10-17: 新增ingest_sensor_data()与step_control()，采样与控制分离 - 成功
+# - v1.4.0 2026-10-17: 新增ingest_sensor_batch() - 成功
+# - v1.5.0 2026-10-17: 支持注入时钟 - 成功
+# - v1.6.0 2026-10-17: control_threshold参与控制判断 - 成功
+# - v1.7.0 2026-10-17: lookahead模式下传入陀螺仪趋势 - 成功
+# - v1.8.0 2026-10-17: 可选attitude姿态滤波器，处理器与预测器共享 - 成功
+# - v1.8.1 2026-10-17: 自检迁移至tests/test_differential_controller.py - 成功
+# - v1.8.2 2026-10-17: update_control()以控制器时钟为样本打时间戳，修复lookahead陀螺仪趋势恒为零 - 成功
+
 import time
+
+import numpy as np
+
 from ..ml.rollover_prediction import RolloverPredictor
 from ..sensors.data_processor import SensorDataProcessor
+from ..sensors import features as F
 
 
 class DifferentialController:
@@ -20,21 +37,35 @@ class DifferentialController:
     Uses ML predictions and sensor data to adjust wheel speeds in real-time.
     """
     
-    def __init__(self):
+    def __init__(self, model_path=None, clock=time.monotonic, attitude=None):
         """
         Initialize the differential controller.
+        
+        Args:
+            model_path (str, optional): Pre-trained model saved with
+                RolloverPredictor.save(), served from the first sample
+            clock (callable): Monotonic time source in seconds used for
+                rate limiting; a SimulatedClock runs the controller in
+                simulated time
+            attitude (ComplementaryFilter or AttitudeEKF, optional): Attitude
+                filter shared by the sensor processor (which updates it) and
+                the rollover predictor; None uses the accelerometer angles
         """
         # TODO: Implement differential control algorithm - HIGH - Developer
         # TODO: Integrate with ML rollover prediction model - HIGH - Developer
         # TODO: Implement real-time wheel speed adjustment - MEDIUM - Developer
         
-        self.rollover_predictor = RolloverPredictor()
-        self.sensor_processor = SensorDataProcessor()
+        self.model_path = model_path
+        self.clock = clock
+        self.attitude = attitude
+        self.rollover_predictor = self._create_predictor()
+        self.rollover_predictor.attitude = attitude
+        self.sensor_processor = SensorDataProcessor(attitude=attitude)
         
         # Control parameters
         self.max_wheel_diff = 0.3  # Maximum allowed wheel speed difference
         self.control_threshold = 0.3  # Risk threshold to activate control
-        self.last_control_time = time.time()
+        self.last_control_time = None  # clock() time of the last control step
         self.control_interval = 0.1  # Control update interval in seconds
         
         # Wheel control states
@@ -44,54 +75,62 @@ class DifferentialController:
         
         print("DifferentialController initialized")
 
-    def update_control(self, accel_data, gyro_data=None):
+    def ingest_sensor_data(self, accel_data, gyro_data=None, timestamp=np.nan):
         """
-        Update the differential control based on sensor data.
+        Buffer one IMU sample without running the control step.
+        
+        Every sample must go through here, whatever the control rate, so the
+        processor's window statistics see the full sensor stream.
         
         Args:
             accel_data (tuple): (x, y, z) acceleration values
             gyro_data (tuple, optional): (x, y, z) gyroscope values
-            
-        Returns:
-            dict: Control outputs for wheel speeds
+            timestamp (float, optional): Sample timestamp
         """
-        current_time = time.time()
-        
-        # Limit control update frequency
-        if current_time - self.last_control_time < self.control_interval:
-            return {
-                'left_wheel_speed': self.left_wheel_speed,
-                'right_wheel_speed': self.right_wheel_speed,
-                'control_active': self.control_active
-            }
+        self.sensor_processor.add_accel_data(accel_data, timestamp)
+        if gyro_data is not None:
+            self.sensor_processor.add_gyro_data(gyro_data, timestamp)
+
+    def ingest_sensor_batch(self, accel, gyro=None, timestamps=None):
+        """
+        Buffer a block of IMU samples without running the control step.
         
-        self.last_control_time = current_time
+        Args:
+            accel (np.ndarray): Acceleration values, shape (k, 3)
+            gyro (np.ndarray, optional): Gyroscope values, shape (k, 3)
+            timestamps (np.ndarray, optional): Timestamps, shape (k,)
+        """
+        self.sensor_processor.add_sensor_batch(accel, gyro, timestamps)
+
+    def step_control(self):
+        """
+        Run one control step on the buffered sensor data.
         
-        # Process sensor data
-        self.sensor_processor.add_accel_data(accel_data)
-        if gyro_data:
-            self.sensor_processor.add_gyro_data(gyro_data)
+        Returns:
+            dict: Control outputs for wheel speeds
+        """
+        self.last_control_time = self.clock()
         
-        # Get processed features
-        features = self.sensor_processor.get_processed_features()
-        if not features:
+        # Get processed features (flat vector, filled in place)
+        features = self.sensor_processor.get_feature_vector()
+        if features is None:
             return {
                 'left_wheel_speed': self.left_wheel_speed,
                 'right_wheel_speed': self.right_wheel_speed,
                 'control_active': False
             }
         
-        # Predict rollover risk
-        risk_assessment = self.rollover_predictor.predict_rollover_risk(
-            accel_data, gyro_data
-        )
+        # Predict rollover risk from the already computed features; with a
+        # look-ahead horizon the gyro trend over the window is used as well
+        gyro_trend = self.sensor_processor.get_gyro_trend() if self.rollover_predictor.lookahead else None
+        risk_assessment = self.rollover_predictor.predict_from_features(features, gyro_trend)
         
-        # Apply differential control if risk is detected
-        if risk_assessment['needs_control']:
+        # Apply differential control if the risk exceeds the control threshold
+        if risk_assessment['risk_score'] > self.control_threshold:
             self.control_active = True
             
             # Calculate differential based on roll angle
-            roll_angle = abs(features['orientation']['roll'])
+            roll = features[F.ROLL]
             
             # Adjust wheel speeds based on risk level
             base_speed = 1.0  # Base speed for normal operation
@@ -101,7 +140,7 @@ class DifferentialController:
             differential = min(self.max_wheel_diff, risk_factor * self.max_wheel_diff * 2)
             
             # Apply differential based on turn direction (sign of roll)
-            if features['orientation']['roll'] > 0:
+            if roll > 0:
                 # Turning right - slow down right wheel
                 self.left_wheel_speed = base_speed
                 self.right_wheel_speed = max(0.1, base_speed - differential)
@@ -123,6 +162,35 @@ class DifferentialController:
             'risk_assessment': risk_assessment
         }
 
+    def update_control(self, accel_data, gyro_data=None):
+        """
+        Update the differential control based on sensor data.
+        
+        The sample is always buffered, stamped with the controller's clock so
+        the gyro trend used by look-ahead risk has a time base; the control
+        step itself runs at most once per control_interval (the first call
+        always runs it).
+        
+        Args:
+            accel_data (tuple): (x, y, z) acceleration values
+            gyro_data (tuple, optional): (x, y, z) gyroscope values
+            
+        Returns:
+            dict: Control outputs for wheel speeds
+        """
+        self.ingest_sensor_data(accel_data, gyro_data, self.clock())
+        
+        # Limit control update frequency
+        if (self.last_control_time is not None
+                and self.clock() - self.last_control_time < self.control_interval):
+            return {
+                'left_wheel_speed': self.left_wheel_speed,
+                'right_wheel_speed': self.right_wheel_speed,
+                'control_active': self.control_active
+            }
+        
+        return self.step_control()
+
     def get_wheel_speeds(self):
         """
         Get the current wheel speeds.
@@ -139,8 +207,23 @@ class DifferentialController:
         self.left_wheel_speed = 0.0
         self.right_wheel_speed = 0.0
         self.control_active = False
-        self.rollover_predictor = RolloverPredictor()
-        self.sensor_processor = SensorDataProcessor()
+        self.last_control_time = None
+        if self.attitude is not None:
+            self.attitude.reset()
+        self.rollover_predictor = self._create_predictor()
+        self.rollover_predictor.attitude = self.attitude
+        self.sensor_processor = SensorDataProcessor(attitude=self.attitude)
+
+    def _create_predictor(self):
+        """
+        Create the rollover predictor, warm started from model_path if set.
+        
+        Returns:
+            RolloverPredictor: New predictor
+        """
+        if self.model_path is not None:
+            return RolloverPredictor.load(self.model_path)
+        return RolloverPredictor()
 
 
 def main():
@@ -161,6 +244,9 @@ def main():
     result = controller.update_control(risky_accel)
     print(f"High risk operation: {result}")
     
+    # Samples inside the control interval are buffered, not dropped
+    print(f"Buffered samples: {len(controller.sensor_processor.accel_data_buffer)}")
+    
     print("Differential controller test completed.")
 
 
@@ -0,0 +1,436 @@
+"""
+Troll-vs-Troll Project
+Fleet Controller Module
+
+This module runs the differential control logic for N carriers at once.
+FleetController keeps the state of all carriers as NumPy arrays
+(structure of arrays): the sliding accelerometer windows and their
+running mean/variance, the sliding gyro windows and their timestamps,
+the latest sample values, one preallocated (N, NUM_FEATURES) feature
+matrix and the wheel speeds. Each tick ingests one sample per carrier
+and, when the control interval has elapsed, computes features, risk and
+wheel commands for the whole fleet with a few array operations instead
+of N Python method calls.
+
+Per carrier the results match a DifferentialController fed the same
+samples through ingest_sensor_data()/update_control(): the running
+statistics use the same add/remove updates and periodic exact resync,
+the risk and wheel rules are the same comparisons, and with a look-ahead
+horizon the gyro trend is the same least-squares slope over the gyro
+window as SensorDataProcessor.get_gyro_trend(). Only NumPy's vectorized
+sqrt/arctan2 and summation order can differ from the scalar code in the
+last bit, so features and scores agree to rounding and control
+decisions are equal.
+
+All carriers are ticked together (one sample each per tick), as in fleet
+simulation or on a gateway that collects the latest sample of every
+carrier per period.
+
+Version: 1.3.1
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：数组结构向量化车队控制器 - 成功
+# - v1.1.0 2026-10-17: 控制参数支持逐车数组 - 成功
+# - v1.2.0 2026-10-17: 可选批量attitude姿态滤波器 - 成功
+# - v1.2.1 2026-10-17: 自检迁移至tests/test_fleet_controller.py - 成功
+# - v1.3.0 2026-10-17: lookahead模式下传入逐车陀螺仪趋势（SoA陀螺仪窗口） - 成功
+# - v1.3.1 2026-10-17: 姿态滤波器自检迁移至tests/test_fleet_controller.py - 成功
+
+import math
+import time
+
+import numpy as np
+
+from ..ml.rollover_prediction import RolloverPredictor
+from ..sensors import features as F
+
+
+class FleetController:
+    """
+    Vectorized differential control for a fleet of carriers.
+    """
+
+    def __init__(self, num_vehicles, window_size=10, model_path=None, clock=time.monotonic,
+                 resync_interval=1024, attitude=None):
+        """
+        Initialize the fleet controller.
+
+        Args:
+            num_vehicles (int): Number of carriers
+            window_size (int): Sliding window size of the feature statistics
+            model_path (str, optional): Pre-trained model saved with
+                RolloverPredictor.save(), shared by all carriers
+            clock (callable): Monotonic time source in seconds for rate limiting
+            resync_interval (int): Evictions between exact recomputations of
+                the window statistics (as in SlidingWindowStats)
+            attitude (ComplementaryFilter or AttitudeEKF, optional): Attitude
+                filter created with num_vehicles, updated with update_batch()
+                on every tick; None uses the accelerometer angles
+        """
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+
+        self.num_vehicles = num_vehicles
+        self.window_size = window_size
+        self.model_path = model_path
+        self.clock = clock
+        self.resync_interval = resync_interval
+        if attitude is not None and attitude.num_vehicles != num_vehicles:
+            raise ValueError(f"attitude filter must be created with num_vehicles={num_vehicles}")
+        self.attitude = attitude
+        self.rollover_predictor = self._create_predictor()
+
+        # Control parameters (scalars, or arrays of one value per carrier)
+        self.max_wheel_diff = 0.3  # Maximum allowed wheel speed difference
+        self.control_threshold = 0.3  # Risk threshold to activate control
+        self.last_control_time = None  # clock() time of the last control step
+        self.control_interval = 0.1  # Control update interval in seconds
+
+        self._allocate()
+
+        print("FleetController initialized")
+
+    def _create_predictor(self):
+        """
+        Create the shared rollover predictor, warm started from model_path if set.
+
+        Returns:
+            RolloverPredictor: New predictor
+        """
+        if self.model_path is not None:
+            return RolloverPredictor.load(self.model_path)
+        return RolloverPredictor()
+
+    def _allocate(self):
+        """
+        Allocate the per-carrier state arrays.
+        """
+        n = self.num_vehicles
+
+        # Sliding accelerometer windows, slot-major so a tick writes one slot
+        self._window = np.zeros((self.window_size, n, 3))
+        self._next = 0
+        self._evictions = 0
+        self.sample_count = 0
+
+        # Running window mean and sum of squared deviations per axis
+        self._mean = np.zeros((n, 3))
+        self._m2 = np.zeros((n, 3))
+
+        # Sliding gyro windows and their timestamps, for the gyro trend
+        self._gyro_window = np.zeros((self.window_size, n, 3))
+        self._gyro_times = np.full((self.window_size, n), np.nan)
+        self._gyro_next = 0
+        self.gyro_count = 0
+        self._gyro_trend = np.zeros((n, 3))
+
+        # Latest sample values and the feature matrix
+        self._latest_accel = np.zeros((n, 3))
+        self._latest_gyro = np.zeros((n, 3))
+        self._latest_timestamp = np.full(n, np.nan)
+        self._latest_magnitude = np.zeros(n)
+        self._previous_magnitude = np.zeros(n)
+        self.feature_matrix = np.zeros((n, F.NUM_FEATURES))
+
+        # Wheel control states
+        self.left_wheel_speed = np.zeros(n)
+        self.right_wheel_speed = np.zeros(n)
+        self.control_active = np.zeros(n, dtype=bool)
+
+    def ingest_sensor_data(self, accel, gyro=None, timestamps=np.nan):
+        """
+        Buffer one IMU sample per carrier without running the control step.
+
+        Args:
+            accel (np.ndarray): Acceleration values, shape (N, 3)
+            gyro (np.ndarray, optional): Gyroscope values, shape (N, 3)
+            timestamps (np.ndarray, optional): Sample timestamps, shape (N,) or scalar
+        """
+        accel = np.asarray(accel, dtype=np.float64)
+        if accel.shape != (self.num_vehicles, 3):
+            raise ValueError(f"Acceleration data must be an array of shape ({self.num_vehicles}, 3)")
+
+        window = self.window_size
+        slot = self._next
+        mean = self._mean
+        if self.sample_count >= window:
+            # Replace the oldest sample in one step (see SlidingWindowStats.push)
+            old = self._window[slot].copy()
+            delta = accel - old
+            old_mean = mean.copy()
+            mean += delta / window
+            self._m2 += delta * (accel - mean + old - old_mean)
+            self._window[slot] = accel
+            self._evictions += 1
+        else:
+            count = self.sample_count + 1
+            self._window[slot] = accel
+            delta = accel - mean
+            mean += delta / count
+            self._m2 += delta * (accel - mean)
+        self._next = (slot + 1) % window
+        self.sample_count += 1
+        if self.resync_interval and self._evictions >= self.resync_interval:
+            self.resync()
+
+        magnitude = self._previous_magnitude
+        self._previous_magnitude = self._latest_magnitude
+        np.sqrt((accel**2).sum(axis=1), out=magnitude)
+        self._latest_magnitude = magnitude
+        self._latest_accel[:] = accel
+        self._latest_timestamp[:] = timestamps
+        if gyro is not None:
+            self._latest_gyro[:] = gyro
+            slot = self._gyro_next
+            self._gyro_window[slot] = gyro
+            self._gyro_times[slot] = timestamps
+            self._gyro_next = (slot + 1) % window
+            self.gyro_count += 1
+            if self.attitude is not None:
+                self.attitude.update_batch(accel, gyro, timestamps)
+
+    def resync(self):
+        """
+        Recompute the window means and variances exactly from the stored windows.
+        """
+        self._evictions = 0
+        count = min(self.sample_count, self.window_size)
+        if count == 0:
+            return
+
+        # Exactly rounded sums, as SlidingWindowStats.resync() does with fsum
+        values = self._window[:count].transpose(1, 2, 0).reshape(-1, count)
+        means = np.fromiter(map(math.fsum, values.tolist()), dtype=np.float64, count=len(values)) / count
+        squares = (values - means[:, None])**2
+        m2 = np.fromiter(map(math.fsum, squares.tolist()), dtype=np.float64, count=len(values))
+        self._mean[:] = means.reshape(self.num_vehicles, 3)
+        self._m2[:] = m2.reshape(self.num_vehicles, 3)
+
+    def get_gyro_trend(self):
+        """
+        Least-squares slope of every carrier's gyro rates over its window.
+
+        Matches SensorDataProcessor.get_gyro_trend() per carrier. The
+        result is written in place and reused by the next call.
+
+        Returns:
+            np.ndarray: Angular accelerations in rad/s^2, shape (N, 3); zero
+                rows with fewer than 3 samples or without usable timestamps
+        """
+        trend = self._gyro_trend
+        count = min(self.gyro_count, self.window_size)
+        if count < 3:
+            trend[:] = 0.0
+            return trend
+
+        # Slot order does not matter for the slope
+        times = self._gyro_times[:count]
+        centered = times - times.mean(axis=0)
+        spread = (centered**2).sum(axis=0)
+        slope = np.einsum('kn,knj->nj', centered, self._gyro_window[:count])
+        usable = spread > 0.0  # also rejects NaN timestamps
+        trend[:] = 0.0
+        np.divide(slope, spread[:, None], out=trend, where=usable[:, None])
+        return trend
+
+    def get_feature_matrix(self):
+        """
+        Fill the feature matrix with the features of every carrier's latest sample.
+
+        The matrix is filled in place and reused by the next call.
+
+        Returns:
+            np.ndarray: Feature matrix, shape (N, NUM_FEATURES), or None if
+                no data is buffered
+        """
+        if self.sample_count == 0:
+            return None
+
+        matrix = self.feature_matrix
+        ax, ay, az = self._latest_accel.T
+        matrix[:, F.TIMESTAMP] = self._latest_timestamp
+        matrix[:, F.ACCEL_X:F.ACCEL_Z + 1] = self._latest_accel
+        matrix[:, F.ACCEL_MAGNITUDE] = self._latest_magnitude
+        matrix[:, F.GYRO_X:F.GYRO_Z + 1] = self._latest_gyro
+
+        # Tilt angles (pitch and roll)
+        matrix[:, F.PITCH] = np.arctan2(ax, np.sqrt(ay**2 + az**2)) * 180 / np.pi
+        matrix[:, F.ROLL] = np.arctan2(ay, az) * 180 / np.pi
+        if self.attitude is not None:
+            initialized = self.attitude.initialized
+            np.copyto(matrix[:, F.PITCH], self.attitude.pitch, where=initialized)
+            np.copyto(matrix[:, F.ROLL], self.attitude.roll, where=initialized)
+
+        # Rate of change and window statistics need at least 2 buffered samples
+        if min(self.sample_count, self.window_size) > 1:
+            count = min(self.sample_count, self.window_size)
+            np.abs(self._latest_magnitude - self._previous_magnitude, out=matrix[:, F.ACCEL_CHANGE_RATE])
+            matrix[:, F.ACCEL_MEAN_X:F.ACCEL_MEAN_Z + 1] = self._mean
+            np.sqrt(np.maximum(0.0, self._m2 / count), out=matrix[:, F.ACCEL_STD_X:F.ACCEL_STD_Z + 1])
+        else:
+            matrix[:, F.ACCEL_CHANGE_RATE:F.ACCEL_STD_Z + 1] = 0.0
+
+        return matrix
+
+    def step_control(self):
+        """
+        Run one control step for all carriers on the buffered sensor data.
+
+        Returns:
+            dict: Arrays of wheel speeds and control flags, plus the batch
+                risk assessment (the arrays are reused by the next step)
+        """
+        self.last_control_time = self.clock()
+
+        matrix = self.get_feature_matrix()
+        if matrix is None:
+            return {
+                'left_wheel_speed': self.left_wheel_speed,
+                'right_wheel_speed': self.right_wheel_speed,
+                'control_active': np.zeros(self.num_vehicles, dtype=bool)
+            }
+
+        # With a look-ahead horizon the gyro trend over the window is used as well
+        gyro_trend = self.get_gyro_trend() if self.rollover_predictor.lookahead else None
+        risk_assessment = self.rollover_predictor.predict_from_features_batch(matrix, gyro_trend)
+        needs_control = risk_assessment['risk_score'] > self.control_threshold
+        self.control_active[:] = needs_control
+
+        # More differential for higher risk, on the side of the roll
+        base_speed = 1.0
+        differential = np.minimum(self.max_wheel_diff,
+                                  risk_assessment['risk_score'] * self.max_wheel_diff * 2)
+        slowed = np.maximum(0.1, base_speed - differential)
+        roll_right = matrix[:, F.ROLL] > 0
+        self.left_wheel_speed[:] = np.where(needs_control & ~roll_right, slowed, base_speed)
+        self.right_wheel_speed[:] = np.where(needs_control & roll_right, slowed, base_speed)
+
+        return {
+            'left_wheel_speed': self.left_wheel_speed,
+            'right_wheel_speed': self.right_wheel_speed,
+            'control_active': self.control_active,
+            'risk_assessment': risk_assessment
+        }
+
+    def update_control(self, accel, gyro=None, timestamps=np.nan):
+        """
+        Ingest one sample per carrier and run the control step if due.
+
+        Args:
+            accel (np.ndarray): Acceleration values, shape (N, 3)
+            gyro (np.ndarray, optional): Gyroscope values, shape (N, 3)
+            timestamps (np.ndarray, optional): Sample timestamps
+
+        Returns:
+            dict: Control outputs (see step_control())
+        """
+        self.ingest_sensor_data(accel, gyro, timestamps)
+
+        # Limit control update frequency
+        if (self.last_control_time is not None
+                and self.clock() - self.last_control_time < self.control_interval):
+            return {
+                'left_wheel_speed': self.left_wheel_speed,
+                'right_wheel_speed': self.right_wheel_speed,
+                'control_active': self.control_active
+            }
+
+        return self.step_control()
+
+    def get_wheel_speeds(self):
+        """
+        Get the current wheel speeds.
+
+        Returns:
+            tuple: (left_wheel_speed, right_wheel_speed) arrays
+        """
+        return (self.left_wheel_speed, self.right_wheel_speed)
+
+    def reset_control(self):
+        """
+        Reset all carriers to the default state.
+        """
+        self.last_control_time = None
+        if self.attitude is not None:
+            self.attitude.reset()
+        self.rollover_predictor = self._create_predictor()
+        self._allocate()
+
+
+def main():
+    """
+    Main function demonstrating the fleet controller against single
+    controllers (the checks live in tests/test_fleet_controller.py).
+    """
+    from .differential_controller import DifferentialController
+    from ..utils.replay import SimulatedClock
+    from ..utils.trajectory_simulator import TrajectorySimulator
+
+    print("Fleet Controller demo...")
+
+    num_vehicles = 8
+    result = TrajectorySimulator(num_vehicles=num_vehicles, seed=21).run(30.0)
+    accel, gyro, timestamps = result['accel'], result['gyro'], result['timestamp']
+
+    for window_size in (1, 2, 10):
+        clock = SimulatedClock()
+        fleet = FleetController(num_vehicles, window_size=window_size, clock=clock, resync_interval=256)
+        singles = [DifferentialController(clock=clock) for _ in range(num_vehicles)]
+        for controller in singles:
+            controller.sensor_processor.__init__(window_size)
+            for stats in controller.sensor_processor.axis_stats:
+                stats.resync_interval = 256
+
+        worst = 0.0
+        mismatches = 0
+        for i, timestamp in enumerate(timestamps):
+            clock.set(timestamp)
+            output = fleet.update_control(accel[i], gyro[i], timestamp)
+            for v, controller in enumerate(singles):
+                expected = controller.update_control(tuple(accel[i, v]), tuple(gyro[i, v]))
+                mismatches += int(output['control_active'][v] != expected['control_active'])
+            if i % 97 == 0:
+                for v, controller in enumerate(singles):
+                    vector = controller.sensor_processor.get_feature_vector()
+                    worst = max(worst, np.max(np.abs(fleet.get_feature_matrix()[v, 1:] - vector[1:])))
+        print(f"  window {window_size}: {len(timestamps)} ticks x {num_vehicles} carriers, "
+              f"{mismatches} control decisions differ from DifferentialController "
+              f"(max feature difference {worst:.1e})")
+
+    # With an attitude filter the fleet matches controllers sharing scalar filters
+    from ..sensors.attitude import AttitudeEKF, ComplementaryFilter
+    for factory in (ComplementaryFilter, AttitudeEKF):
+        clock = SimulatedClock()
+        fleet = FleetController(num_vehicles, clock=clock, attitude=factory(num_vehicles))
+        singles = [DifferentialController(clock=clock, attitude=factory()) for _ in range(num_vehicles)]
+        mismatches = 0
+        for i, timestamp in enumerate(timestamps):
+            clock.set(timestamp)
+            output = fleet.update_control(accel[i], gyro[i])
+            for v, controller in enumerate(singles):
+                expected = controller.update_control(tuple(accel[i, v]), tuple(gyro[i, v]))
+                mismatches += int(output['control_active'][v] != expected['control_active'])
+        print(f"  {factory.__name__}: {len(timestamps)} ticks x {num_vehicles} carriers, "
+              f"{mismatches} control decisions differ from DifferentialController")
+
+    # Throughput: one control step per tick
+    rng = np.random.default_rng(0)
+    for num_vehicles in (10, 1000, 100000):
+        fleet = FleetController(num_vehicles)
+        accel = rng.normal((0.0, 0.0, 9.81), (1.0, 1.5, 0.5), size=(num_vehicles, 3))
+        gyro = rng.normal(0.0, 0.1, size=(num_vehicles, 3))
+        ticks = max(20, 200000 // num_vehicles)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            fleet.ingest_sensor_data(accel, gyro)
+            fleet.step_control()
+        elapsed = (time.perf_counter() - start) / ticks
+        print(f"  N={num_vehicles:6d}: {elapsed * 1e3:8.3f} ms per tick "
+              f"({num_vehicles / elapsed:,.0f} carrier steps/s)")
+
+    print("Fleet controller demo completed.")
+
+
+if __name__ == "__main__":
+    main()
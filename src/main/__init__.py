@@ -10,5 +10,9 @@ Version: 1.0.0
 """
 
 ## 版本日志
-- v1.0.0 2025-12-28: 初始版本 - 成功
-- v1.1.0 2025-12-28: 添加基准测试程序 - 待测试
\ No newline at end of file
+# - v1.0.0 2025-12-28: 初始版本 - 成功
+# - v1.1.0 2025-12-28: 添加基准测试程序 - 待测试
+# - v1.2.0 2026-10-17: 添加无需硬件的性能基准测试程序(perf_benchmark) - 成功
+# - v1.2.1 2026-10-17: 添加固定频率多速率调度器(scheduler)，主程序接入传感器采样与差速控制循环 - 成功
+# - v1.2.2 2026-10-17: 添加传感器读取线程与控制线程解耦的流水线模块(pipeline) - 成功
+# - v1.2.3 2026-10-17: 添加asyncio运行时模块(async_runtime)，支持遥测与显示任务 - 成功
@@ -0,0 +1,439 @@
+"""
+Troll-vs-Troll Project
+Async Runtime Module
+
+This module runs the anti-rollover system as cooperating asyncio tasks:
+sensor polling, differential control, telemetry publishing and display
+refresh, each at its own rate on absolute monotonic deadlines. Sensor and
+control work is short and runs on the event loop. Telemetry (MQTT) and
+display redraws are handed to their own single-thread executors with
+run_in_executor and never awaited by the loop, so a slow network or
+screen can only make its own task drop updates; it cannot delay a
+control tick. Every task has a latency budget and counts overruns.
+
+Version: 1.0.1
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：asyncio运行时：传感、控制、遥测与显示任务 - 成功
+# - v1.0.1 2026-10-17: 自检迁移至tests/test_async_runtime.py - 成功
+
+import asyncio
+import json
+import time
+
+from .scheduler import PeriodicTask, TimingStats
+
+
+# Default latency budgets per task in milliseconds
+DEFAULT_BUDGETS_MS = {
+    'sensor': 2.0,
+    'control': 10.0,
+    'telemetry': 250.0,
+    'display': 100.0,
+}
+
+
+class BudgetedTask(PeriodicTask):
+    """
+    Periodic task with a latency budget.
+
+    Inline tasks are checked against the budget with their execution
+    time. Offloaded tasks are checked with the duration of their I/O job,
+    and a release is dropped while the previous job is still running.
+    """
+
+    def __init__(self, name, rate_hz, callback, budget_ms, offloaded=False):
+        """
+        Initialize the task.
+
+        Args:
+            name (str): Task name used in reports
+            rate_hz (float): Release rate in Hz
+            callback (callable): Function called without arguments
+            budget_ms (float): Latency budget in milliseconds
+            offloaded (bool): Whether the callback hands blocking I/O to an executor
+        """
+        super().__init__(name, rate_hz, callback)
+        self.budget_ns = int(budget_ms * 1e6)
+        self.offloaded = offloaded
+        self.budget_overruns = 0
+        self.dropped = 0
+        self.io_ns = TimingStats()
+        self._pending = None
+
+    def get_stats(self):
+        """
+        Get the timing and budget statistics of this task.
+
+        Returns:
+            dict: PeriodicTask statistics plus budget, overruns, drops and I/O time in us
+        """
+        stats = super().get_stats()
+        stats.update({
+            'budget_ms': self.budget_ns / 1e6,
+            'budget_overruns': self.budget_overruns,
+            'dropped': self.dropped,
+            'io_us': self.io_ns.as_dict(1e-3),
+        })
+        return stats
+
+
+class LogTelemetry:
+    """
+    Telemetry sink printing one JSON line per update.
+    """
+
+    def __init__(self, stream=None):
+        """
+        Initialize the sink.
+
+        Args:
+            stream (file, optional): Output stream (default: stdout)
+        """
+        self.stream = stream
+        self.published = 0
+
+    def publish(self, payload):
+        """
+        Publish one telemetry payload.
+
+        Args:
+            payload (dict): JSON-serializable telemetry
+        """
+        print(json.dumps(payload), file=self.stream, flush=True)
+        self.published += 1
+
+    def close(self):
+        """
+        Release the sink.
+        """
+
+
+class MqttTelemetry:
+    """
+    Telemetry sink publishing JSON payloads with paho-mqtt.
+    """
+
+    def __init__(self, host, port=1883, topic="troll-vs-troll/telemetry"):
+        """
+        Connect to the MQTT broker.
+
+        Args:
+            host (str): Broker host name
+            port (int): Broker port
+            topic (str): Topic the telemetry is published to
+        """
+        # paho-mqtt is imported here so the control path does not need it
+        import paho.mqtt.client as mqtt
+
+        if hasattr(mqtt, 'CallbackAPIVersion'):
+            self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        else:
+            self.client = mqtt.Client()
+        self.client.connect(host, port)
+        self.client.loop_start()
+        self.topic = topic
+        self.published = 0
+
+    def publish(self, payload):
+        """
+        Publish one telemetry payload.
+
+        Args:
+            payload (dict): JSON-serializable telemetry
+        """
+        self.client.publish(self.topic, json.dumps(payload))
+        self.published += 1
+
+    def close(self):
+        """
+        Disconnect from the broker.
+        """
+        self.client.loop_stop()
+        self.client.disconnect()
+
+
+def create_telemetry_sink(mqtt_host=None, mqtt_port=1883):
+    """
+    Create the MQTT telemetry sink, falling back to the log sink.
+
+    Args:
+        mqtt_host (str, optional): Broker host; None selects the log sink
+        mqtt_port (int): Broker port
+
+    Returns:
+        MqttTelemetry or LogTelemetry: Telemetry sink
+    """
+    if mqtt_host is None:
+        return LogTelemetry()
+    try:
+        return MqttTelemetry(mqtt_host, mqtt_port)
+    except (ImportError, OSError) as error:
+        print(f"MQTT telemetry unavailable ({error}), logging telemetry instead")
+        return LogTelemetry()
+
+
+class GuiDisplay:
+    """
+    Status screen on the UNIHIKER M10 display.
+    """
+
+    def __init__(self):
+        """
+        Create the screen items once; show() only updates their text.
+        """
+        # The GUI stack is imported here so that importing this module stays cheap
+        from unihiker import GUI
+
+        self.gui = GUI()
+        self.gui.draw_text(x=120, y=30, text="Troll-vs-Troll", origin='center', font_size=16, color=(0, 255, 0))
+        self.risk_text = self.gui.draw_text(x=120, y=90, text="Risk: -", origin='center', font_size=16, color=(255, 255, 255))
+        self.wheel_text = self.gui.draw_text(x=120, y=140, text="L - / R -", origin='center', font_size=14, color=(200, 200, 200))
+        self.control_text = self.gui.draw_text(x=120, y=190, text="", origin='center', font_size=14, color=(255, 100, 100))
+
+    def show(self, state):
+        """
+        Show the latest system state.
+
+        Args:
+            state (dict): Telemetry snapshot
+        """
+        self.risk_text.config(text=f"Risk: {state['risk_level']} {state['risk_score']:.2f}")
+        self.wheel_text.config(text=f"L {state['left_wheel_speed']:.2f} / R {state['right_wheel_speed']:.2f}")
+        self.control_text.config(text="DIFFERENTIAL ACTIVE" if state['control_active'] else "")
+
+    def close(self):
+        """
+        Release the display.
+        """
+
+
+class AsyncRuntime:
+    """
+    Runs sensing, control, telemetry and display as asyncio tasks.
+    """
+
+    def __init__(self, imu, controller, sensor_rate=100.0, control_rate=10.0,
+                 telemetry=None, telemetry_rate=1.0, display=None, display_rate=5.0,
+                 budgets_ms=None):
+        """
+        Initialize the runtime.
+
+        Args:
+            imu: IMU source with read() -> (accel, gyro)
+            controller (DifferentialController): Controller to run
+            sensor_rate (float): IMU sampling rate in Hz
+            control_rate (float): Control step rate in Hz
+            telemetry (optional): Sink with publish(payload); None disables telemetry
+            telemetry_rate (float): Telemetry rate in Hz
+            display (optional): Sink with show(state); None disables the display
+            display_rate (float): Display refresh rate in Hz
+            budgets_ms (dict, optional): Latency budgets overriding DEFAULT_BUDGETS_MS
+        """
+        self.imu = imu
+        self.controller = controller
+        self.telemetry = telemetry
+        self.display = display
+        self.budgets_ms = dict(DEFAULT_BUDGETS_MS, **(budgets_ms or {}))
+
+        self.tasks = [
+            BudgetedTask('sensor', sensor_rate, self._read_sensors, self.budgets_ms['sensor']),
+            BudgetedTask('control', control_rate, self._step_control, self.budgets_ms['control']),
+        ]
+        if telemetry is not None:
+            self.tasks.append(BudgetedTask('telemetry', telemetry_rate, self._publish_telemetry,
+                                           self.budgets_ms['telemetry'], offloaded=True))
+        if display is not None:
+            self.tasks.append(BudgetedTask('display', display_rate, self._refresh_display,
+                                           self.budgets_ms['display'], offloaded=True))
+        self._tasks_by_name = {task.name: task for task in self.tasks}
+
+        self.last_output = None
+        self._executors = {}
+        self._loop = None
+        self._stop = None
+
+        print("AsyncRuntime initialized")
+
+    def _read_sensors(self):
+        """
+        Read one IMU sample into the controller.
+        """
+        accel, gyro = self.imu.read()
+        self.controller.ingest_sensor_data(accel, gyro, time.monotonic())
+
+    def _step_control(self):
+        """
+        Run one control step.
+        """
+        self.last_output = self.controller.step_control()
+
+    def _snapshot(self):
+        """
+        Build the telemetry/display state from the latest control output.
+        """
+        output = self.last_output or {}
+        risk = output.get('risk_assessment') or {}
+        return {
+            'time': time.time(),
+            'left_wheel_speed': self.controller.left_wheel_speed,
+            'right_wheel_speed': self.controller.right_wheel_speed,
+            'control_active': self.controller.control_active,
+            'risk_score': float(risk.get('risk_score', 0.0)),
+            'risk_level': risk.get('risk_level', 'UNKNOWN'),
+        }
+
+    def _publish_telemetry(self):
+        """
+        Hand the latest state to the telemetry sink.
+        """
+        self._offload(self._tasks_by_name['telemetry'], self.telemetry.publish, self._snapshot())
+
+    def _refresh_display(self):
+        """
+        Hand the latest state to the display.
+        """
+        self._offload(self._tasks_by_name['display'], self.display.show, self._snapshot())
+
+    def _offload(self, task, function, payload):
+        """
+        Run blocking I/O on the task's executor without awaiting it.
+
+        Args:
+            task (BudgetedTask): Task the I/O belongs to
+            function (callable): Blocking function
+            payload: Argument of the function
+        """
+        if task._pending is not None and not task._pending.done():
+            task.dropped += 1
+            return
+
+        def timed_call():
+            start_ns = time.monotonic_ns()
+            function(payload)
+            return time.monotonic_ns() - start_ns
+
+        def finished(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            duration_ns = future.result()
+            task.io_ns.add(duration_ns)
+            if duration_ns > task.budget_ns:
+                task.budget_overruns += 1
+
+        task._pending = self._loop.run_in_executor(self._executors[task.name], timed_call)
+        task._pending.add_done_callback(finished)
+
+    async def _run_task(self, task, start_ns, end_ns):
+        """
+        Release one task at absolute deadlines until stopped.
+        """
+        task.next_release_ns = start_ns
+        while not self._stop.is_set():
+            release_ns = task.next_release_ns
+            if end_ns is not None and release_ns >= end_ns:
+                break
+
+            now_ns = time.monotonic_ns()
+            if now_ns < release_ns:
+                await asyncio.sleep((release_ns - now_ns) / 1e9)
+                now_ns = time.monotonic_ns()
+
+            task.callback()
+            finish_ns = time.monotonic_ns()
+            task.record_release(release_ns, now_ns, finish_ns)
+            if not task.offloaded and finish_ns - now_ns > task.budget_ns:
+                task.budget_overruns += 1
+
+    async def run(self, duration=None):
+        """
+        Run all tasks until stop() is called or the duration has elapsed.
+
+        Args:
+            duration (float, optional): Run time in seconds
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._executors = {
+            task.name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=task.name)
+            for task in self.tasks if task.offloaded
+        }
+
+        start_ns = time.monotonic_ns()
+        end_ns = None if duration is None else start_ns + int(duration * 1e9)
+        try:
+            await asyncio.gather(*(self._run_task(task, start_ns, end_ns) for task in self.tasks))
+        finally:
+            # Do not wait for a hung network or screen on the way out
+            for executor in self._executors.values():
+                executor.shutdown(wait=False)
+
+    def stop(self):
+        """
+        Ask all tasks to return after their current release.
+        """
+        if self._stop is not None:
+            self._stop.set()
+
+    def get_stats(self):
+        """
+        Get the timing and budget statistics of all tasks.
+
+        Returns:
+            dict: Task statistics keyed by task name
+        """
+        return {task.name: task.get_stats() for task in self.tasks}
+
+
+def main():
+    """
+    Main function demonstrating the async runtime with slow telemetry and
+    display (the checks live in tests/test_async_runtime.py).
+    """
+    from ..control.differential_controller import DifferentialController
+    from ..sensors.imu_source import SimulatedIMU
+
+    print("Async Runtime demo...")
+
+    class SlowTelemetry:
+        """Telemetry sink with a 300 ms network stall per publish."""
+        def __init__(self):
+            self.published = 0
+
+        def publish(self, payload):
+            time.sleep(0.3)
+            self.published += 1
+
+    class SlowDisplay:
+        """Display taking 150 ms per redraw."""
+        def __init__(self):
+            self.frames = 0
+
+        def show(self, state):
+            time.sleep(0.15)
+            self.frames += 1
+
+    telemetry = SlowTelemetry()
+    display = SlowDisplay()
+    runtime = AsyncRuntime(
+        SimulatedIMU(scenario='turning', seed=3), DifferentialController(),
+        sensor_rate=100.0, control_rate=20.0,
+        telemetry=telemetry, telemetry_rate=5.0, display=display, display_rate=10.0
+    )
+    asyncio.run(runtime.run(duration=2.0))
+
+    stats = runtime.get_stats()
+    for name, task in stats.items():
+        print(f"  {name:9s} releases={task['releases']:3d} misses={task['deadline_misses']} "
+              f"lag max={task['jitter_us']['max'] / 1e3:6.2f} ms "
+              f"budget overruns={task['budget_overruns']} dropped={task['dropped']}")
+
+    print(f"  telemetry published={telemetry.published}, display frames={display.frames}")
+    print("Async runtime demo completed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,15 @@ This module serves as a comprehensive benchmark and demo for the UNIHIKER M10 bo
 testing all onboard sensors, display components, and measuring computational performance.
 Features a page-based UI to navigate through different sensor readings and performance metrics.
 
-Version: 1.0.0
+Version: 1.1.0
 """
 
+## 版本日志
+# - v1.0.0 2025-12-28: 初始版本 - 待测试
+# - v1.1.0 2026-10-17: unihiker/pinpong延迟导入 - 成功
+
 import time
 import math
-from unihiker import GUI, Audio
-from pinpong.extension.unihiker import *
 
 # TODO: Implement benchmark demo for UNIHIKER M10 - HIGH - Developer
 # TODO: Test all onboard sensors (accelerometer, light sensor, etc.) - HIGH - Developer
@@ -31,6 +33,11 @@ class BenchmarkDemo:
         """
         Initialize the benchmark demo.
         """
+        # GUI and board libraries are imported here so that importing this
+        # module does not load the unihiker/pinpong stacks
+        from unihiker import GUI, Audio
+        import pinpong.extension.unihiker  # noqa: F401 - initializes onboard sensors
+        
         self.gui = GUI()
         self.audio = Audio()
         self.page_index = 0
@@ -3,22 +3,170 @@ Troll-vs-Troll Project
 Main Application Entry Point
 
 This module serves as the main entry point for the anti-rollover system.
-It initializes the system components and starts the main control loop.
+It initializes the system components and starts the main control loop:
+the IMU is sampled at the sensor rate and every sample is buffered, while
+the differential control step runs at its own (lower) control rate. By
+default both run on a drift-free fixed-rate scheduler; --runtime selects
+the threaded pipeline or the asyncio runtime instead.
 
-Version: 1.0.0
+    python -m src.main.main --simulate --duration 10
+    python -m src.main.main --simulate --runtime pipeline --sensor-rate 1000 --control-rate 100
+    python -m src.main.main --simulate --runtime async --mqtt-host localhost
+
+Version: 1.3.1
 """
 
+## 版本日志
+# - v1.0.0 2025-12-28: 初始版本 - 待测试
+# - v1.1.0 2026-10-17: 主控制循环改用固定频率调度器 - 成功
+# - v1.2.0 2026-10-17: 新增pipeline运行方式 - 成功
+# - v1.3.0 2026-10-17: 新增asyncio运行方式 - 成功
+# - v1.3.1 2026-10-17: 调度器运行方式为每个传感器样本记录单调时钟时间戳 - 成功
+
+import argparse
+import time
+
+from .scheduler import FixedRateScheduler
+
+
+def print_timing_report(stats):
+    """
+    Print the per-task jitter and deadline miss report.
+
+    Args:
+        stats (dict): Task statistics keyed by task name (e.g. the output
+            of FixedRateScheduler.get_stats())
+    """
+    print("Timing report:")
+    for name, task in stats.items():
+        jitter = task['jitter_us']
+        execution = task['exec_us']
+        print(f"  {name:9s} {task['rate_hz']:7.1f} Hz  releases={task['releases']}  "
+              f"misses={task['deadline_misses']}  skipped={task['skipped_releases']}")
+        if 'budget_ms' in task:
+            print(f"            budget={task['budget_ms']:.1f} ms  overruns={task['budget_overruns']}  "
+                  f"dropped={task['dropped']}")
+        if jitter['count']:
+            print(f"            jitter mean={jitter['mean']:.1f} us  std={jitter['std']:.1f} us  "
+                  f"max={jitter['max']:.1f} us")
+            print(f"            exec   mean={execution['mean']:.1f} us  max={execution['max']:.1f} us")
+
+
+def run_scheduler(imu, controller, args):
+    """
+    Run sensing and control on the single-threaded fixed-rate scheduler.
+
+    Returns:
+        dict: Task timing statistics
+    """
+    def sample_sensors():
+        accel, gyro = imu.read()
+        controller.ingest_sensor_data(accel, gyro, time.monotonic())
+
+    scheduler = FixedRateScheduler()
+    scheduler.add_task('sensor', args.sensor_rate, sample_sensors)
+    scheduler.add_task('control', args.control_rate, controller.step_control)
+
+    print("System initialized and running.")
+    try:
+        scheduler.run(duration=args.duration)
+    except KeyboardInterrupt:
+        print("Stopping...")
+    return scheduler.get_stats()
+
+
+def run_pipeline(imu, controller, args):
+    """
+    Run sensing and control on separate threads linked by an SPSC buffer.
+
+    Returns:
+        dict: Task timing statistics
+    """
+    from .pipeline import SensorPipeline
+
+    pipeline = SensorPipeline(imu, controller, args.sensor_rate, args.control_rate)
+    print("System initialized and running.")
+    pipeline.run(duration=args.duration)
+    stats = pipeline.get_stats()
+    print(f"Buffer: {stats['buffer']}")
+    return stats['tasks']
+
+
+def run_async(imu, controller, args):
+    """
+    Run sensing, control, telemetry and display as asyncio tasks.
+
+    Returns:
+        dict: Task timing statistics
+    """
+    import asyncio
+    from .async_runtime import AsyncRuntime, GuiDisplay, create_telemetry_sink
+
+    telemetry = create_telemetry_sink(args.mqtt_host, args.mqtt_port)
+    display = None if args.simulate else GuiDisplay()
+    runtime = AsyncRuntime(imu, controller, args.sensor_rate, args.control_rate,
+                           telemetry=telemetry, telemetry_rate=args.telemetry_rate,
+                           display=display)
+
+    print("System initialized and running.")
+    try:
+        asyncio.run(runtime.run(duration=args.duration))
+    except KeyboardInterrupt:
+        print("Stopping...")
+    finally:
+        telemetry.close()
+    return runtime.get_stats()
+
+
+# Runtimes by command-line name
+RUNTIMES = {
+    'scheduler': run_scheduler,
+    'pipeline': run_pipeline,
+    'async': run_async,
+}
+
+
 def main():
     """
     Main function to initialize and run the anti-rollover system.
     """
+    parser = argparse.ArgumentParser(description="Troll-vs-Troll anti-rollover system")
+    parser.add_argument('--runtime', choices=sorted(RUNTIMES), default='scheduler',
+                        help="scheduler: one thread; pipeline: reader and control threads; "
+                             "async: asyncio tasks with telemetry and display")
+    parser.add_argument('--simulate', action='store_true',
+                        help="use simulated IMU data instead of the onboard sensors")
+    parser.add_argument('--scenario', default='normal',
+                        help="scenario of the simulated IMU")
+    parser.add_argument('--sensor-rate', type=float, default=100.0,
+                        help="IMU sampling rate in Hz")
+    parser.add_argument('--control-rate', type=float, default=10.0,
+                        help="differential control rate in Hz")
+    parser.add_argument('--duration', type=float, default=None,
+                        help="run time in seconds (default: until interrupted)")
+    parser.add_argument('--model', default=None,
+                        help="saved rollover model to serve from the first sample")
+    parser.add_argument('--telemetry-rate', type=float, default=1.0,
+                        help="telemetry rate in Hz (async runtime)")
+    parser.add_argument('--mqtt-host', default=None,
+                        help="MQTT broker for telemetry (async runtime; default: log to stdout)")
+    parser.add_argument('--mqtt-port', type=int, default=1883,
+                        help="MQTT broker port")
+    args = parser.parse_args()
+
     print("Troll-vs-Troll Anti-Rollover System Starting...")
-    # TODO: Initialize sensor modules - HIGH - Developer
-    # TODO: Initialize control algorithms - HIGH - Developer
-    # TODO: Start main control loop - HIGH - Developer
-    
-    print("System initialized and running.")
+
+    from ..sensors.imu_source import create_imu_source
+    from ..control.differential_controller import DifferentialController
+
+    imu = create_imu_source(simulate=args.simulate, scenario=args.scenario)
+    controller = DifferentialController(model_path=args.model)
+
+    stats = RUNTIMES[args.runtime](imu, controller, args)
+
+    print(f"Wheel speeds: {controller.get_wheel_speeds()}")
+    print_timing_report(stats)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,552 @@
+"""
+Troll-vs-Troll Project
+Performance Benchmark Module
+
+This module collects command-line performance benchmarks for the
+anti-rollover software stack. Unlike benchmark.py (the on-board sensor
+and display demo), these benchmarks need no UNIHIKER hardware and can be
+run on a development machine or on the M10 itself:
+
+    python -m src.main.perf_benchmark scorer
+    python -m src.main.perf_benchmark startup
+    python -m src.main.perf_benchmark imports --import-budget-ms 500
+    python -m src.main.perf_benchmark datagen --batch-size 1000000
+    python -m src.main.perf_benchmark logindex --log-gb 4
+    python -m src.main.perf_benchmark fleet
+    python -m src.main.perf_benchmark closedloop
+    python -m src.main.perf_benchmark lookahead
+    python -m src.main.perf_benchmark attitude
+    python -m src.main.perf_benchmark all
+
+Version: 1.9.2
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：scorer基准：sklearn与编译评分模型对比 - 成功
+# - v1.1.0 2026-10-17: startup基准：训练与加载模型的首次预测时间 - 成功
+# - v1.2.0 2026-10-17: imports基准：控制栈冷启动导入时间 - 成功
+# - v1.3.0 2026-10-17: datagen基准：循环与向量化数据生成 - 成功
+# - v1.4.0 2026-10-17: datagen基准增加多进程生成 - 成功
+# - v1.5.0 2026-10-17: logindex基准：索引与全量扫描查询 - 成功
+# - v1.6.0 2026-10-17: fleet基准：单车控制器与车队控制器 - 成功
+# - v1.7.0 2026-10-17: closedloop基准：控制延迟与翻倒率 - 成功
+# - v1.8.0 2026-10-17: lookahead基准：前瞻检测延迟 - 成功
+# - v1.9.0 2026-10-17: attitude基准：姿态滤波误差与耗时 - 成功
+# - v1.9.1 2026-10-17: scorer基准同时报告单样本与批量加速比 - 成功
+# - v1.9.2 2026-10-17: imports基准在子进程失败或无计时输出时打印stderr并跳过 - 成功
+
+import argparse
+import time
+
+import numpy as np
+
+
+def measure(func, number=100, repeat=5):
+    """
+    Measure the time per call of a function.
+
+    Args:
+        func (callable): Function to call without arguments
+        number (int): Calls per timing run
+        repeat (int): Timing runs; the fastest one is reported
+
+    Returns:
+        float: Seconds per call of the fastest run
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def format_duration(seconds):
+    """
+    Format a duration with a readable unit.
+
+    Args:
+        seconds (float): Duration in seconds
+
+    Returns:
+        str: Formatted duration
+    """
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:9.1f} us"
+    if seconds < 1.0:
+        return f"{seconds * 1e3:9.2f} ms"
+    return f"{seconds:9.2f} s "
+
+
+def bench_anomaly_scorer(args):
+    """
+    Compare sklearn IsolationForest scoring with the compiled NumPy scorer.
+    """
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+    from ..ml.compiled_forest import CompiledIsolationForest
+
+    print("Anomaly scorer latency (sklearn vs compiled forest)")
+
+    rng = np.random.default_rng(0)
+    train = rng.normal(0.0, 1.0, size=(args.train_samples, 9))
+    test = rng.normal(0.0, 1.5, size=(args.batch_size, 9))
+
+    scaler = StandardScaler().fit(train)
+    detector = IsolationForest(contamination=0.1, random_state=42).fit(scaler.transform(train))
+
+    start = time.perf_counter()
+    compiled = CompiledIsolationForest.from_model(scaler, detector)
+    compile_time = time.perf_counter() - start
+
+    row = test[:1]
+    sample = test[0]
+    sklearn_one = measure(lambda: detector.score_samples(scaler.transform(row)), number=20)
+    compiled_one = measure(lambda: compiled.score_one(sample), number=200)
+    sklearn_batch = measure(lambda: detector.score_samples(scaler.transform(test)), number=1, repeat=3)
+    compiled_batch = measure(lambda: compiled.score_samples(test), number=1, repeat=3)
+
+    identical = np.array_equal(compiled.score_samples(test), detector.score_samples(scaler.transform(test)))
+
+    print(f"  compile time:              {format_duration(compile_time)}")
+    print(f"  single sample, sklearn:    {format_duration(sklearn_one)}")
+    print(f"  single sample, compiled:   {format_duration(compiled_one)}"
+          f"   ({sklearn_one / compiled_one:.1f}x speed-up)")
+    print(f"  batch of {args.batch_size}, sklearn:  {format_duration(sklearn_batch)}")
+    print(f"  batch of {args.batch_size}, compiled: {format_duration(compiled_batch)}"
+          f"   ({sklearn_batch / compiled_batch:.1f}x speed-up)")
+    print(f"  speed-up over sklearn:     single {sklearn_one / compiled_one:.1f}x, "
+          f"batch {sklearn_batch / compiled_batch:.1f}x")
+    print(f"  identical scores:          {identical}")
+
+
+def bench_startup(args):
+    """
+    Time to first model-backed prediction: training from scratch vs loading.
+    """
+    import os
+    import tempfile
+    from ..ml.rollover_prediction import RolloverPredictor
+
+    print("Startup time to first model-backed prediction")
+
+    rng = np.random.default_rng(0)
+    history = rng.normal((0.0, 0.0, 9.81), (0.5, 0.5, 0.3), size=(args.train_samples, 3))
+    sample = (0.5, 0.2, 9.8)
+
+    start = time.perf_counter()
+    predictor = RolloverPredictor(background_training=False)
+    for accel in history:
+        predictor.update_model(predictor.preprocess_sensor_data(tuple(accel)))
+    if not predictor.is_trained:
+        predictor._train_model()
+    cold = predictor.predict_rollover_risk(sample)
+    cold_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rollover_model.npz")
+        predictor.save(path)
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        loaded = RolloverPredictor.load(path)
+        warm = loaded.predict_rollover_risk(sample)
+        warm_time = time.perf_counter() - start
+
+    print(f"  train from scratch + predict: {format_duration(cold_time)}")
+    print(f"  load saved model + predict:   {format_duration(warm_time)}"
+          f"   ({cold_time / warm_time:.1f}x speed-up)")
+    print(f"  model file size:              {size / 1024:9.1f} KiB")
+    print(f"  same anomaly score:           {cold['anomaly_score'] == warm['anomaly_score']}")
+
+
+def bench_data_generation(args):
+    """
+    Per-sample loop vs vectorized SensorDataGenerator output.
+    """
+    from ..utils.data_generator import SensorDataGenerator
+
+    print(f"Data generation, {args.batch_size} samples (loop vs vectorized)")
+
+    generator = SensorDataGenerator(seed=0)
+    duration = args.batch_size / 100.0
+    cases = (
+        ("training dataset",
+         lambda: generator.generate_training_dataset(args.batch_size),
+         lambda: generator.generate_training_array(args.batch_size)),
+        ("100 Hz sequence",
+         lambda: generator.generate_data_sequence(duration, "turning", start_time=0.0),
+         lambda: generator.generate_sequence_array(duration, "turning")),
+    )
+    for name, loop, vectorized in cases:
+        loop_time = measure(loop, number=1, repeat=1)
+        vector_time = measure(vectorized, number=1, repeat=3)
+        print(f"  {name:17s} loop: {format_duration(loop_time)}   vectorized: {format_duration(vector_time)}"
+              f"   ({loop_time / vector_time:.0f}x speed-up, "
+              f"{args.batch_size / vector_time / 1e6:.1f} M samples/s)")
+
+    # Sharded generation across processes (same bytes for any worker count)
+    import os
+
+    workers = os.cpu_count() or 1
+    single = measure(lambda: generator.generate_training_array(args.batch_size, workers=1), number=1, repeat=1)
+    parallel = measure(lambda: generator.generate_training_array(args.batch_size, workers=workers),
+                       number=1, repeat=1)
+    print(f"  sharded dataset   1 worker: {format_duration(single)}   {workers} workers: "
+          f"{format_duration(parallel)}   ({single / parallel:.1f}x speed-up)")
+
+
+def drop_page_cache(path):
+    """
+    Evict a file from the OS page cache so the next read hits the disk.
+
+    Args:
+        path (str): File path
+    """
+    import os
+
+    if hasattr(os, 'posix_fadvise'):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def bench_log_index(args):
+    """
+    Full scan vs block-indexed queries on a multi-GB drive log.
+    """
+    import os
+    import tempfile
+    from ..utils.drive_log import RECORD_DTYPE, DriveLogReader, DriveLogWriter
+    from ..utils.log_index import DriveLogIndex, scan_risk_windows
+
+    count = int(args.log_gb * 1e9 / RECORD_DTYPE.itemsize)
+    hours = count / 1000 / 3600
+    print(f"Drive log index, {count} records at 1 kHz ({hours:.1f} h, "
+          f"{count * RECORD_DTYPE.itemsize / 1e9:.1f} GB)")
+
+    rng = np.random.default_rng(0)
+    chunk = np.zeros(1000000, dtype=RECORD_DTYPE)
+    with tempfile.TemporaryDirectory(dir=args.log_dir) as directory:
+        path = os.path.join(directory, 'bench.tvt')
+        start = time.perf_counter()
+        with DriveLogWriter(path) as writer:
+            for first in range(0, count, len(chunk)):
+                records = chunk[:min(len(chunk), count - first)]
+                records['timestamp'] = (first + np.arange(len(records))) * 0.001
+                records['risk_score'] = rng.normal(0.2, 0.05, len(records))
+                # One 2 s rollover event per million records (about 17 minutes)
+                for event in rng.integers(0, len(records) - 2000, size=max(1, len(records) // 1000000)):
+                    records['risk_score'][event:event + 2000] = np.linspace(0.5, 0.95, 2000)
+                writer.record_batch(records)
+        print(f"  write log:            {format_duration(time.perf_counter() - start)}")
+
+        with DriveLogReader(path) as reader:
+            start = time.perf_counter()
+            index = DriveLogIndex.open(reader)
+            print(f"  build index:          {format_duration(time.perf_counter() - start)}   "
+                  f"({len(index.blocks)} blocks, {os.path.getsize(index.index_path(path)) / 1e6:.1f} MB)")
+
+            t0 = reader.timestamps[len(reader) // 2]
+            queries = (
+                ("risk_score > 0.8",
+                 lambda: scan_risk_windows(reader.records, 0.8),
+                 lambda: index.risk_windows(0.8)),
+                ("10 s around t0",
+                 lambda: np.array(reader.records[(reader.timestamps >= t0 - 5.0) & (reader.timestamps < t0 + 5.0)]),
+                 lambda: np.array(index.time_range(t0 - 5.0, t0 + 5.0))),
+            )
+            for name, scan, indexed in queries:
+                drop_page_cache(path)
+                start = time.perf_counter()
+                expected = scan()
+                scan_time = time.perf_counter() - start
+                drop_page_cache(path)
+                index.records_read = 0
+                start = time.perf_counter()
+                result = indexed()
+                indexed_time = time.perf_counter() - start
+                assert result.tobytes() == expected.tobytes(), "indexed query differs from full scan"
+                print(f"  {name:18s}  full scan: {format_duration(scan_time)}   indexed: "
+                      f"{format_duration(indexed_time)}   ({len(result)} rows, "
+                      f"{index.records_read / len(reader):.2%} of records read, cold cache)")
+
+
+def bench_fleet_controller(args):
+    """
+    One control tick for N carriers: N DifferentialControllers vs FleetController.
+    """
+    from ..control.differential_controller import DifferentialController
+    from ..control.fleet_controller import FleetController
+
+    print("Fleet control tick (ingest one sample per carrier + control step; "
+          "scalar time extrapolated from 100 controllers)")
+
+    rng = np.random.default_rng(0)
+    singles = [DifferentialController() for _ in range(100)]
+    single_accel = [tuple(row) for row in rng.normal((0.0, 0.0, 9.81), (1.0, 1.5, 0.5), size=(100, 3))]
+
+    def scalar_tick():
+        for controller, accel in zip(singles, single_accel):
+            controller.ingest_sensor_data(accel)
+            controller.step_control()
+
+    per_controller = measure(scalar_tick, number=20, repeat=3) / len(singles)
+
+    for num_vehicles in (10, 1000, 100000):
+        fleet = FleetController(num_vehicles)
+        accel = rng.normal((0.0, 0.0, 9.81), (1.0, 1.5, 0.5), size=(num_vehicles, 3))
+        gyro = rng.normal(0.0, 0.1, size=(num_vehicles, 3))
+
+        def fleet_tick():
+            fleet.ingest_sensor_data(accel, gyro)
+            fleet.step_control()
+
+        fleet_time = measure(fleet_tick, number=max(5, 100000 // num_vehicles), repeat=3)
+        scalar_time = per_controller * num_vehicles
+        print(f"  N={num_vehicles:<6d}  scalar: {format_duration(scalar_time)}   fleet: "
+              f"{format_duration(fleet_time)}   ({scalar_time / fleet_time:,.0f}x speed-up, "
+              f"{num_vehicles / fleet_time / 1e6:.2f} M carrier steps/s)")
+
+
+def bench_closed_loop(args):
+    """
+    Tip-over rate vs control latency in the closed-loop simulation.
+    """
+    from ..utils.closed_loop import ClosedLoopSimulation
+
+    runs, duration = 300, 60.0
+    print(f"Closed loop, {runs} carriers x {duration:.0f} s (same drivers and noise in every row)")
+
+    start = time.perf_counter()
+    baseline = ClosedLoopSimulation(runs, control=False, seed=0).run(duration)
+    print(f"  open loop:                          tip-over rate {baseline['tip_rate']:6.1%}   "
+          f"({format_duration(time.perf_counter() - start).strip()})")
+    for interval in (0.05, 0.1, 0.2, 0.5, 1.0):
+        for delay in (0.0, 0.2, 0.5):
+            start = time.perf_counter()
+            result = ClosedLoopSimulation(runs, control_interval=interval, command_delay=delay,
+                                          seed=0).run(duration)
+            print(f"  control every {interval * 1e3:4.0f} ms + {delay * 1e3:3.0f} ms delay:  "
+                  f"tip-over rate {result['tip_rate']:6.1%}   control active {result['control_active']:5.1%}   "
+                  f"mean speed {result['mean_speed_scale']:.2f}   "
+                  f"({format_duration(time.perf_counter() - start).strip()})")
+
+
+def bench_lookahead(args):
+    """
+    Rollover detection latency with and without the look-ahead predictor.
+
+    Detection is a control step whose risk reaches the HIGH level (risk
+    score > 0.8, i.e. 12 deg of tilt); the default 0.3 control threshold is
+    crossed in most turns and says little about timing. Samples after a
+    carrier tipped over are left out.
+    """
+    from ..control.differential_controller import DifferentialController
+    from ..utils.data_generator import SCENARIOS
+    from ..utils.log_index import find_runs
+    from ..utils.trajectory_simulator import TrajectorySimulator
+
+    runs, duration, sample_rate, threshold = 40, 60.0, 100.0, 0.8
+    data = TrajectorySimulator(num_vehicles=runs, sample_rate=sample_rate, seed=0).run(duration)
+    timestamps = data['timestamp']
+    upright = ~data['tipped']
+    events = (data['label'] == SCENARIOS.index('rollover_imminent')) & upright
+    negative = np.isin(data['label'], [SCENARIOS.index('normal'), SCENARIOS.index('turning')]) & upright
+    lifted = data['lift_angle'] > 0.0
+    print(f"Rollover detection, {runs} carriers x {duration:.0f} s at {sample_rate:.0f} Hz, "
+          f"{sum(len(find_runs(events[:, run])[0]) for run in range(runs))} rollover_imminent onsets, "
+          f"detection at risk score > {threshold}")
+
+    for lookahead in (None, 0.1, 0.25, 0.5):
+        latencies, leads = [], []
+        missed = false_steps = negative_steps = 0
+        control_time = 0.0
+        control_steps = 0
+        for run in range(runs):
+            controller = DifferentialController(clock=lambda: now)
+            controller.rollover_predictor.lookahead = lookahead
+            controller.control_threshold = threshold
+            block = int(round(controller.control_interval * sample_rate))
+            steps, active = [], []
+            for start in range(0, len(timestamps), block):
+                stop = min(start + block, len(timestamps))
+                now = timestamps[stop - 1]
+                controller.ingest_sensor_batch(data['accel'][start:stop, run], data['gyro'][start:stop, run],
+                                               timestamps[start:stop])
+                begin = time.perf_counter()
+                output = controller.step_control()
+                control_time += time.perf_counter() - begin
+                steps.append(stop - 1)
+                active.append(output['control_active'])
+            steps = np.array(steps)
+            active = np.array(active)
+            control_steps += len(steps)
+            negative_steps += int(np.count_nonzero(negative[steps, run]))
+            false_steps += int(np.count_nonzero(active & negative[steps, run]))
+
+            # First detecting control step inside each rollover_imminent run
+            for onset, end in zip(*find_runs(events[:, run])):
+                inside = active & (steps >= onset) & (steps < end)
+                if not inside.any():
+                    missed += 1
+                    continue
+                detected = steps[np.argmax(inside)]
+                latencies.append(timestamps[detected] - timestamps[onset])
+                lift = np.flatnonzero(lifted[onset:end, run])
+                if len(lift):
+                    leads.append(timestamps[onset + lift[0]] - timestamps[detected])
+
+        name = "off" if lookahead is None else f"{lookahead * 1e3:.0f} ms"
+        print(f"  look-ahead {name:>6s}:  detection latency median {np.median(latencies) * 1e3:4.0f} ms, "
+              f"p90 {np.percentile(latencies, 90) * 1e3:4.0f} ms, {missed} missed   "
+              f"lead before wheel lift median {np.median(leads) * 1e3:4.0f} ms "
+              f"({np.mean(np.array(leads) > 0):.0%} before lift)   "
+              f"flagged in normal/turning {false_steps / max(1, negative_steps):5.1%}   "
+              f"step_control {format_duration(control_time / control_steps).strip()}")
+
+
+def bench_attitude(args):
+    """
+    Roll error and update cost of the attitude filters.
+    """
+    from ..sensors.attitude import AttitudeEKF, ComplementaryFilter
+    from ..utils.data_generator import SCENARIOS
+    from ..utils.trajectory_simulator import TrajectorySimulator
+
+    runs, duration = 50, 60.0
+    data = TrajectorySimulator(num_vehicles=runs, seed=0).run(duration)
+    upright = ~data['tipped']
+    accel_roll = np.degrees(np.arctan2(data['accel'][..., 1], data['accel'][..., 2]))
+    print(f"Roll error vs simulated body roll, {runs} carriers x {duration:.0f} s (RMS, upright samples)")
+    print("  " + " " * 22 + "".join(f"{name:>19s}" for name in SCENARIOS) + "   scalar update   batch per carrier")
+
+    def report(name, roll, scalar_time=None, batch_time=None):
+        errors = "".join(f"{np.sqrt(np.mean((roll - data['roll'])[upright & (data['label'] == k)] ** 2)):15.2f} deg"
+                         for k in range(len(SCENARIOS)))
+        cost = "" if scalar_time is None else \
+            f"   {format_duration(scalar_time)}   {format_duration(batch_time)}"
+        print(f"  {name:22s}{errors}{cost}")
+
+    report("accelerometer only", accel_roll)
+    for name, factory in (("complementary filter", ComplementaryFilter), ("EKF", AttitudeEKF)):
+        fleet = factory(num_vehicles=runs)
+        roll = np.empty_like(accel_roll)
+        start = time.perf_counter()
+        for i, t in enumerate(data['timestamp']):
+            roll[i] = fleet.update_batch(data['accel'][i], data['gyro'][i], t)[1]
+        batch_time = (time.perf_counter() - start) / roll.size
+
+        single = factory()
+        samples = [(tuple(a), tuple(g), t) for a, g, t in
+                   zip(data['accel'][:, 0].tolist(), data['gyro'][:, 0].tolist(), data['timestamp'].tolist())]
+        start = time.perf_counter()
+        for accel, gyro, t in samples:
+            single.update(accel, gyro, t)
+        report(name, roll, (time.perf_counter() - start) / len(samples), batch_time)
+
+
+# Modules that must not be loaded by a plain import of the control stack
+HEAVY_MODULES = ('sklearn', 'scipy', 'pandas', 'matplotlib', 'unihiker', 'pinpong')
+
+# Modules whose cold import time is tracked
+IMPORT_TARGETS = (
+    'src.sensors.data_processor',
+    'src.ml.rollover_prediction',
+    'src.control.differential_controller',
+    'src.main.benchmark',
+)
+
+
+def bench_import_time(args):
+    """
+    Cold import time of the control stack, measured with python -X importtime.
+    """
+    import os
+    import subprocess
+    import sys
+
+    print("Cold import time (python -X importtime)")
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    over_budget = False
+
+    for module in IMPORT_TARGETS:
+        code = (f"import sys, {module}; "
+                f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=root, capture_output=True, text=True
+        )
+        # Lines look like "import time: self [us] | cumulative | name"
+        cumulative = None
+        for line in result.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                cumulative = int(fields[1]) / 1e6
+
+        if result.returncode != 0 or cumulative is None:
+            # Skip the module, showing what the child printed besides the timings
+            reason = "import failed" if result.returncode != 0 else "no import time reported"
+            print(f"  {module:40s} {reason}, skipped")
+            for line in result.stderr.splitlines():
+                if not line.startswith('import time:'):
+                    print(f"      {line}")
+            continue
+
+        heavy = result.stdout.strip() or "none"
+        flag = ""
+        if args.import_budget_ms is not None and cumulative * 1e3 > args.import_budget_ms:
+            flag = "   OVER BUDGET"
+            over_budget = True
+        print(f"  {module:40s} {format_duration(cumulative)}   heavy deps loaded: {heavy}{flag}")
+
+    if over_budget:
+        raise SystemExit(1)
+
+
+# Benchmarks by command-line name
+BENCHMARKS = {
+    'scorer': bench_anomaly_scorer,
+    'startup': bench_startup,
+    'imports': bench_import_time,
+    'datagen': bench_data_generation,
+    'logindex': bench_log_index,
+    'fleet': bench_fleet_controller,
+    'closedloop': bench_closed_loop,
+    'lookahead': bench_lookahead,
+    'attitude': bench_attitude,
+}
+
+
+def main():
+    """
+    Main function to run the selected performance benchmarks.
+    """
+    parser = argparse.ArgumentParser(description="Troll-vs-Troll performance benchmarks")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS) + ['all'],
+                        help="benchmark to run")
+    parser.add_argument('--train-samples', type=int, default=256,
+                        help="training samples for model benchmarks")
+    parser.add_argument('--batch-size', type=int, default=10000,
+                        help="samples per batch for batch benchmarks")
+    parser.add_argument('--import-budget-ms', type=float, default=None,
+                        help="fail the imports benchmark if a module import exceeds this")
+    parser.add_argument('--log-gb', type=float, default=2.0,
+                        help="size of the drive log written by the logindex benchmark")
+    parser.add_argument('--log-dir', default=None,
+                        help="directory for the benchmark drive log (default: system temp)")
+    args = parser.parse_args()
+
+    names = sorted(BENCHMARKS) if args.benchmark == 'all' else [args.benchmark]
+    for name in names:
+        BENCHMARKS[name](args)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Troll-vs-Troll Project
+Fixed-Rate Scheduler Module
+
+This module implements a drift-free, multi-rate scheduler for the main
+control loop. Every task is released at absolute deadlines
+start + k * period on the monotonic nanosecond clock, so timing errors
+never accumulate. The scheduler accounts for deadline misses and keeps
+release jitter and execution time statistics per task.
+
+Version: 1.1.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：无漂移固定频率调度器 - 成功
+# - v1.1.0 2026-10-17: 调度统计供asyncio运行时复用 - 成功
+
+import math
+import time
+
+
+class TimingStats:
+    """
+    Running count/mean/std/min/max of a stream of durations (Welford).
+    """
+
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        """
+        Initialize empty statistics.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        """
+        Add one observation.
+
+        Args:
+            value (float): Observed value
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def std(self):
+        """
+        Population standard deviation of the observations.
+        """
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / self.count)
+
+    def as_dict(self, scale=1.0):
+        """
+        Get the statistics as a dictionary.
+
+        Args:
+            scale (float): Factor applied to all values (e.g. 1e-3 for ns -> us)
+
+        Returns:
+            dict: count, mean, std, min and max
+        """
+        if self.count == 0:
+            return {'count': 0, 'mean': None, 'std': None, 'min': None, 'max': None}
+        return {
+            'count': self.count,
+            'mean': self.mean * scale,
+            'std': self.std * scale,
+            'min': self.min * scale,
+            'max': self.max * scale,
+        }
+
+
+class PeriodicTask:
+    """
+    A callback released at a fixed rate, with its timing statistics.
+    """
+
+    def __init__(self, name, rate_hz, callback):
+        """
+        Initialize the periodic task.
+
+        Args:
+            name (str): Task name used in reports
+            rate_hz (float): Release rate in Hz
+            callback (callable): Function called without arguments
+        """
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+
+        self.name = name
+        self.rate_hz = rate_hz
+        self.period_ns = int(round(1e9 / rate_hz))
+        self.callback = callback
+
+        self.next_release_ns = 0
+        self.releases = 0
+        self.deadline_misses = 0
+        self.skipped_releases = 0
+        self.jitter_ns = TimingStats()
+        self.exec_ns = TimingStats()
+
+    def record_release(self, release_ns, start_ns, finish_ns):
+        """
+        Account for one executed release and schedule the next one.
+
+        Args:
+            release_ns (int): Scheduled release time
+            start_ns (int): Time the callback started
+            finish_ns (int): Time the callback returned
+
+        Returns:
+            int: Next release time
+        """
+        self.jitter_ns.add(start_ns - release_ns)
+        self.exec_ns.add(finish_ns - start_ns)
+        self.releases += 1
+
+        # Absolute deadlines: the next release never depends on when
+        # this one actually ran, so errors do not accumulate
+        next_release_ns = release_ns + self.period_ns
+        if finish_ns > next_release_ns:
+            self.deadline_misses += 1
+            behind = (finish_ns - next_release_ns) // self.period_ns
+            if behind > 0:
+                self.skipped_releases += behind
+                next_release_ns += behind * self.period_ns
+        self.next_release_ns = next_release_ns
+        return next_release_ns
+
+    def get_stats(self):
+        """
+        Get the timing statistics of this task.
+
+        Returns:
+            dict: Release counts, deadline misses, jitter and execution time in us
+        """
+        return {
+            'rate_hz': self.rate_hz,
+            'releases': self.releases,
+            'deadline_misses': self.deadline_misses,
+            'skipped_releases': self.skipped_releases,
+            'jitter_us': self.jitter_ns.as_dict(1e-3),
+            'exec_us': self.exec_ns.as_dict(1e-3),
+        }
+
+
+class FixedRateScheduler:
+    """
+    Runs periodic tasks at their own rates on one thread without drift.
+
+    A release whose callback finishes after the task's next release time
+    counts as a deadline miss. If the loop falls more than a full period
+    behind, the missed releases are skipped (and counted) instead of being
+    run back to back.
+    """
+
+    def __init__(self, clock_ns=time.monotonic_ns, sleep=time.sleep):
+        """
+        Initialize the scheduler.
+
+        Args:
+            clock_ns (callable): Monotonic clock returning nanoseconds
+            sleep (callable): Sleep function taking seconds
+        """
+        self.clock_ns = clock_ns
+        self.sleep = sleep
+        self.tasks = []
+        self.running = False
+
+    def add_task(self, name, rate_hz, callback):
+        """
+        Add a periodic task.
+
+        Args:
+            name (str): Task name used in reports
+            rate_hz (float): Release rate in Hz
+            callback (callable): Function called without arguments
+
+        Returns:
+            PeriodicTask: The added task
+        """
+        task = PeriodicTask(name, rate_hz, callback)
+        self.tasks.append(task)
+        return task
+
+    def stop(self):
+        """
+        Ask the run loop to return after the current release.
+        """
+        self.running = False
+
+    def run(self, duration=None):
+        """
+        Run the tasks until stop() is called or the duration has elapsed.
+
+        Args:
+            duration (float, optional): Run time in seconds
+        """
+        if not self.tasks:
+            raise ValueError("No tasks to schedule")
+
+        start_ns = self.clock_ns()
+        end_ns = None if duration is None else start_ns + int(duration * 1e9)
+        for task in self.tasks:
+            task.next_release_ns = start_ns
+
+        self.running = True
+        while self.running:
+            task = min(self.tasks, key=lambda t: t.next_release_ns)
+            release_ns = task.next_release_ns
+            if end_ns is not None and release_ns >= end_ns:
+                break
+
+            now_ns = self.clock_ns()
+            if now_ns < release_ns:
+                self.sleep((release_ns - now_ns) / 1e9)
+                now_ns = self.clock_ns()
+
+            task.callback()
+            task.record_release(release_ns, now_ns, self.clock_ns())
+
+        self.running = False
+
+    def get_stats(self):
+        """
+        Get the timing statistics of all tasks.
+
+        Returns:
+            dict: Task statistics keyed by task name
+        """
+        return {task.name: task.get_stats() for task in self.tasks}
+
+
+def main():
+    """
+    Main function for testing the fixed-rate scheduler.
+    """
+    print("Testing Fixed-Rate Scheduler...")
+
+    counts = {'fast': 0, 'slow': 0}
+
+    def fast():
+        counts['fast'] += 1
+
+    def slow():
+        counts['slow'] += 1
+        time.sleep(0.002)
+
+    scheduler = FixedRateScheduler()
+    scheduler.add_task('fast', 500, fast)
+    scheduler.add_task('slow', 20, slow)
+    scheduler.run(duration=1.0)
+
+    for name, stats in scheduler.get_stats().items():
+        jitter = stats['jitter_us']
+        print(f"  {name}: {stats['releases']} releases at {stats['rate_hz']} Hz, "
+              f"misses={stats['deadline_misses']}, jitter mean={jitter['mean']:.1f} us "
+              f"max={jitter['max']:.1f} us")
+
+    print("Fixed-rate scheduler test completed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,5 +10,9 @@ Version: 1.0.0
 """
 
 ## 版本日志
-- v1.0.0 2025-12-28: 初始版本 - 成功
-- v1.1.0 2025-12-28: 添加侧翻预测模块 - 待测试
\ No newline at end of file
+# - v1.0.0 2025-12-28: 初始版本 - 成功
+# - v1.1.0 2025-12-28: 添加侧翻预测模块 - 待测试
+# - v1.2.0 2026-10-17: 添加流式标准化模块(running_scaler)及增量学习模式 - 成功
+# - v1.2.1 2026-10-17: 添加后台模型训练模块(training_worker) - 成功
+# - v1.2.2 2026-10-17: 添加纯NumPy编译异常检测模型模块(compiled_forest) - 成功
+# - v1.2.3 2026-10-17: 侧翻预测新增前瞻模式(lookahead)，基于陀螺仪角速度及其趋势外推倾角并估计翻倒时间 - 成功
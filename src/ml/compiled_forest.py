@@ -0,0 +1,312 @@
+"""
+Troll-vs-Troll Project
+Compiled Isolation Forest Module
+
+This module converts a fitted scaler + sklearn IsolationForest into flat
+NumPy node arrays and scores samples with a vectorized tree walk. It
+reproduces IsolationForest.score_samples exactly (float32 input
+comparison, per-tree path lengths summed in tree order) without sklearn's
+per-call input validation and joblib dispatch, which dominate the cost
+of scoring a single sample on the UNIHIKER M10.
+
+Version: 1.1.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：纯NumPy编译异常检测模型 - 成功
+# - v1.0.1 2026-10-17: 自检迁移至tests/test_compiled_forest.py - 成功
+# - v1.1.0 2026-10-17: 批量评分改用扁平索引与float32比较，速度与sklearn持平 - 成功
+
+import numpy as np
+
+
+def average_path_length(n_samples):
+    """
+    Average path length of an unsuccessful BST search in an n-sample tree.
+
+    Same formula as sklearn's IsolationForest normalisation term.
+
+    Args:
+        n_samples (np.ndarray): Sample counts
+
+    Returns:
+        np.ndarray: Average path lengths
+    """
+    n_samples = np.asarray(n_samples, dtype=np.float64)
+    result = np.zeros(n_samples.shape)
+
+    mask = n_samples > 2
+    result[n_samples == 2] = 1.0
+    result[mask] = (
+        2.0 * (np.log(n_samples[mask] - 1.0) + np.euler_gamma)
+        - 2.0 * (n_samples[mask] - 1.0) / n_samples[mask]
+    )
+    return result
+
+
+class CompiledIsolationForest:
+    """
+    Array-based isolation forest scorer with the scaler folded in.
+
+    All trees are stored in one set of flattened node arrays. Leaves point
+    to themselves, so every sample can be walked for max_depth steps
+    without per-tree branching.
+    """
+
+    # Names of the arrays that fully describe a compiled forest
+    ARRAY_NAMES = (
+        'scaler_mean', 'scaler_scale', 'feature', 'threshold',
+        'children_left', 'children_right', 'leaf_value', 'roots', 'meta'
+    )
+
+    def __init__(self, scaler_mean, scaler_scale, feature, threshold,
+                 children_left, children_right, leaf_value, roots, meta):
+        """
+        Initialize the compiled forest from its arrays.
+
+        Args:
+            scaler_mean (np.ndarray): Scaler means, shape (n_features,)
+            scaler_scale (np.ndarray): Scaler scales, shape (n_features,)
+            feature (np.ndarray): Split feature per node (0 for leaves)
+            threshold (np.ndarray): Split threshold per node
+            children_left (np.ndarray): Global index of the left child
+            children_right (np.ndarray): Global index of the right child
+            leaf_value (np.ndarray): Path length contribution per leaf
+            roots (np.ndarray): Global index of each tree's root
+            meta (np.ndarray): [max_depth, denominator]
+        """
+        self.scaler_mean = np.asarray(scaler_mean, dtype=np.float64)
+        self.scaler_scale = np.asarray(scaler_scale, dtype=np.float64)
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.children_left = np.asarray(children_left, dtype=np.intp)
+        self.children_right = np.asarray(children_right, dtype=np.intp)
+        self.leaf_value = np.asarray(leaf_value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.meta = np.asarray(meta, dtype=np.float64)
+
+        self.max_depth = int(self.meta[0])
+        self.denominator = float(self.meta[1])
+
+        # Batch tables indexed by the walk state 2 * node (+1 to go left).
+        # Inputs are float32 values, so x <= t matches x <= t rounded down
+        # to float32 and the comparison can stay in float32.
+        threshold32 = self.threshold.astype(np.float32)
+        above = threshold32.astype(np.float64) > self.threshold
+        threshold32[above] = np.nextafter(threshold32[above], np.float32(-np.inf))
+        self._state_feature = np.repeat(self.feature, 2)
+        self._state_threshold = np.repeat(threshold32, 2)
+        self._state_child = 2 * np.stack([self.children_right, self.children_left], axis=1).ravel()
+
+    @property
+    def n_features(self):
+        """
+        Number of input features the model expects.
+        """
+        return len(self.scaler_mean)
+
+    @property
+    def n_estimators(self):
+        """
+        Number of trees in the forest.
+        """
+        return len(self.roots)
+
+    @classmethod
+    def from_model(cls, scaler, detector):
+        """
+        Compile a fitted scaler and IsolationForest.
+
+        Args:
+            scaler: Fitted scaler with mean_ and scale_ (StandardScaler or
+                RunningScaler)
+            detector: Fitted sklearn IsolationForest
+
+        Returns:
+            CompiledIsolationForest: Compiled forest
+        """
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator, estimator_features in zip(detector.estimators_, detector.estimators_features_):
+            tree = estimator.tree_
+            node_count = tree.node_count
+            left = tree.children_left.astype(np.intp)
+            right = tree.children_right.astype(np.intp)
+            is_leaf = left == -1
+
+            # Node depths (root = 0) by walking down from the root
+            depth = np.zeros(node_count, dtype=np.intp)
+            for node in range(node_count):
+                if not is_leaf[node]:
+                    depth[left[node]] = depth[node] + 1
+                    depth[right[node]] = depth[node] + 1
+            max_depth = max(max_depth, int(depth.max()))
+
+            # Map split features back to the full feature space
+            feature = np.where(is_leaf, 0, np.asarray(estimator_features)[np.maximum(tree.feature, 0)])
+
+            # Same arithmetic as sklearn: (depth + 1) + avg_path_length - 1
+            value = (depth + 1.0) + average_path_length(tree.n_node_samples) - 1.0
+
+            node_index = np.arange(node_count)
+            features.append(feature)
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_index, left) + offset)
+            rights.append(np.where(is_leaf, node_index, right) + offset)
+            values.append(np.where(is_leaf, value, 0.0))
+            roots.append(offset)
+            offset += node_count
+
+        max_samples = getattr(detector, '_max_samples', detector.max_samples_)
+        denominator = len(detector.estimators_) * average_path_length([max_samples])[0]
+
+        return cls(
+            scaler.mean_, scaler.scale_,
+            np.concatenate(features), np.concatenate(thresholds),
+            np.concatenate(lefts), np.concatenate(rights),
+            np.concatenate(values), np.array(roots),
+            np.array([max_depth, denominator])
+        )
+
+    def to_arrays(self):
+        """
+        Get the arrays describing this forest (e.g. for np.savez).
+
+        Returns:
+            dict: Arrays keyed by ARRAY_NAMES
+        """
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuild a compiled forest from the output of to_arrays().
+
+        Args:
+            arrays: Mapping with the keys in ARRAY_NAMES
+
+        Returns:
+            CompiledIsolationForest: Compiled forest
+        """
+        return cls(*(arrays[name] for name in cls.ARRAY_NAMES))
+
+    def _prepare(self, X):
+        """
+        Scale raw samples and round them to float32 like sklearn does.
+        """
+        scaled = (np.asarray(X, dtype=np.float64) - self.scaler_mean) / self.scaler_scale
+        return scaled.astype(np.float32).astype(np.float64)
+
+    def _scores_from_depths(self, depths):
+        """
+        Convert summed path lengths into sklearn's score_samples values.
+        """
+        if self.denominator == 0:
+            return -np.ones_like(depths)
+        return -(2 ** (-(depths / self.denominator)))
+
+    def score_one(self, x):
+        """
+        Anomaly score of a single raw sample, lower is more abnormal.
+
+        Args:
+            x (np.ndarray): Raw sample, shape (n_features,)
+
+        Returns:
+            float: Anomaly score
+        """
+        x = self._prepare(x)
+        nodes = self.roots
+        for _ in range(self.max_depth):
+            go_left = x[self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.children_left[nodes], self.children_right[nodes])
+
+        # Sequential sum in tree order, as sklearn accumulates it; kept as a
+        # 1-element array because scalar and array power round differently
+        depth = np.cumsum(self.leaf_value[nodes])[-1:]
+        return float(self._scores_from_depths(depth)[0])
+
+    def score_samples(self, X, chunk_size=1024):
+        """
+        Anomaly scores of raw samples, lower is more abnormal.
+
+        Every (sample, tree) pair of a chunk is walked together. The walk
+        uses flat index arithmetic, preallocated buffers and float32
+        comparisons, and the root split of all trees is a single
+        broadcast comparison, so a batch costs about as much as sklearn's
+        compiled tree traversal.
+
+        Args:
+            X (np.ndarray): Raw samples, shape (n, n_features)
+            chunk_size (int): Samples walked at once, bounds memory
+
+        Returns:
+            np.ndarray: Anomaly scores, shape (n,)
+        """
+        X = self._prepare(np.atleast_2d(X)).astype(np.float32)
+        scores = np.empty(len(X))
+        root_states = 2 * self.roots
+        root_feature = self.feature[self.roots]
+        root_threshold = self._state_threshold[root_states]
+
+        for start in range(0, len(X), chunk_size):
+            block = X[start:start + chunk_size]
+            size = block.size // self.n_features * self.n_estimators
+            flat = block.ravel()
+            offsets = np.repeat(np.arange(0, block.size, self.n_features), self.n_estimators)
+
+            states = self._state_child[(root_states + (block[:, root_feature] <= root_threshold)).ravel()]
+            following = np.empty_like(states)
+            index = np.empty_like(states)
+            values = np.empty(size, dtype=np.float32)
+            thresholds = np.empty(size, dtype=np.float32)
+            go_left = np.empty(size, dtype=bool)
+            for _ in range(self.max_depth - 1):
+                np.take(self._state_feature, states, out=index, mode='clip')
+                index += offsets
+                np.take(flat, index, out=values, mode='clip')
+                np.take(self._state_threshold, states, out=thresholds, mode='clip')
+                np.less_equal(values, thresholds, out=go_left)
+                states += go_left
+                np.take(self._state_child, states, out=following, mode='clip')
+                states, following = following, states
+
+            leaf_values = self.leaf_value[states // 2].reshape(len(block), self.n_estimators)
+            depths = np.cumsum(leaf_values, axis=1)[:, -1]
+            scores[start:start + len(block)] = self._scores_from_depths(depths)
+
+        return scores
+
+def main():
+    """
+    Main function comparing the compiled forest with sklearn (the checks
+    live in tests/test_compiled_forest.py).
+    """
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+
+    print("Compiled Isolation Forest demo...")
+
+    rng = np.random.default_rng(5)
+    train = rng.normal((0.0, 0.0, 9.81, 9.81, 0.0, 0.0), (0.3, 0.3, 0.2, 0.2, 2.0, 2.0), size=(300, 6))
+    test = rng.normal((0.0, 0.0, 9.81, 9.81, 0.0, 0.0), (1.0, 1.0, 0.8, 0.8, 8.0, 8.0), size=(2000, 6))
+
+    scaler = StandardScaler().fit(train)
+    detector = IsolationForest(contamination=0.1, random_state=42).fit(scaler.transform(train))
+    compiled = CompiledIsolationForest.from_model(scaler, detector)
+
+    expected = detector.score_samples(scaler.transform(test))
+    batch = compiled.score_samples(test, chunk_size=333)
+    single = np.array([compiled.score_one(x) for x in test[:200]])
+
+    print(f"Compiled {compiled.n_estimators} trees, {len(compiled.feature)} nodes, "
+          f"max depth {compiled.max_depth}")
+    print(f"Scores identical to sklearn: batch {np.array_equal(batch, expected)}, "
+          f"single {np.array_equal(single, expected[:200])}")
+    print("Compiled isolation forest demo completed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,144 @@ This module implements machine learning algorithms to predict rollover
 risk based on sensor data (accelerometer, gyroscope, etc.). Uses 
 real-time data to determine when differential control is needed.
 
-Version: 1.0.0
+Version: 1.12.0
 """
 
+## 版本日志
+# - v1.0.0 2025-12-28: 初始版本 - 待测试
+# - v1.1.0 2026-10-17: 新增predict_from_features()直接使用特征向量 - 成功
+# - v1.2.0 2026-10-17: 新增predict_rollover_risk_batch()向量化批量推理 - 成功
+# - v1.3.0 2026-10-17: 新增增量学习模式，历史数据改用环形缓冲区 - 成功
+# - v1.4.0 2026-10-17: 模型训练移至后台训练线程/进程 - 成功
+# - v1.5.0 2026-10-17: 改用纯NumPy编译异常检测模型评分 - 成功
+# - v1.6.0 2026-10-17: 新增save()/load()模型持久化与热启动 - 成功
+# - v1.7.0 2026-10-17: scikit-learn延迟导入 - 成功
+# - v1.8.0 2026-10-17: 支持注入时钟 - 成功
+# - v1.9.0 2026-10-17: 新增predict_from_features_batch() - 成功
+# - v1.10.0 2026-10-17: 新增lookahead前瞻模式与time_to_rollover估计 - 成功
+# - v1.11.0 2026-10-17: 可选共享attitude姿态 - 成功
+# - v1.11.1 2026-10-17: 批量推理自检迁移至tests/test_rollover_prediction.py - 成功
+# - v1.11.2 2026-10-17: 模型输入不再截去时间戳列；score_anomaly拒绝特征数不匹配的输入；移除未使用的clock参数 - 成功
+# - v1.11.3 2026-10-17: 前瞻自检迁移至tests/test_rollover_prediction.py - 成功
+# - v1.11.4 2026-10-17: predict_rollover_risk_batch()返回anomaly_score - 成功
+# - v1.12.0 2026-10-17: predict_rollover_risk_batch()在有姿态滤波器时使用滤波器副本计算倾角 - 成功
+
+import copy
+import math
 import time
 import numpy as np
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
+
+from ..sensors import features as F
+from ..sensors.ring_buffer import RingBuffer
+from .compiled_forest import CompiledIsolationForest
+from .running_scaler import RunningScaler
+from .training_worker import ModelTrainingWorker, TrainedModel, fit_anomaly_model
+
+
+# Feature vector columns in the order of preprocess_sensor_data() output
+MODEL_INPUT_COLUMNS = [
+    F.ACCEL_X, F.ACCEL_Y, F.ACCEL_Z, F.ACCEL_MAGNITUDE, F.PITCH, F.ROLL,
+    F.GYRO_X, F.GYRO_Y, F.GYRO_Z
+]
+
+# Anomaly models see the accelerometer features, optionally followed by the gyro rates
+MODEL_INPUT_SIZES = (6, 9)
+
+
+# Version of the on-disk model format written by RolloverPredictor.save()
+MODEL_FORMAT_VERSION = 1
+
+
+def peak_tilt(angle, rate, trend, horizon):
+    """
+    Largest absolute tilt within a horizon under constant angular acceleration.
+    
+    Args:
+        angle (float): Current angle in degrees
+        rate (float): Angular rate in deg/s
+        trend (float): Angular acceleration in deg/s^2
+        horizon (float): Look-ahead time in seconds
+        
+    Returns:
+        float: Peak absolute angle in degrees over [0, horizon]
+    """
+    end = angle + rate * horizon + 0.5 * trend * horizon * horizon
+    peak = max(abs(angle), abs(end))
+    if trend != 0.0:
+        # Turning point of the parabola inside the horizon
+        t = -rate / trend
+        if 0.0 < t < horizon:
+            peak = max(peak, abs(angle + rate * t + 0.5 * trend * t * t))
+    return peak
+
+
+def time_to_threshold(angle, rate, trend, threshold):
+    """
+    Time until the absolute angle reaches a threshold under constant
+    angular acceleration.
+    
+    Args:
+        angle (float): Current angle in degrees
+        rate (float): Angular rate in deg/s
+        trend (float): Angular acceleration in deg/s^2
+        threshold (float): Angle threshold in degrees
+        
+    Returns:
+        float: Seconds until |angle| >= threshold (0 if already there,
+            inf if never)
+    """
+    if abs(angle) >= threshold:
+        return 0.0
+    
+    best = math.inf
+    for target in (threshold, -threshold):
+        offset = angle - target
+        if trend == 0.0:
+            if rate != 0.0 and -offset / rate > 0.0:
+                best = min(best, -offset / rate)
+            continue
+        # 0.5 * trend * t^2 + rate * t + offset = 0
+        discriminant = rate * rate - 2.0 * trend * offset
+        if discriminant < 0.0:
+            continue
+        root = math.sqrt(discriminant)
+        for t in ((-rate - root) / trend, (-rate + root) / trend):
+            if t > 0.0:
+                best = min(best, t)
+    return best
+
+
+def peak_tilt_batch(angle, rate, trend, horizon):
+    """
+    Vectorized form of peak_tilt().
+    """
+    end = angle + rate * horizon + 0.5 * trend * horizon * horizon
+    peak = np.maximum(np.abs(angle), np.abs(end))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(trend != 0.0, -rate / trend, 0.0)
+    inside = (t > 0.0) & (t < horizon)
+    turning = np.abs(angle + rate * t + 0.5 * trend * t * t)
+    return np.where(inside, np.maximum(peak, turning), peak)
+
+
+def time_to_threshold_batch(angle, rate, trend, threshold):
+    """
+    Vectorized form of time_to_threshold().
+    """
+    angle, rate, trend = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (angle, rate, trend)))
+    best = np.full(angle.shape, np.inf)
+    linear = trend == 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for target in (threshold, -threshold):
+            offset = angle - target
+            t = -offset / rate
+            best = np.where(linear & (rate != 0.0) & (t > 0.0), np.minimum(best, t), best)
+            discriminant = rate * rate - 2.0 * trend * offset
+            root = np.sqrt(discriminant)
+            for t in ((-rate - root) / trend, (-rate + root) / trend):
+                valid = ~linear & (discriminant >= 0.0) & (t > 0.0)
+                best = np.where(valid, np.minimum(best, t), best)
+    return np.where(np.abs(angle) >= threshold, 0.0, best)
 
 
 class RolloverPredictor:
@@ -22,29 +153,66 @@ class RolloverPredictor:
     to determine when the pull-handle carrier is at risk of rollover.
     """
     
-    def __init__(self):
+    def __init__(self, learning_mode="batch", max_history=100, refit_interval=50,
+                 background_training=True, use_process_training=False,
+                 lookahead=None, attitude=None):
         """
         Initialize the rollover prediction model.
+        
+        Args:
+            learning_mode (str): "batch" trains once on the first history,
+                "incremental" keeps a running scaler and refits the anomaly
+                detector in the background every refit_interval points
+            max_history (int): Number of recent data points kept for training
+            refit_interval (int): Data points between background refits
+            background_training (bool): Fit models in a training worker
+                instead of inside update_model()
+            use_process_training (bool): Use a worker process instead of a
+                thread for background training
+            lookahead (float, optional): Look-ahead horizon in seconds. When
+                set, pitch and roll are extrapolated with the gyro rates (and
+                their trend) and the risk is scored on the peak predicted
+                tilt; None scores the current tilt only
+            attitude (ComplementaryFilter or AttitudeEKF, optional): Attitude
+                filter shared with the SensorDataProcessor; its pitch and roll
+                replace the accelerometer angles in preprocess_sensor_data().
+                The predictor only reads it, whoever feeds the samples updates it
         """
         # TODO: Implement machine learning model for rollover prediction - HIGH - Developer
         # TODO: Use accelerometer and other sensor data to predict rollover risk - HIGH - Developer
         # TODO: Implement real-time prediction algorithm - MEDIUM - Developer
         
-        # Initialize ML components
-        self.scaler = StandardScaler()
-        self.anomaly_detector = IsolationForest(contamination=0.1, random_state=42)
+        if learning_mode not in ("batch", "incremental"):
+            raise ValueError(f"Invalid learning mode: {learning_mode}")
+        
+        # Initialize ML components (sklearn objects are created by the first
+        # fit, so the threshold-only path never imports scikit-learn)
+        self.learning_mode = learning_mode
+        self.scaler = RunningScaler() if learning_mode == "incremental" else None
+        self.anomaly_detector = None
         
         # Thresholds based on research (from GB/T 21023-2024 standard)
         self.rollover_angle_threshold = 15.0  # degrees
         self.wheel_slip_threshold = 0.1  # ratio
+        self.lookahead = lookahead  # seconds, None = current tilt only
+        self.attitude = attitude
         
-        # Store historical data for prediction
-        self.historical_data = []
-        self.max_history = 100
+        # Store historical data for prediction (ring buffer, created on first point)
+        self._history = None
+        self.max_history = max_history
         
         # Model parameters
         self.is_trained = False
         self.normal_behavior_model = None
+        self.model = None  # TrainedModel currently served, None -> threshold only
+        
+        # Online learning state
+        self.refit_interval = refit_interval
+        self._points_since_refit = 0
+        self.training_worker = (
+            ModelTrainingWorker(self._swap_model, use_processes=use_process_training)
+            if background_training else None
+        )
         
         print("RolloverPredictor initialized")
 
@@ -66,18 +234,21 @@ class RolloverPredictor:
         # Calculate magnitude of acceleration
         accel_magnitude = (ax**2 + ay**2 + az**2)**0.5
         
-        # Calculate tilt angles (simplified)
-        pitch = np.arctan2(ax, np.sqrt(ay**2 + az**2)) * 180 / np.pi
-        roll = np.arctan2(ay, az) * 180 / np.pi
+        # Tilt angles from the shared attitude filter, else from this sample
+        if self.attitude is not None and self.attitude.initialized:
+            pitch, roll = self.attitude.orientation()
+        else:
+            pitch = np.arctan2(ax, np.sqrt(ay**2 + az**2)) * 180 / np.pi
+            roll = np.arctan2(ay, az) * 180 / np.pi
         
         # Create feature vector
         features = [ax, ay, az, accel_magnitude, pitch, roll]
         
-        if gyro_data:
+        if gyro_data is not None:
             gx, gy, gz = gyro_data
             features.extend([gx, gy, gz])
         
-        if time_stamp:
+        if time_stamp is not None:
             features.append(time_stamp)
             
         return np.array(features).reshape(1, -1)
@@ -93,14 +264,107 @@ class RolloverPredictor:
         Returns:
             dict: Risk assessment with probability and confidence
         """
-        # Preprocess the input data
-        features = self.preprocess_sensor_data(accel_data, gyro_data, time.time())
+        # Preprocess the input data (no timestamp, this is the model input layout)
+        features = self.preprocess_sensor_data(accel_data, gyro_data)
         
         # Simple threshold-based prediction (would be replaced with trained model)
         ax, ay, az, accel_mag, pitch, roll = features[0][:6]
         
+        assessment = self._assess_risk(pitch, roll, accel_mag, gyro_data)
+        
+        # An accelerometer-only model ignores the gyro columns; a gyro
+        # model cannot score a sample without gyro data
+        model = self.model
+        if model is None or features.shape[1] < model.n_features:
+            assessment["anomaly_score"] = None
+        else:
+            assessment["anomaly_score"] = self.score_anomaly(features[:, :model.n_features])
+        return assessment
+
+    def predict_from_features(self, feature_vector, gyro_trend=None):
+        """
+        Predict the rollover risk from a processor feature vector.
+        
+        Consumes the flat vector filled by
+        SensorDataProcessor.get_feature_vector(), so magnitude, pitch and
+        roll are not recomputed from the raw readings.
+        
+        Args:
+            feature_vector (np.ndarray): Feature vector (see features.py)
+            gyro_trend (tuple, optional): Gyro trend in rad/s^2 from
+                SensorDataProcessor.get_gyro_trend(), used with lookahead
+            
+        Returns:
+            dict: Risk assessment with probability and confidence
+        """
+        assessment = self._assess_risk(
+            feature_vector[F.PITCH],
+            feature_vector[F.ROLL],
+            feature_vector[F.ACCEL_MAGNITUDE],
+            feature_vector[F.GYRO_X:F.GYRO_Z + 1],
+            gyro_trend
+        )
+        model = self.model
+        if model is not None:
+            assessment["anomaly_score"] = self.score_anomaly(
+                feature_vector[MODEL_INPUT_COLUMNS[:model.n_features]].reshape(1, -1)
+            )
+        else:
+            assessment["anomaly_score"] = None
+        return assessment
+
+    def predict_from_features_batch(self, feature_matrix, gyro_trend=None):
+        """
+        Predict the rollover risk for N feature vectors in one vectorized pass.
+
+        Row i gives the same result as predict_from_features(feature_matrix[i]).
+        rollover_angle_threshold may be an array of N per-row thresholds.
+
+        Args:
+            feature_matrix (np.ndarray): Feature vectors, shape (N, NUM_FEATURES)
+            gyro_trend (np.ndarray, optional): Gyro trends in rad/s^2, shape (N, 3)
+
+        Returns:
+            dict: Arrays of length N keyed like predict_from_features();
+                anomaly_score is None when no model is served
+        """
+        assessment = self._assess_risk_batch(
+            feature_matrix[:, F.PITCH],
+            feature_matrix[:, F.ROLL],
+            feature_matrix[:, F.ACCEL_MAGNITUDE],
+            feature_matrix[:, F.GYRO_X:F.GYRO_Z + 1],
+            gyro_trend
+        )
+        model = self.model
+        if model is not None:
+            assessment["anomaly_score"] = model.score_samples(
+                feature_matrix[:, MODEL_INPUT_COLUMNS[:model.n_features]]
+            )
+        else:
+            assessment["anomaly_score"] = None
+        return assessment
+
+    def _assess_risk(self, pitch, roll, accel_mag, gyro=None, gyro_trend=None):
+        """
+        Threshold-based risk assessment from tilt angles and acceleration.
+        
+        Args:
+            pitch (float): Pitch angle in degrees
+            roll (float): Roll angle in degrees
+            accel_mag (float): Acceleration magnitude in m/s^2
+            gyro (tuple, optional): (x, y, z) angular rates in rad/s, used
+                with lookahead
+            gyro_trend (tuple, optional): (x, y, z) rate trends in rad/s^2
+            
+        Returns:
+            dict: Risk assessment with probability and confidence
+        """
         # Calculate risk factors
-        tilt_risk = max(abs(pitch), abs(roll)) / self.rollover_angle_threshold
+        tilt = max(abs(pitch), abs(roll))
+        if self.lookahead is not None:
+            lookahead = self._look_ahead(pitch, roll, gyro, gyro_trend)
+            tilt = max(tilt, lookahead["predicted_tilt"])
+        tilt_risk = tilt / self.rollover_angle_threshold
         accel_risk = accel_mag / 9.81  # normalized to gravity
         
         # Combined risk score (simplified model)
@@ -114,58 +378,371 @@ class RolloverPredictor:
         else:
             risk_level = "LOW"
             
-        return {
+        assessment = {
             "risk_score": float(risk_score),
             "risk_level": risk_level,
-            "tilt_angle": max(abs(pitch), abs(roll)),
+            "tilt_angle": float(max(abs(pitch), abs(roll))),
+            "acceleration": float(accel_mag),
+            "needs_control": bool(risk_score > 0.3)
+        }
+        if self.lookahead is not None:
+            assessment.update(lookahead)
+        return assessment
+
+    def _look_ahead(self, pitch, roll, gyro=None, gyro_trend=None):
+        """
+        Extrapolate pitch and roll over the look-ahead horizon.
+        
+        Roll turns about the x axis, so gyro x is the roll rate. Pitch
+        (atan2 of ax) grows with a negative turn about the y axis, so the
+        pitch rate is -gyro y. Without gyro data the tilt is held.
+        
+        Returns:
+            dict: Peak predicted tilt in degrees and time to rollover in seconds
+        """
+        to_degrees = 180 / math.pi
+        roll_rate = pitch_rate = roll_trend = pitch_trend = 0.0
+        if gyro is not None:
+            roll_rate = float(gyro[0]) * to_degrees
+            pitch_rate = -float(gyro[1]) * to_degrees
+        if gyro_trend is not None:
+            roll_trend = float(gyro_trend[0]) * to_degrees
+            pitch_trend = -float(gyro_trend[1]) * to_degrees
+        
+        pitch = float(pitch)
+        roll = float(roll)
+        threshold = self.rollover_angle_threshold
+        return {
+            "predicted_tilt": float(max(peak_tilt(pitch, pitch_rate, pitch_trend, self.lookahead),
+                                        peak_tilt(roll, roll_rate, roll_trend, self.lookahead))),
+            "time_to_rollover": float(min(time_to_threshold(pitch, pitch_rate, pitch_trend, threshold),
+                                          time_to_threshold(roll, roll_rate, roll_trend, threshold)))
+        }
+
+    def predict_rollover_risk_batch(self, accel, gyro=None, timestamps=None):
+        """
+        Predict the rollover risk for N samples in one vectorized pass.
+        
+        Gives the same results as calling predict_rollover_risk() on each
+        sample, without the per-call Python overhead. With an attitude
+        filter and gyro data the tilt comes from a fresh copy of the filter
+        run over the samples (as SensorDataProcessor.extract_features_batch()
+        does), so it matches live scoring of the same recording with a
+        filter started on its first sample; the shared filter is left
+        untouched. Without gyro data the filter cannot run and each
+        sample's accelerometer tilt is used.
+        
+        Args:
+            accel (np.ndarray): Acceleration values, shape (N, 3)
+            gyro (np.ndarray, optional): Gyroscope values, shape (N, 3)
+            timestamps (np.ndarray, optional): Sample timestamps, shape (N,),
+                used by the attitude filter
+            
+        Returns:
+            dict: Arrays of length N keyed like predict_rollover_risk();
+                anomaly_score is None when no model is served or the model
+                needs gyro data that was not given
+        """
+        accel = np.asarray(accel, dtype=np.float64)
+        if accel.ndim != 2 or accel.shape[1] != 3:
+            raise ValueError("Acceleration data must be an array of shape (N, 3)")
+        if gyro is not None:
+            gyro = np.asarray(gyro, dtype=np.float64)
+            if gyro.shape != accel.shape:
+                raise ValueError("Gyroscope data must have the same shape as acceleration data")
+        
+        # Model input layout of preprocess_sensor_data(), one row per sample
+        num_columns = 6 if gyro is None else 9
+        features = np.empty((len(accel), num_columns))
+        features[:, :3] = accel
+        ax, ay, az = accel.T
+        features[:, 3] = (ax**2 + ay**2 + az**2)**0.5
+        if self.attitude is not None and gyro is not None:
+            self._filtered_tilt_batch(accel, gyro, timestamps, features[:, 4:6])
+        else:
+            features[:, 4] = np.arctan2(ax, np.sqrt(ay**2 + az**2)) * 180 / np.pi
+            features[:, 5] = np.arctan2(ay, az) * 180 / np.pi
+        if gyro is not None:
+            features[:, 6:] = gyro
+        
+        assessment = self._assess_risk_batch(features[:, 4], features[:, 5], features[:, 3], gyro)
+        
+        model = self.model
+        if model is None or num_columns < model.n_features:
+            assessment["anomaly_score"] = None
+        else:
+            assessment["anomaly_score"] = model.score_samples(features[:, :model.n_features])
+        return assessment
+
+    def _filtered_tilt_batch(self, accel, gyro, timestamps, tilt):
+        """
+        Fill (pitch, roll) rows by running a fresh copy of the attitude filter.
+        """
+        attitude = copy.deepcopy(self.attitude)
+        attitude.reset()
+        times = [np.nan] * len(accel) if timestamps is None else np.asarray(timestamps, dtype=np.float64).tolist()
+        for i, (row_accel, row_gyro, timestamp) in enumerate(zip(accel.tolist(), gyro.tolist(), times)):
+            attitude.update(row_accel, row_gyro, timestamp)
+            tilt[i] = attitude.orientation()
+
+    def _assess_risk_batch(self, pitch, roll, accel_mag, gyro=None, gyro_trend=None):
+        """
+        Vectorized form of _assess_risk().
+        
+        Args:
+            pitch (np.ndarray): Pitch angles in degrees
+            roll (np.ndarray): Roll angles in degrees
+            accel_mag (np.ndarray): Acceleration magnitudes in m/s^2
+            gyro (np.ndarray, optional): Angular rates in rad/s, shape (N, 3)
+            gyro_trend (np.ndarray, optional): Rate trends in rad/s^2, shape (N, 3)
+            
+        Returns:
+            dict: Arrays of risk scores, levels, tilt, acceleration and control flags
+        """
+        tilt_angle = np.maximum(np.abs(pitch), np.abs(roll))
+        tilt = tilt_angle
+        if self.lookahead is not None:
+            lookahead = self._look_ahead_batch(pitch, roll, gyro, gyro_trend)
+            tilt = np.maximum(tilt, lookahead["predicted_tilt"])
+        tilt_risk = tilt / self.rollover_angle_threshold
+        accel_risk = accel_mag / 9.81  # normalized to gravity
+        
+        risk_score = np.minimum(1.0, np.maximum(tilt_risk, accel_risk - 1.0))
+        
+        risk_level = np.full(risk_score.shape, "LOW", dtype="<U6")
+        risk_level[risk_score > 0.4] = "MEDIUM"
+        risk_level[risk_score > 0.8] = "HIGH"
+        
+        assessment = {
+            "risk_score": risk_score,
+            "risk_level": risk_level,
+            "tilt_angle": tilt_angle,
             "acceleration": accel_mag,
             "needs_control": risk_score > 0.3
         }
+        if self.lookahead is not None:
+            assessment.update(lookahead)
+        return assessment
+
+    def _look_ahead_batch(self, pitch, roll, gyro=None, gyro_trend=None):
+        """
+        Vectorized form of _look_ahead().
+        """
+        to_degrees = 180 / np.pi
+        zeros = np.zeros_like(pitch)
+        roll_rate = zeros if gyro is None else gyro[:, 0] * to_degrees
+        pitch_rate = zeros if gyro is None else -gyro[:, 1] * to_degrees
+        roll_trend = zeros if gyro_trend is None else gyro_trend[:, 0] * to_degrees
+        pitch_trend = zeros if gyro_trend is None else -gyro_trend[:, 1] * to_degrees
+        
+        threshold = self.rollover_angle_threshold
+        return {
+            "predicted_tilt": np.maximum(peak_tilt_batch(pitch, pitch_rate, pitch_trend, self.lookahead),
+                                         peak_tilt_batch(roll, roll_rate, roll_trend, self.lookahead)),
+            "time_to_rollover": np.minimum(time_to_threshold_batch(pitch, pitch_rate, pitch_trend, threshold),
+                                           time_to_threshold_batch(roll, roll_rate, roll_trend, threshold))
+        }
+
+    @property
+    def historical_data(self):
+        """
+        Historical data points, oldest first.
+        
+        Returns:
+            np.ndarray: Zero-copy view of the history ring buffer
+        """
+        if self._history is None:
+            return np.empty((0, 0))
+        return self._history.view()
 
     def update_model(self, new_data_point):
         """
         Update the model with new data (online learning).
         
+        In "batch" mode the model is trained once when enough history is
+        available. In "incremental" mode the scaler is updated with every
+        point and the anomaly detector is refitted every refit_interval
+        points. With background training the fit runs in the training
+        worker, so this call never waits for it; predictions keep using
+        the previous model (or the threshold fallback) until the swap.
+        
         Args:
-            new_data_point: New sensor data point to learn from
+            new_data_point: New sensor data point (feature vector) to learn from
         """
-        # Add to historical data
-        self.historical_data.append(new_data_point)
+        point = np.asarray(new_data_point, dtype=np.float64).ravel()
+        if len(point) not in MODEL_INPUT_SIZES:
+            raise ValueError(f"Data points must hold {' or '.join(map(str, MODEL_INPUT_SIZES))} "
+                             f"features (preprocess_sensor_data() without timestamp), got {len(point)}")
         
-        # Keep only recent data
-        if len(self.historical_data) > self.max_history:
-            self.historical_data.pop(0)
+        # Add to historical data (ring buffer keeps only recent data)
+        if self._history is None:
+            self._history = RingBuffer(self.max_history, width=len(point), with_timestamps=False)
+        self._history.append(point)
+        
+        if self.learning_mode == "incremental":
+            self.scaler.partial_fit(point)
+            self._points_since_refit += 1
+            due = not self.is_trained or self._points_since_refit >= self.refit_interval
+        else:
+            due = not self.is_trained
             
         # Retrain if enough data is available
-        if len(self.historical_data) > 10 and not self.is_trained:
-            self._train_model()
-            self.is_trained = True
+        if len(self._history) > 10 and due:
+            if self.training_worker is None:
+                self._train_model()
+            elif self.training_worker.submit(self._history.view(), self._scaler_snapshot()):
+                self._points_since_refit = 0
+
+    def _scaler_snapshot(self):
+        """
+        Scaler to train with: frozen running scaler, or None to fit a new one.
+        """
+        if self.learning_mode == "incremental":
+            return self.scaler.copy()
+        return None
+
+    def _swap_model(self, model):
+        """
+        Start serving a newly trained model.
+        
+        Args:
+            model (TrainedModel): Fitted scaler and anomaly detector
+        """
+        # Single reference assignment, so predictions see either model
+        self.model = model
+        if model.detector is not None:
+            self.anomaly_detector = model.detector
+        if self.learning_mode == "batch" and model.scaler is not None:
+            self.scaler = model.scaler
+        self.is_trained = True
+
+    def save(self, path):
+        """
+        Save the served model and thresholds to a compact .npz file.
+        
+        The file holds the compiled forest arrays (scaler folded in), so
+        loading it needs neither sklearn nor pickle.
+        
+        Args:
+            path (str): Destination file path
+        """
+        model = self.model
+        if model is None:
+            raise ValueError("No trained model to save")
+        
+        arrays = model.compiled.to_arrays()
+        scaler = model.scaler
+        var = getattr(scaler, 'var_', None)
+        np.savez(
+            path,
+            format_version=np.array(MODEL_FORMAT_VERSION),
+            thresholds=np.array([self.rollover_angle_threshold, self.wheel_slip_threshold]),
+            n_samples=np.array(model.n_samples),
+            scaler_var=np.square(model.compiled.scaler_scale) if var is None else var,
+            **arrays
+        )
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """
+        Create a predictor that serves a model saved with save().
+        
+        Args:
+            path (str): Model file path
+            **kwargs: Further RolloverPredictor constructor arguments
+            
+        Returns:
+            RolloverPredictor: Predictor serving the loaded model
+        """
+        with np.load(path) as data:
+            version = int(data['format_version'])
+            if version != MODEL_FORMAT_VERSION:
+                raise ValueError(f"Unsupported model format version: {version}")
+            arrays = {name: data[name] for name in CompiledIsolationForest.ARRAY_NAMES}
+            angle_threshold, slip_threshold = data['thresholds'].tolist()
+            n_samples = int(data['n_samples'])
+            scaler_var = data['scaler_var']
+        
+        predictor = cls(**kwargs)
+        predictor.rollover_angle_threshold = angle_threshold
+        predictor.wheel_slip_threshold = slip_threshold
+        
+        compiled = CompiledIsolationForest.from_arrays(arrays)
+        if compiled.n_features not in MODEL_INPUT_SIZES:
+            raise ValueError(f"Unsupported model input size: {compiled.n_features}")
+        if predictor.learning_mode == "incremental":
+            # Warm start the running scaler from the saved statistics
+            scaler = predictor.scaler
+            scaler.n_samples_seen_ = n_samples
+            scaler.mean_ = compiled.scaler_mean.copy()
+            scaler.var_ = scaler_var.copy()
+            scaler.scale_ = compiled.scaler_scale.copy()
+            scaler._m2 = scaler_var * n_samples
+        
+        predictor._swap_model(TrainedModel(None, None, n_samples, 0.0, time.monotonic(), compiled))
+        return predictor
+
+    def wait_for_training(self, timeout=None):
+        """
+        Block until a running background fit has been swapped in.
+        
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds
+        """
+        if self.training_worker is not None:
+            self.training_worker.wait(timeout)
+
+    def get_training_metrics(self):
+        """
+        Get background training and model swap metrics.
+        
+        Returns:
+            dict: Training metrics, or None without background training
+        """
+        if self.training_worker is None:
+            return None
+        return self.training_worker.get_metrics()
+
+    def score_anomaly(self, model_input):
+        """
+        Anomaly score of one sample under the currently served model.
+        
+        Args:
+            model_input (np.ndarray): Sample laid out like
+                preprocess_sensor_data() without timestamp, shape (1, n)
+                with n equal to the served model's feature count
+            
+        Returns:
+            float: Anomaly score (lower is more abnormal), or None if no
+                model is served
+        """
+        model = self.model
+        if model is None:
+            return None
+        if model_input.shape[-1] != model.n_features:
+            raise ValueError(f"Model expects {model.n_features} features, got {model_input.shape[-1]}")
+        return model.score_one(model_input.ravel())
 
     def _train_model(self):
         """
         Internal method to train the ML model on historical data.
         """
-        if len(self.historical_data) == 0:
+        if self._history is None or len(self._history) == 0:
             return
-            
-        # Convert historical data to feature matrix
-        feature_matrix = np.array(self.historical_data)
         
-        # Normalize the features
-        normalized_features = self.scaler.fit_transform(feature_matrix)
+        # Fit scaler and anomaly detector on the history, then serve them
+        self._swap_model(fit_anomaly_model(self._history.view(), self._scaler_snapshot()))
+        self._points_since_refit = 0
         
-        # Train anomaly detector
-        self.anomaly_detector.fit(normalized_features)
-        
-        self.is_trained = True
-        print(f"Model trained on {len(self.historical_data)} data points")
+        print(f"Model trained on {len(self._history)} data points")
 
 
 def main():
     """
-    Main function for testing the rollover prediction module.
+    Main function demonstrating the rollover prediction module (the checks
+    live in tests/test_rollover_prediction.py).
     """
-    print("Testing Rollover Prediction Module...")
+    print("Rollover Prediction demo...")
     
     predictor = RolloverPredictor()
     
@@ -177,6 +754,40 @@ def main():
     test_accel_data = (2.0, 4.0, 8.0)  # High risk state
     result = predictor.predict_rollover_risk(test_accel_data)
     print(f"High risk state: {result}")
+    
+    # Batch prediction over a block of samples (tests/test_rollover_prediction.py
+    # checks it against the per-sample path)
+    rng = np.random.default_rng(3)
+    accel = rng.normal((0.0, 0.0, 9.81), (3.0, 3.0, 2.0), size=(2000, 3))
+    batch = predictor.predict_rollover_risk_batch(accel)
+    print(f"Batch prediction on {len(accel)} samples, "
+          f"{int(batch['needs_control'].sum())} need control")
+
+    # Look-ahead: a carrier rolling at 30 deg/s is flagged before it tilts
+    # (tests/test_rollover_prediction.py checks the batch path against it)
+    ahead = RolloverPredictor(lookahead=0.25)
+    rolling = ahead.predict_rollover_risk((0.0, 1.7, 9.66), (np.radians(30.0), 0.0, 0.0))
+    current = predictor.predict_rollover_risk((0.0, 1.7, 9.66))
+    print(f"Look-ahead 0.25 s: tilt {rolling['tilt_angle']:.1f} -> {rolling['predicted_tilt']:.1f} deg, "
+          f"rollover in {rolling['time_to_rollover']:.2f} s, risk {rolling['risk_score']:.2f} "
+          f"(current tilt only: {current['risk_score']:.2f})")
+
+    # Incremental learning: updates return immediately, refits run in background
+    online = RolloverPredictor(learning_mode="incremental", refit_interval=50)
+    worst_update = 0.0
+    for sample in accel[:500]:
+        start = time.perf_counter()
+        online.update_model(online.preprocess_sensor_data(tuple(sample)))
+        worst_update = max(worst_update, time.perf_counter() - start)
+    online.wait_for_training()
+    metrics = online.get_training_metrics()
+    print(f"Incremental learning: trained={online.is_trained}, "
+          f"history={len(online.historical_data)}, worst update={worst_update * 1000:.2f} ms")
+    print(f"Background training: {metrics['trainings_completed']} fits, "
+          f"mean fit {metrics['mean_train_duration'] * 1000:.1f} ms, "
+          f"swap latency {metrics['last_swap_latency'] * 1000:.3f} ms")
+    print(f"Served model scores anomaly: "
+          f"{online.predict_rollover_risk((2.0, 4.0, 8.0))['anomaly_score']:.3f}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+"""
+Troll-vs-Troll Project
+Running Scaler Module
+
+This module implements a streaming feature scaler with the same interface
+as sklearn's StandardScaler (partial_fit/transform, mean_/var_/scale_).
+Running means and variances are merged with Chan's parallel update, so a
+new sample or batch is absorbed in constant time per feature without
+keeping or refitting on the whole history.
+
+Version: 1.0.1
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：流式标准化 - 成功
+# - v1.0.1 2026-10-17: 自检迁移至tests/test_running_scaler.py - 成功
+
+import numpy as np
+
+
+class RunningScaler:
+    """
+    Standardizes features using running mean and variance estimates.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty running scaler.
+        """
+        self.n_samples_seen_ = 0
+        self.mean_ = None
+        self.var_ = None
+        self.scale_ = None
+        self._m2 = None
+
+    def partial_fit(self, X):
+        """
+        Update the running mean and variance with new samples.
+
+        Args:
+            X (np.ndarray): One sample (n_features,) or a batch (n, n_features)
+
+        Returns:
+            RunningScaler: self
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        count = X.shape[0]
+        if count == 0:
+            return self
+
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+
+        if self.mean_ is None:
+            self.mean_ = batch_mean
+            self._m2 = batch_m2
+            self.n_samples_seen_ = count
+        else:
+            if X.shape[1] != self.mean_.shape[0]:
+                raise ValueError("Number of features does not match previous data")
+
+            total = self.n_samples_seen_ + count
+            delta = batch_mean - self.mean_
+            self.mean_ = self.mean_ + delta * (count / total)
+            self._m2 = self._m2 + batch_m2 + delta ** 2 * (self.n_samples_seen_ * count / total)
+            self.n_samples_seen_ = total
+
+        self.var_ = self._m2 / self.n_samples_seen_
+        scale = np.sqrt(self.var_)
+        scale[scale == 0.0] = 1.0  # same convention as StandardScaler
+        self.scale_ = scale
+        return self
+
+    def transform(self, X):
+        """
+        Standardize samples with the current estimates.
+
+        Args:
+            X (np.ndarray): Samples, shape (n, n_features)
+
+        Returns:
+            np.ndarray: Standardized samples
+        """
+        if self.mean_ is None:
+            raise ValueError("RunningScaler has not seen any data yet")
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+    def fit_transform(self, X):
+        """
+        Reset the scaler, fit it on X and return the standardized X.
+
+        Args:
+            X (np.ndarray): Samples, shape (n, n_features)
+
+        Returns:
+            np.ndarray: Standardized samples
+        """
+        self.__init__()
+        return self.partial_fit(X).transform(X)
+
+    def copy(self):
+        """
+        Get an independent snapshot of the current estimates.
+
+        Returns:
+            RunningScaler: Frozen copy of this scaler
+        """
+        snapshot = RunningScaler()
+        if self.mean_ is not None:
+            snapshot.n_samples_seen_ = self.n_samples_seen_
+            snapshot.mean_ = self.mean_.copy()
+            snapshot.var_ = self.var_.copy()
+            snapshot.scale_ = self.scale_.copy()
+            snapshot._m2 = self._m2.copy()
+        return snapshot
+
+
+def main():
+    """
+    Main function comparing the running scaler with StandardScaler (the
+    checks live in tests/test_running_scaler.py).
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    print("Running Scaler demo...")
+
+    rng = np.random.default_rng(1)
+    data = rng.normal((0.0, 0.0, 9.81, 1.0), (1.0, 2.0, 0.5, 0.0), size=(1000, 4))
+
+    scaler = RunningScaler()
+    for row in data[:500]:
+        scaler.partial_fit(row)
+    scaler.partial_fit(data[500:])
+
+    reference = StandardScaler().fit(data)
+    print(f"Running mean: {np.round(scaler.mean_, 3)}")
+    print(f"Largest deviation from StandardScaler: "
+          f"{np.abs(scaler.transform(data) - reference.transform(data)).max():.2e}")
+    print("Running scaler demo completed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Troll-vs-Troll Project
+Model Training Worker Module
+
+This module moves anomaly detector training off the control loop.
+ModelTrainingWorker fits a new scaler + IsolationForest in a background
+thread or process and hands the finished TrainedModel to a callback,
+which swaps it in with a single reference assignment. The predictor keeps
+serving the previous model (or its threshold fallback) until then.
+
+Version: 1.3.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：后台模型训练线程/进程 - 成功
+# - v1.1.0 2026-10-17: 训练结果编译为纯NumPy评分模型 - 成功
+# - v1.2.0 2026-10-17: 训练结果保存模型格式所需数据 - 成功
+# - v1.3.0 2026-10-17: 执行器类延迟导入 - 成功
+
+import threading
+import time
+
+import numpy as np
+
+from .compiled_forest import CompiledIsolationForest
+
+
+class TrainedModel:
+    """
+    Immutable snapshot of a fitted scaler and anomaly detector.
+    Scoring goes through the compiled array-based forest.
+    """
+
+    __slots__ = ("scaler", "detector", "compiled", "n_samples", "train_duration", "finished_at")
+
+    def __init__(self, scaler, detector, n_samples, train_duration, finished_at, compiled=None):
+        """
+        Initialize the model snapshot.
+
+        Args:
+            scaler: Fitted scaler (StandardScaler or RunningScaler snapshot),
+                None for a model loaded from disk
+            detector: Fitted IsolationForest, None for a model loaded from disk
+            n_samples (int): Number of samples the model was trained on
+            train_duration (float): Fit time in seconds
+            finished_at (float): time.monotonic() when the fit finished
+            compiled (CompiledIsolationForest, optional): Compiled scorer,
+                built from scaler and detector when not given
+        """
+        self.scaler = scaler
+        self.detector = detector
+        self.compiled = compiled or CompiledIsolationForest.from_model(scaler, detector)
+        self.n_samples = n_samples
+        self.train_duration = train_duration
+        self.finished_at = finished_at
+
+    @property
+    def n_features(self):
+        """
+        Number of input features the model expects.
+        """
+        return self.compiled.n_features
+
+    def score_one(self, x):
+        """
+        Anomaly score of one raw (unscaled) sample, lower is more abnormal.
+
+        Args:
+            x (np.ndarray): Sample, shape (n_features,)
+
+        Returns:
+            float: Anomaly score
+        """
+        return self.compiled.score_one(x)
+
+    def score_samples(self, X):
+        """
+        Anomaly scores of raw (unscaled) samples, lower is more abnormal.
+
+        Args:
+            X (np.ndarray): Samples, shape (n, n_features)
+
+        Returns:
+            np.ndarray: Anomaly scores, shape (n,)
+        """
+        return self.compiled.score_samples(X)
+
+
+def fit_anomaly_model(feature_matrix, scaler=None, contamination=0.1, random_state=42):
+    """
+    Fit a scaler and IsolationForest on a feature matrix and compile them.
+
+    Module-level so it can run in a worker process.
+
+    Args:
+        feature_matrix (np.ndarray): Training data, shape (n, n_features)
+        scaler (optional): Already fitted scaler to reuse; a new
+            StandardScaler is fitted when None
+        contamination (float): IsolationForest contamination
+        random_state (int): IsolationForest random seed
+
+    Returns:
+        TrainedModel: The fitted model
+    """
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+
+    start = time.perf_counter()
+
+    if scaler is None:
+        scaler = StandardScaler()
+        normalized_features = scaler.fit_transform(feature_matrix)
+    else:
+        normalized_features = scaler.transform(feature_matrix)
+
+    detector = IsolationForest(contamination=contamination, random_state=random_state)
+    detector.fit(normalized_features)
+    compiled = CompiledIsolationForest.from_model(scaler, detector)
+
+    return TrainedModel(
+        scaler, detector, len(feature_matrix),
+        time.perf_counter() - start, time.monotonic(), compiled
+    )
+
+
+class ModelTrainingWorker:
+    """
+    Runs model fits in the background and reports finished models.
+    At most one fit is in flight; requests made meanwhile are skipped.
+    """
+
+    def __init__(self, on_model_ready, use_processes=False):
+        """
+        Initialize the training worker.
+
+        Args:
+            on_model_ready (callable): Called with each TrainedModel; must
+                return quickly (it performs the swap)
+            use_processes (bool): Fit in a worker process instead of a
+                thread, so the fit does not compete for the GIL
+        """
+        self.on_model_ready = on_model_ready
+        self.use_processes = use_processes
+        self._executor = None
+        self._future = None
+        self._idle = threading.Event()
+        self._idle.set()
+
+        # Metrics
+        self.trainings_completed = 0
+        self.trainings_failed = 0
+        self.trainings_skipped = 0
+        self.last_train_duration = None
+        self.max_train_duration = 0.0
+        self.total_train_duration = 0.0
+        self.last_swap_latency = None
+        self.last_swap_duration = None
+        self.last_error = None
+
+    @property
+    def busy(self):
+        """
+        Whether a fit is currently in flight.
+        """
+        return not self._idle.is_set()
+
+    def submit(self, feature_matrix, scaler=None):
+        """
+        Start a background fit unless one is already running.
+
+        Args:
+            feature_matrix (np.ndarray): Training data (copied before submit)
+            scaler (optional): Fitted scaler snapshot to train with
+
+        Returns:
+            bool: True if the fit was started, False if skipped
+        """
+        if self.busy:
+            self.trainings_skipped += 1
+            return False
+
+        if self._executor is None:
+            # Imported on first use: the process pool pulls in multiprocessing
+            if self.use_processes:
+                from concurrent.futures import ProcessPoolExecutor as executor_class
+            else:
+                from concurrent.futures import ThreadPoolExecutor as executor_class
+            self._executor = executor_class(max_workers=1)
+
+        self._idle.clear()
+        self._future = self._executor.submit(
+            fit_anomaly_model, np.array(feature_matrix, dtype=np.float64), scaler
+        )
+        self._future.add_done_callback(self._finish)
+        return True
+
+    def _finish(self, future):
+        """
+        Record metrics and hand a finished model to the callback.
+        """
+        try:
+            model = future.result()
+
+            swap_start = time.perf_counter()
+            self.on_model_ready(model)
+            self.last_swap_duration = time.perf_counter() - swap_start
+            self.last_swap_latency = time.monotonic() - model.finished_at
+
+            self.trainings_completed += 1
+            self.last_train_duration = model.train_duration
+            self.max_train_duration = max(self.max_train_duration, model.train_duration)
+            self.total_train_duration += model.train_duration
+        except Exception as error:
+            self.trainings_failed += 1
+            self.last_error = error
+        finally:
+            self._idle.set()
+
+    def wait(self, timeout=None):
+        """
+        Block until the fit in flight (if any) has been swapped in.
+
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds
+
+        Returns:
+            bool: True if the worker is idle
+        """
+        return self._idle.wait(timeout)
+
+    def get_metrics(self):
+        """
+        Get training and swap metrics.
+
+        Returns:
+            dict: Counters and durations in seconds
+        """
+        completed = self.trainings_completed
+        return {
+            'trainings_completed': completed,
+            'trainings_failed': self.trainings_failed,
+            'trainings_skipped': self.trainings_skipped,
+            'busy': self.busy,
+            'last_train_duration': self.last_train_duration,
+            'mean_train_duration': self.total_train_duration / completed if completed else None,
+            'max_train_duration': self.max_train_duration,
+            'last_swap_latency': self.last_swap_latency,
+            'last_swap_duration': self.last_swap_duration,
+        }
+
+    def shutdown(self, wait=True):
+        """
+        Stop the background executor.
+
+        Args:
+            wait (bool): Wait for the fit in flight to finish
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -10,5 +10,11 @@ Version: 1.0.0
 """
 
 ## 版本日志
-- v1.0.0 2025-12-28: 初始版本 - 成功
-- v1.1.0 2025-12-28: 添加数据处理模块 - 待测试
\ No newline at end of file
+# - v1.0.0 2025-12-28: 初始版本 - 成功
+# - v1.1.0 2025-12-28: 添加数据处理模块 - 待测试
+# - v1.2.0 2026-10-17: 添加滑动窗口增量统计模块(running_stats) - 成功
+# - v1.2.1 2026-10-17: 添加预分配NumPy环形缓冲区模块(ring_buffer) - 成功
+# - v1.2.2 2026-10-17: 添加特征向量列定义模块(features)及批量特征提取 - 成功
+# - v1.2.3 2026-10-17: 添加IMU数据源模块(imu_source)，支持板载传感器与模拟数据 - 成功
+# - v1.2.4 2026-10-17: 添加无锁单生产者/单消费者环形缓冲区模块(spsc_buffer) - 成功
+# - v1.2.5 2026-10-17: 添加姿态估计模块(attitude)，互补滤波与EKF，支持标量与批量更新 - 成功
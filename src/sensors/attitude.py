@@ -0,0 +1,489 @@
+"""
+Troll-vs-Troll Project
+Attitude Estimation Module
+
+This module estimates pitch and roll by fusing the accelerometer and the
+gyroscope. The accelerometer alone (atan2 of one sample) reads the
+lateral acceleration of a turn as tilt and passes its noise straight
+through; the gyro integrates the true body rotation but drifts. Two
+filters combine them:
+
+- ComplementaryFilter integrates the gyro and pulls the estimate towards
+  the accelerometer angles with a fixed time constant;
+- AttitudeEKF is a two-state (roll, pitch) extended Kalman filter with
+  the Euler angle kinematics as process model and the accelerometer
+  angles as measurement.
+
+Both trust the accelerometer less when its magnitude is away from 1 g or
+the carrier is yawing (turning), where the accelerometer tilt is mostly
+lateral acceleration. The per-sample update works on plain floats with a
+fixed number of operations and allocates no arrays. Created with
+num_vehicles, a filter keeps one state per carrier and update_batch()
+advances all of them with array operations (for FleetController).
+
+Angles follow the rest of the code: roll = atan2(ay, az) and
+pitch = atan2(ax, sqrt(ay^2 + az^2)), in degrees at the interface.
+
+Version: 1.0.1
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：互补滤波与EKF姿态估计，标量与批量更新 - 成功
+# - v1.0.1 2026-10-17: 自检迁移至tests/test_attitude.py - 成功
+
+import math
+
+import numpy as np
+
+
+GRAVITY = 9.81
+TWO_PI = 2.0 * math.pi
+
+
+def accel_tilt(ax, ay, az):
+    """
+    Pitch and roll from a single accelerometer sample.
+
+    Args:
+        ax (float): Acceleration along x in m/s^2
+        ay (float): Acceleration along y in m/s^2
+        az (float): Acceleration along z in m/s^2
+
+    Returns:
+        tuple: (pitch, roll) in radians
+    """
+    return math.atan2(ax, math.sqrt(ay * ay + az * az)), math.atan2(ay, az)
+
+
+def accel_tilt_batch(accel):
+    """
+    Vectorized form of accel_tilt().
+
+    Args:
+        accel (np.ndarray): Acceleration values, shape (N, 3)
+
+    Returns:
+        tuple: (pitch, roll) arrays in radians
+    """
+    ax, ay, az = accel.T
+    return np.arctan2(ax, np.sqrt(ay * ay + az * az)), np.arctan2(ay, az)
+
+
+class _AttitudeFilter:
+    """
+    State and time keeping shared by the attitude filters.
+    """
+
+    def __init__(self, num_vehicles=None, sample_period=0.01, accel_gate=0.1, yaw_gate=0.2):
+        """
+        Initialize the filter state.
+
+        Args:
+            num_vehicles (int, optional): Carriers filtered together with
+                update_batch(); None keeps a single scalar state for update()
+            sample_period (float): Time step in seconds used when timestamps
+                are missing or not increasing
+            accel_gate (float): Deviation of |a| from 1 g (as a fraction of
+                g) at which the accelerometer weight is halved
+            yaw_gate (float): Yaw rate in rad/s at which the accelerometer
+                weight is halved
+        """
+        self.num_vehicles = num_vehicles
+        self.sample_period = sample_period
+        self.accel_gate = accel_gate
+        self.yaw_gate = yaw_gate
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the estimate; the next sample initializes it from the accelerometer.
+        """
+        n = self.num_vehicles
+        if n is None:
+            self._roll = 0.0
+            self._pitch = 0.0
+            self._last_timestamp = math.nan
+            self.initialized = False
+        else:
+            self._roll = np.zeros(n)
+            self._pitch = np.zeros(n)
+            self._last_timestamp = np.full(n, np.nan)
+            self.initialized = np.zeros(n, dtype=bool)
+
+    @property
+    def pitch(self):
+        """
+        Estimated pitch in degrees.
+        """
+        return self._pitch * (180 / math.pi)
+
+    @property
+    def roll(self):
+        """
+        Estimated roll in degrees.
+        """
+        return self._roll * (180 / math.pi)
+
+    def orientation(self):
+        """
+        Current estimate.
+
+        Returns:
+            tuple: (pitch, roll) in degrees
+        """
+        return self.pitch, self.roll
+
+    def _time_step(self, timestamp):
+        """
+        Time since the previous sample, falling back to sample_period.
+        """
+        dt = timestamp - self._last_timestamp
+        if not dt > 0.0:  # also NaN timestamps
+            dt = self.sample_period
+        if timestamp == timestamp:
+            self._last_timestamp = timestamp
+        return dt
+
+    def _time_step_batch(self, timestamps):
+        """
+        Vectorized form of _time_step().
+        """
+        timestamps = np.broadcast_to(np.asarray(timestamps, dtype=np.float64), self._last_timestamp.shape)
+        with np.errstate(invalid='ignore'):
+            dt = timestamps - self._last_timestamp
+            dt[~(dt > 0.0)] = self.sample_period
+        np.copyto(self._last_timestamp, timestamps, where=~np.isnan(timestamps))
+        return dt
+
+    def _accel_weight(self, magnitude, yaw_rate):
+        """
+        Trust in the accelerometer angles between 0 and 1.
+        """
+        deviation = (magnitude - GRAVITY) / (GRAVITY * self.accel_gate)
+        turning = yaw_rate / self.yaw_gate
+        return 1.0 / (1.0 + deviation * deviation + turning * turning)
+
+    def _check_batch(self, accel, gyro):
+        """
+        Validate the arrays passed to update_batch().
+        """
+        if self.num_vehicles is None:
+            raise ValueError("update_batch() needs a filter created with num_vehicles")
+        accel = np.asarray(accel, dtype=np.float64)
+        gyro = np.asarray(gyro, dtype=np.float64)
+        if accel.shape != (self.num_vehicles, 3) or gyro.shape != accel.shape:
+            raise ValueError(f"Sensor data must be arrays of shape ({self.num_vehicles}, 3)")
+        return accel, gyro
+
+
+class ComplementaryFilter(_AttitudeFilter):
+    """
+    Gyro integration corrected towards the accelerometer angles.
+    """
+
+    def __init__(self, num_vehicles=None, time_constant=0.5, sample_period=0.01,
+                 accel_gate=0.1, yaw_gate=0.2):
+        """
+        Initialize the complementary filter.
+
+        Args:
+            num_vehicles (int, optional): Carriers filtered together (see _AttitudeFilter)
+            time_constant (float): Time in seconds over which the estimate
+                follows the accelerometer; shorter tracks faster, longer
+                rejects more lateral acceleration and noise
+            sample_period (float): Fallback time step in seconds
+            accel_gate (float): See _AttitudeFilter
+            yaw_gate (float): See _AttitudeFilter
+        """
+        self.time_constant = time_constant
+        super().__init__(num_vehicles, sample_period, accel_gate, yaw_gate)
+
+    def update(self, accel, gyro, timestamp=math.nan):
+        """
+        Fuse one sample.
+
+        Args:
+            accel (tuple): (x, y, z) acceleration in m/s^2
+            gyro (tuple): (x, y, z) angular rate in rad/s
+            timestamp (float, optional): Sample timestamp in seconds
+
+        Returns:
+            tuple: (pitch, roll) in degrees
+        """
+        ax, ay, az = accel
+        gx, gy, gz = gyro
+        dt = self._time_step(timestamp)
+        accel_pitch, accel_roll = accel_tilt(ax, ay, az)
+        if not self.initialized:
+            self._pitch, self._roll = accel_pitch, accel_roll
+            self.initialized = True
+            return self.orientation()
+
+        # Propagate with the Euler angle rates
+        roll, pitch = self._roll, self._pitch
+        sin_roll, cos_roll = math.sin(roll), math.cos(roll)
+        roll += dt * (gx - (gy * sin_roll + gz * cos_roll) * math.tan(pitch))
+        pitch += dt * (gz * sin_roll - gy * cos_roll)
+
+        # Pull towards the accelerometer angles
+        magnitude = math.sqrt(ax * ax + ay * ay + az * az)
+        gain = self._accel_weight(magnitude, gz) * dt / (self.time_constant + dt)
+        roll += gain * ((accel_roll - roll + math.pi) % TWO_PI - math.pi)
+        pitch += gain * (accel_pitch - pitch)
+
+        self._roll, self._pitch = roll, pitch
+        return self.orientation()
+
+    def update_batch(self, accel, gyro, timestamps=np.nan):
+        """
+        Fuse one sample per carrier.
+
+        Args:
+            accel (np.ndarray): Acceleration values, shape (N, 3)
+            gyro (np.ndarray): Angular rates in rad/s, shape (N, 3)
+            timestamps (np.ndarray, optional): Timestamps, shape (N,) or scalar
+
+        Returns:
+            tuple: (pitch, roll) arrays in degrees
+        """
+        accel, gyro = self._check_batch(accel, gyro)
+        gx, gy, gz = gyro.T
+        dt = self._time_step_batch(timestamps)
+        accel_pitch, accel_roll = accel_tilt_batch(accel)
+
+        roll, pitch = self._roll, self._pitch
+        sin_roll, cos_roll = np.sin(roll), np.cos(roll)
+        roll += dt * (gx - (gy * sin_roll + gz * cos_roll) * np.tan(pitch))
+        pitch += dt * (gz * sin_roll - gy * cos_roll)
+
+        magnitude = np.sqrt((accel * accel).sum(axis=1))
+        gain = self._accel_weight(magnitude, gz) * dt / (self.time_constant + dt)
+        roll += gain * ((accel_roll - roll + np.pi) % TWO_PI - np.pi)
+        pitch += gain * (accel_pitch - pitch)
+
+        # Carriers seen for the first time start from the accelerometer
+        new = ~self.initialized
+        roll[new] = accel_roll[new]
+        pitch[new] = accel_pitch[new]
+        self.initialized[:] = True
+        return self.orientation()
+
+
+class AttitudeEKF(_AttitudeFilter):
+    """
+    Two-state (roll, pitch) extended Kalman filter.
+    """
+
+    def __init__(self, num_vehicles=None, gyro_noise=0.01, accel_noise=0.05, sample_period=0.01,
+                 accel_gate=0.1, yaw_gate=0.2):
+        """
+        Initialize the filter.
+
+        Args:
+            num_vehicles (int, optional): Carriers filtered together (see _AttitudeFilter)
+            gyro_noise (float): Gyro rate noise in rad/s (process noise)
+            accel_noise (float): Accelerometer angle noise in rad at 1 g
+                without turning (measurement noise)
+            sample_period (float): Fallback time step in seconds
+            accel_gate (float): See _AttitudeFilter
+            yaw_gate (float): See _AttitudeFilter
+        """
+        self.gyro_noise = gyro_noise
+        self.accel_noise = accel_noise
+        super().__init__(num_vehicles, sample_period, accel_gate, yaw_gate)
+
+    def reset(self):
+        """
+        Forget the estimate and its covariance.
+        """
+        super().reset()
+        variance = self.accel_noise ** 2
+        if self.num_vehicles is None:
+            self._p11, self._p12, self._p22 = variance, 0.0, variance
+        else:
+            self._p11 = np.full(self.num_vehicles, variance)
+            self._p12 = np.zeros(self.num_vehicles)
+            self._p22 = np.full(self.num_vehicles, variance)
+
+    @property
+    def variance(self):
+        """
+        Estimate variances (roll, pitch) in deg^2.
+        """
+        scale = (180 / math.pi) ** 2
+        return self._p11 * scale, self._p22 * scale
+
+    def update(self, accel, gyro, timestamp=math.nan):
+        """
+        Fuse one sample.
+
+        Args:
+            accel (tuple): (x, y, z) acceleration in m/s^2
+            gyro (tuple): (x, y, z) angular rate in rad/s
+            timestamp (float, optional): Sample timestamp in seconds
+
+        Returns:
+            tuple: (pitch, roll) in degrees
+        """
+        ax, ay, az = accel
+        gx, gy, gz = gyro
+        dt = self._time_step(timestamp)
+        accel_pitch, accel_roll = accel_tilt(ax, ay, az)
+        if not self.initialized:
+            self._pitch, self._roll = accel_pitch, accel_roll
+            self.initialized = True
+            return self.orientation()
+
+        # Predict: Euler angle kinematics and their Jacobian F = I + dt * J
+        roll, pitch = self._roll, self._pitch
+        p11, p12, p22 = self._p11, self._p12, self._p22
+        sin_roll, cos_roll = math.sin(roll), math.cos(roll)
+        tan_pitch, cos_pitch = math.tan(pitch), math.cos(pitch)
+        across = gy * sin_roll + gz * cos_roll
+        along = gy * cos_roll - gz * sin_roll
+        roll += dt * (gx - across * tan_pitch)
+        pitch -= dt * along
+        f11 = 1.0 - dt * along * tan_pitch
+        f12 = -dt * across / (cos_pitch * cos_pitch)
+        f21 = dt * across
+        q = (self.gyro_noise * dt) ** 2
+        m11 = f11 * p11 + f12 * p12
+        m12 = f11 * p12 + f12 * p22
+        m21 = f21 * p11 + p12
+        m22 = f21 * p12 + p22
+        p11 = m11 * f11 + m12 * f12 + q
+        p12 = m11 * f21 + m12
+        p22 = m21 * f21 + m22 + q
+
+        # Update with the accelerometer angles, noisier away from 1 g and in turns
+        magnitude = math.sqrt(ax * ax + ay * ay + az * az)
+        r = self.accel_noise ** 2 / self._accel_weight(magnitude, gz)
+        s11, s22 = p11 + r, p22 + r
+        det = s11 * s22 - p12 * p12
+        k11 = (p11 * s22 - p12 * p12) / det
+        k12 = (p12 * s11 - p11 * p12) / det
+        k21 = (p12 * s22 - p22 * p12) / det
+        k22 = (p22 * s11 - p12 * p12) / det
+        roll_error = (accel_roll - roll + math.pi) % TWO_PI - math.pi
+        pitch_error = accel_pitch - pitch
+        self._roll = roll + k11 * roll_error + k12 * pitch_error
+        self._pitch = pitch + k21 * roll_error + k22 * pitch_error
+        self._p11 = (1.0 - k11) * p11 - k12 * p12
+        self._p12 = (1.0 - k11) * p12 - k12 * p22
+        self._p22 = (1.0 - k22) * p22 - k21 * p12
+        return self.orientation()
+
+    def update_batch(self, accel, gyro, timestamps=np.nan):
+        """
+        Fuse one sample per carrier.
+
+        Args:
+            accel (np.ndarray): Acceleration values, shape (N, 3)
+            gyro (np.ndarray): Angular rates in rad/s, shape (N, 3)
+            timestamps (np.ndarray, optional): Timestamps, shape (N,) or scalar
+
+        Returns:
+            tuple: (pitch, roll) arrays in degrees
+        """
+        accel, gyro = self._check_batch(accel, gyro)
+        gx, gy, gz = gyro.T
+        dt = self._time_step_batch(timestamps)
+        accel_pitch, accel_roll = accel_tilt_batch(accel)
+
+        roll, pitch = self._roll, self._pitch
+        p11, p12, p22 = self._p11, self._p12, self._p22
+        sin_roll, cos_roll = np.sin(roll), np.cos(roll)
+        tan_pitch, cos_pitch = np.tan(pitch), np.cos(pitch)
+        across = gy * sin_roll + gz * cos_roll
+        along = gy * cos_roll - gz * sin_roll
+        roll = roll + dt * (gx - across * tan_pitch)
+        pitch = pitch - dt * along
+        f11 = 1.0 - dt * along * tan_pitch
+        f12 = -dt * across / (cos_pitch * cos_pitch)
+        f21 = dt * across
+        q = (self.gyro_noise * dt) ** 2
+        m11 = f11 * p11 + f12 * p12
+        m12 = f11 * p12 + f12 * p22
+        m21 = f21 * p11 + p12
+        m22 = f21 * p12 + p22
+        p11 = m11 * f11 + m12 * f12 + q
+        p12 = m11 * f21 + m12
+        p22 = m21 * f21 + m22 + q
+
+        magnitude = np.sqrt((accel * accel).sum(axis=1))
+        r = self.accel_noise ** 2 / self._accel_weight(magnitude, gz)
+        s11, s22 = p11 + r, p22 + r
+        det = s11 * s22 - p12 * p12
+        k11 = (p11 * s22 - p12 * p12) / det
+        k12 = (p12 * s11 - p11 * p12) / det
+        k21 = (p12 * s22 - p22 * p12) / det
+        k22 = (p22 * s11 - p12 * p12) / det
+        roll_error = (accel_roll - roll + np.pi) % TWO_PI - np.pi
+        pitch_error = accel_pitch - pitch
+        roll += k11 * roll_error + k12 * pitch_error
+        pitch += k21 * roll_error + k22 * pitch_error
+
+        # Carriers seen for the first time start from the accelerometer
+        new = ~self.initialized
+        self._roll[:] = np.where(new, accel_roll, roll)
+        self._pitch[:] = np.where(new, accel_pitch, pitch)
+        self._p11[:] = np.where(new, self.accel_noise ** 2, (1.0 - k11) * p11 - k12 * p12)
+        self._p12[:] = np.where(new, 0.0, (1.0 - k11) * p12 - k12 * p22)
+        self._p22[:] = np.where(new, self.accel_noise ** 2, (1.0 - k22) * p22 - k21 * p12)
+        self.initialized[:] = True
+        return self.orientation()
+
+
+def main():
+    """
+    Main function demonstrating the attitude filters (the checks live in
+    tests/test_attitude.py).
+    """
+    import time
+    from ..utils.trajectory_simulator import TrajectorySimulator
+
+    print("Attitude Estimation demo...")
+
+    runs, duration = 20, 60.0
+    data = TrajectorySimulator(num_vehicles=runs, seed=2).run(duration)
+    upright = ~data['tipped']
+    truth = data['roll']
+    accel_roll = np.degrees(np.arctan2(data['accel'][..., 1], data['accel'][..., 2]))
+
+    def rms(estimate):
+        return float(np.sqrt(np.mean((estimate - truth)[upright] ** 2)))
+
+    print(f"  roll error vs simulated body roll, {runs} carriers x {duration:.0f} s:")
+    print(f"    accelerometer only:   {rms(accel_roll):5.2f} deg RMS")
+    for name, factory in (("complementary filter", ComplementaryFilter), ("EKF", AttitudeEKF)):
+        # Vectorized filter over all carriers
+        fleet = factory(num_vehicles=runs)
+        roll = np.empty_like(truth)
+        for i, t in enumerate(data['timestamp']):
+            roll[i] = fleet.update_batch(data['accel'][i], data['gyro'][i], t)[1]
+        print(f"    {name:20s}  {rms(roll):5.2f} deg RMS")
+
+        # Per-sample cost of the scalar update and the vectorized update
+        single = factory()
+        samples = [(tuple(a), tuple(g), t) for a, g, t in
+                   zip(data['accel'][:2000, 0].tolist(), data['gyro'][:2000, 0].tolist(),
+                       data['timestamp'][:2000].tolist())]
+        start = time.perf_counter()
+        for accel, gyro, t in samples:
+            single.update(accel, gyro, t)
+        scalar_time = (time.perf_counter() - start) / len(samples)
+        big = factory(num_vehicles=10000)
+        accel = np.tile(data['accel'][0, :1], (10000, 1))
+        gyro = np.tile(data['gyro'][0, :1], (10000, 1))
+        start = time.perf_counter()
+        for step in range(20):
+            big.update_batch(accel, gyro, step * 0.01)
+        batch_time = (time.perf_counter() - start) / 20 / 10000
+        print(f"      update: {scalar_time * 1e6:.1f} us per sample, "
+              f"update_batch: {batch_time * 1e9:.0f} ns per carrier (N=10000)")
+
+    print("Attitude estimation demo completed.")
+
+
+if __name__ == "__main__":
+    main()
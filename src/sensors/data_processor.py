@@ -6,13 +6,33 @@ This module processes raw sensor data from accelerometers, gyroscopes,
 and other sensors to extract meaningful features for the machine learning
 model to predict rollover risk.
 
-Version: 1.0.0
+Version: 1.8.4
 """
 
+## 版本日志
+# - v1.0.0 2025-12-28: 初始版本 - 待测试
+# - v1.1.0 2026-10-17: 窗口均值/标准差改用SlidingWindowStats增量统计 - 成功
+# - v1.2.0 2026-10-17: 传感器缓冲区改用预分配NumPy环形缓冲区 - 成功
+# - v1.3.0 2026-10-17: 新增extract_features_batch()批量特征提取 - 成功
+# - v1.4.0 2026-10-17: 新增get_feature_vector()原地填充扁平特征向量 - 成功
+# - v1.5.0 2026-10-17: 新增add_sensor_batch()批量写入 - 成功
+# - v1.6.0 2026-10-17: 支持注入时钟 - 成功
+# - v1.7.0 2026-10-17: 新增get_gyro_trend()陀螺仪角速度趋势 - 成功
+# - v1.8.0 2026-10-17: 可选attitude姿态滤波器替代单样本加速度计倾角 - 成功
+# - v1.8.1 2026-10-17: extract_features_batch()在设置姿态滤波器时同样使用滤波后的倾角 - 成功
+# - v1.8.2 2026-10-17: 批量写入自检迁移至tests/test_data_processor.py - 成功
+# - v1.8.3 2026-10-17: 陀螺仪趋势自检迁移至tests/test_data_processor.py - 成功
+# - v1.8.4 2026-10-17: 姿态滤波器自检迁移至tests/test_data_processor.py - 成功
+
+import copy
+import math
 import time
 import numpy as np
-from collections import deque
-from statistics import mean
+from numpy.lib.stride_tricks import sliding_window_view
+
+from . import features as F
+from .ring_buffer import RingBuffer
+from .running_stats import SlidingWindowStats
 
 
 class SensorDataProcessor:
@@ -21,106 +41,248 @@ class SensorDataProcessor:
     Implements filtering, feature extraction, and anomaly detection.
     """
     
-    def __init__(self, window_size=10):
+    def __init__(self, window_size=10, clock=time.time, attitude=None):
         """
         Initialize the sensor data processor.
         
         Args:
             window_size (int): Size of the sliding window for data processing
+            clock (callable): Time source for the feature dictionary timestamp
+            attitude (ComplementaryFilter or AttitudeEKF, optional): Scalar
+                attitude filter updated with every gyro sample; its pitch and
+                roll replace the single-sample accelerometer angles
         """
         # TODO: Implement sensor data processing pipeline - HIGH - Developer
         # TODO: Add filtering for sensor noise reduction - MEDIUM - Developer
         # TODO: Extract features for ML model input - HIGH - Developer
         
         self.window_size = window_size
-        self.accel_data_buffer = deque(maxlen=window_size)
-        self.gyro_data_buffer = deque(maxlen=window_size)
+        self.clock = clock
+        self.attitude = attitude
+        self.accel_data_buffer = RingBuffer(window_size, width=3)
+        self.gyro_data_buffer = RingBuffer(window_size, width=3)
         
         # Statistical measures
-        self.mean_buffer = deque(maxlen=window_size)
-        self.std_buffer = deque(maxlen=window_size)
+        self.mean_buffer = RingBuffer(window_size, width=None, with_timestamps=False)
+        self.std_buffer = RingBuffer(window_size, width=None, with_timestamps=False)
+        
+        # Constant-time running statistics over the same window
+        self.axis_stats = tuple(SlidingWindowStats(window_size) for _ in range(3))
+        self.magnitude_stats = SlidingWindowStats(window_size)
+        
+        # Latest sample values and the preallocated flat feature vector
+        self._latest_accel = (0.0, 0.0, 0.0)
+        self._latest_gyro = (0.0, 0.0, 0.0)
+        self._latest_timestamp = np.nan
+        self._latest_magnitude = 0.0
+        self._previous_magnitude = 0.0
+        self.feature_vector = np.zeros(F.NUM_FEATURES)
         
         print("SensorDataProcessor initialized")
 
-    def add_accel_data(self, accel_data):
+    def add_accel_data(self, accel_data, timestamp=np.nan):
         """
         Add accelerometer data to the processing buffer.
         
         Args:
             accel_data (tuple): (x, y, z) acceleration values in m/s^2
+            timestamp (float, optional): Timestamp of the reading
         """
         if len(accel_data) != 3:
             raise ValueError("Acceleration data must be a tuple of 3 values (x, y, z)")
         
-        self.accel_data_buffer.append(accel_data)
+        ax, ay, az = accel_data
+        self.accel_data_buffer.append(accel_data, timestamp)
+        x_stats, y_stats, z_stats = self.axis_stats
+        x_stats.push(ax)
+        y_stats.push(ay)
+        z_stats.push(az)
         
         # Calculate derived values
-        magnitude = (accel_data[0]**2 + accel_data[1]**2 + accel_data[2]**2)**0.5
+        magnitude = (ax**2 + ay**2 + az**2)**0.5
         self.mean_buffer.append(magnitude)
+        self._latest_accel = (ax, ay, az)
+        self._latest_timestamp = timestamp
+        self._previous_magnitude = self._latest_magnitude
+        self._latest_magnitude = magnitude
+        self.magnitude_stats.push(magnitude)
         
         # Calculate standard deviation if we have enough data
-        if len(self.mean_buffer) > 1:
-            self.std_buffer.append(np.std(list(self.mean_buffer)))
+        if self.magnitude_stats.count > 1:
+            self.std_buffer.append(self.magnitude_stats.std)
 
-    def add_gyro_data(self, gyro_data):
+    def add_gyro_data(self, gyro_data, timestamp=np.nan):
         """
         Add gyroscope data to the processing buffer.
         
         Args:
             gyro_data (tuple): (x, y, z) gyroscope values in rad/s
+            timestamp (float, optional): Timestamp of the reading
         """
         if len(gyro_data) != 3:
             raise ValueError("Gyroscope data must be a tuple of 3 values (x, y, z)")
         
-        self.gyro_data_buffer.append(gyro_data)
+        self.gyro_data_buffer.append(gyro_data, timestamp)
+        self._latest_gyro = tuple(gyro_data)
+        if self.attitude is not None:
+            # Paired with the accelerometer sample added just before
+            self.attitude.update(self._latest_accel, self._latest_gyro, timestamp)
 
-    def get_processed_features(self):
+    def add_sensor_batch(self, accel, gyro=None, timestamps=None):
         """
-        Extract processed features from the sensor data buffers.
+        Add a block of samples in one operation.
+        
+        Leaves the processor in the same state as calling add_accel_data
+        (and add_gyro_data) for every row, but appends to the buffers with
+        RingBuffer.extend and rebuilds the window statistics from the
+        buffered window instead of updating them sample by sample.
+        
+        Args:
+            accel (np.ndarray): Acceleration values, shape (k, 3)
+            gyro (np.ndarray, optional): Gyroscope values, shape (k, 3)
+            timestamps (np.ndarray, optional): Timestamps, shape (k,)
+        """
+        accel = np.asarray(accel, dtype=np.float64)
+        if accel.ndim != 2 or accel.shape[1] != 3:
+            raise ValueError("Acceleration data must be an array of shape (N, 3)")
+        count = len(accel)
+        if count == 0:
+            return
+        if gyro is not None:
+            gyro = np.asarray(gyro, dtype=np.float64)
+            if gyro.shape != accel.shape:
+                raise ValueError("Gyroscope data must have the same shape as acceleration data")
+        
+        window = self.window_size
+        magnitude = np.sqrt((accel**2).sum(axis=1))
+        
+        # Magnitude std after each new sample that leaves >= 2 in the window
+        stds = []
+        if window > 1:
+            history = np.concatenate((self.mean_buffer.view(), magnitude))
+            first = 1 if len(self.mean_buffer) == 0 else 0
+            for end in range(max(len(history) - min(count, window), first), len(history)):
+                stds.append(history[max(0, end - window + 1):end + 1].std())
         
+        self.accel_data_buffer.extend(accel, timestamps)
+        self.mean_buffer.extend(magnitude)
+        self.std_buffer.extend(stds)
+        window_accel = self.accel_data_buffer.view()
+        for axis, stats in enumerate(self.axis_stats):
+            stats.extend(window_accel[-count:, axis])
+        self.magnitude_stats.extend(magnitude)
+        
+        if gyro is not None:
+            self.gyro_data_buffer.extend(gyro, timestamps)
+            self._latest_gyro = tuple(gyro[-1].tolist())
+            if self.attitude is not None:
+                times = [np.nan] * count if timestamps is None else np.asarray(timestamps, dtype=np.float64).tolist()
+                for row_accel, row_gyro, timestamp in zip(accel.tolist(), gyro.tolist(), times):
+                    self.attitude.update(row_accel, row_gyro, timestamp)
+        
+        self._previous_magnitude = float(magnitude[-2]) if count > 1 else self._latest_magnitude
+        self._latest_magnitude = float(magnitude[-1])
+        self._latest_accel = tuple(accel[-1].tolist())
+        self._latest_timestamp = np.nan if timestamps is None else float(timestamps[-1])
+
+    def get_feature_vector(self, out=None):
+        """
+        Fill a flat feature vector with the features of the latest sample.
+        
+        The vector follows the column layout in features.py and is filled
+        in place, so the control path computes each feature once and
+        allocates nothing per sample. The returned array is reused by the
+        next call; copy it if it must be kept.
+        
+        Args:
+            out (np.ndarray, optional): Vector to fill (default: the
+                processor's own preallocated feature_vector)
+            
         Returns:
-            dict: Processed features for ML model
+            np.ndarray: Feature vector, or None if no data is buffered
         """
         if len(self.accel_data_buffer) == 0:
             return None
-            
-        # Get the latest data point
-        latest_accel = self.accel_data_buffer[-1]
-        latest_gyro = self.gyro_data_buffer[-1] if len(self.gyro_data_buffer) > 0 else (0, 0, 0)
-        
-        # Calculate features
-        ax, ay, az = latest_accel
-        gx, gy, gz = latest_gyro
         
-        # Acceleration magnitude
-        accel_magnitude = (ax**2 + ay**2 + az**2)**0.5
+        vector = self.feature_vector if out is None else out
+        ax, ay, az = self._latest_accel
+        gx, gy, gz = self._latest_gyro
+        magnitude = self._latest_magnitude
         
-        # Tilt angles (pitch and roll)
-        pitch = np.arctan2(ax, np.sqrt(ay**2 + az**2)) * 180 / np.pi
-        roll = np.arctan2(ay, az) * 180 / np.pi
+        vector[F.TIMESTAMP] = self._latest_timestamp
+        vector[F.ACCEL_X] = ax
+        vector[F.ACCEL_Y] = ay
+        vector[F.ACCEL_Z] = az
+        vector[F.ACCEL_MAGNITUDE] = magnitude
+        vector[F.GYRO_X] = gx
+        vector[F.GYRO_Y] = gy
+        vector[F.GYRO_Z] = gz
         
-        # Calculate derivatives (rate of change)
-        if len(self.accel_data_buffer) > 1:
-            prev_ax, prev_ay, prev_az = self.accel_data_buffer[-2]
-            accel_change_rate = abs(accel_magnitude - (prev_ax**2 + prev_ay**2 + prev_az**2)**0.5)
+        # Tilt angles (pitch and roll), fused with the gyro when filtered
+        if self.attitude is not None and self.attitude.initialized:
+            vector[F.PITCH], vector[F.ROLL] = self.attitude.orientation()
         else:
-            accel_change_rate = 0
-            
-        # Calculate statistical features from the window
+            vector[F.PITCH] = math.atan2(ax, math.sqrt(ay**2 + az**2)) * 180 / math.pi
+            vector[F.ROLL] = math.atan2(ay, az) * 180 / math.pi
+        
+        # Rate of change and window statistics need at least 2 samples
         if len(self.accel_data_buffer) > 1:
-            ax_values = [data[0] for data in self.accel_data_buffer]
-            ay_values = [data[1] for data in self.accel_data_buffer]
-            az_values = [data[2] for data in self.accel_data_buffer]
-            
-            ax_mean = mean(ax_values)
-            ay_mean = mean(ay_values)
-            az_mean = mean(az_values)
-            
-            ax_std = np.std(ax_values)
-            ay_std = np.std(ay_values)
-            az_std = np.std(az_values)
+            x_stats, y_stats, z_stats = self.axis_stats
+            vector[F.ACCEL_CHANGE_RATE] = abs(magnitude - self._previous_magnitude)
+            vector[F.ACCEL_MEAN_X] = x_stats.mean
+            vector[F.ACCEL_MEAN_Y] = y_stats.mean
+            vector[F.ACCEL_MEAN_Z] = z_stats.mean
+            vector[F.ACCEL_STD_X] = x_stats.std
+            vector[F.ACCEL_STD_Y] = y_stats.std
+            vector[F.ACCEL_STD_Z] = z_stats.std
         else:
-            ax_mean = ax_std = ay_mean = ay_std = az_mean = az_std = 0
+            vector[F.ACCEL_CHANGE_RATE:F.ACCEL_STD_Z + 1] = 0.0
+        
+        return vector
+
+    def get_gyro_trend(self):
+        """
+        Least-squares slope of the gyro rates over the buffered window.
+
+        The window is short, so plain float arithmetic is cheaper here than
+        a handful of small NumPy calls.
+
+        Returns:
+            tuple: (x, y, z) angular acceleration in rad/s^2; zeros with
+                fewer than 3 samples or without usable timestamps
+        """
+        if len(self.gyro_data_buffer) < 3:
+            return (0.0, 0.0, 0.0)
+
+        timestamps = self.gyro_data_buffer.timestamps().tolist()
+        mean = sum(timestamps) / len(timestamps)
+        spread = 0.0
+        sx = sy = sz = 0.0
+        # Centered times sum to zero, so the gyro mean drops out
+        for t, (gx, gy, gz) in zip(timestamps, self.gyro_data_buffer.view().tolist()):
+            t -= mean
+            spread += t * t
+            sx += t * gx
+            sy += t * gy
+            sz += t * gz
+        if not spread > 0.0:  # also rejects NaN timestamps
+            return (0.0, 0.0, 0.0)
+        return (sx / spread, sy / spread, sz / spread)
+
+    def get_processed_features(self):
+        """
+        Extract processed features from the sensor data buffers.
+        
+        Returns:
+            dict: Processed features for ML model
+        """
+        vector = self.get_feature_vector()
+        if vector is None:
+            return None
+        
+        (_, ax, ay, az, accel_magnitude, accel_change_rate,
+         ax_mean, ay_mean, az_mean, ax_std, ay_std, az_std,
+         gx, gy, gz, pitch, roll) = vector.tolist()
             
         # Pack features into a dictionary
         features = {
@@ -142,11 +304,123 @@ class SensorDataProcessor:
                 'pitch': pitch,
                 'roll': roll
             },
-            'timestamp': time.time()
+            'timestamp': self.clock()
         }
         
         return features
 
+    def extract_features_batch(self, accel, gyro=None, timestamps=None, chunk_size=65536):
+        """
+        Extract features for a whole recording in one vectorized pass.
+        
+        Each row holds the same values get_processed_features() would
+        return after feeding samples 0..i into a fresh processor with the
+        same window size. The columns follow the schema in features.py.
+        
+        With an attitude filter and gyro data, pitch and roll come from a
+        fresh copy of the filter run over the rows in order, as in the
+        streaming path; the processor's own filter is left untouched.
+        That column pair is computed sample by sample, the rest stays
+        vectorized.
+        
+        Args:
+            accel (np.ndarray): Acceleration values, shape (N, 3)
+            gyro (np.ndarray, optional): Gyroscope values, shape (N, 3)
+            timestamps (np.ndarray, optional): Timestamps, shape (N,)
+            chunk_size (int): Rows per block for the rolling statistics,
+                bounds the temporary memory on long recordings
+            
+        Returns:
+            np.ndarray: Feature matrix, shape (N, NUM_FEATURES)
+        """
+        accel = np.asarray(accel, dtype=np.float64)
+        if accel.ndim != 2 or accel.shape[1] != 3:
+            raise ValueError("Acceleration data must be an array of shape (N, 3)")
+        
+        num_samples = len(accel)
+        features = np.empty((num_samples, F.NUM_FEATURES))
+        
+        if timestamps is None:
+            features[:, F.TIMESTAMP] = np.nan
+        else:
+            features[:, F.TIMESTAMP] = timestamps
+        
+        if gyro is None:
+            features[:, F.GYRO_X:F.GYRO_Z + 1] = 0.0
+        else:
+            gyro = np.asarray(gyro, dtype=np.float64)
+            if gyro.shape != accel.shape:
+                raise ValueError("Gyroscope data must have the same shape as acceleration data")
+            features[:, F.GYRO_X:F.GYRO_Z + 1] = gyro
+        
+        ax, ay, az = accel.T
+        features[:, F.ACCEL_X:F.ACCEL_Z + 1] = accel
+        
+        # Acceleration magnitude and its rate of change (needs a window of 2)
+        magnitude = (ax**2 + ay**2 + az**2)**0.5
+        features[:, F.ACCEL_MAGNITUDE] = magnitude
+        if self.window_size > 1:
+            features[:1, F.ACCEL_CHANGE_RATE] = 0.0
+            np.abs(np.diff(magnitude), out=features[1:, F.ACCEL_CHANGE_RATE])
+        else:
+            features[:, F.ACCEL_CHANGE_RATE] = 0.0
+        
+        # Tilt angles (pitch and roll), fused with the gyro when filtered
+        if self.attitude is not None and gyro is not None:
+            self._filtered_tilt_batch(accel, gyro, timestamps, features)
+        else:
+            features[:, F.PITCH] = np.arctan2(ax, np.sqrt(ay**2 + az**2)) * 180 / np.pi
+            features[:, F.ROLL] = np.arctan2(ay, az) * 180 / np.pi
+        
+        self._rolling_statistics(accel, features, chunk_size)
+        
+        return features
+
+    def _filtered_tilt_batch(self, accel, gyro, timestamps, features):
+        """
+        Fill the pitch/roll columns by running a fresh copy of the attitude filter.
+        """
+        attitude = copy.deepcopy(self.attitude)
+        attitude.reset()
+        times = [np.nan] * len(accel) if timestamps is None else np.asarray(timestamps, dtype=np.float64).tolist()
+        tilt = features[:, F.PITCH:F.ROLL + 1]
+        for i, (row_accel, row_gyro, timestamp) in enumerate(zip(accel.tolist(), gyro.tolist(), times)):
+            attitude.update(row_accel, row_gyro, timestamp)
+            tilt[i] = attitude.orientation()
+
+    def _rolling_statistics(self, accel, features, chunk_size):
+        """
+        Fill the rolling mean/std columns of a batch feature matrix.
+        """
+        mean_cols = slice(F.ACCEL_MEAN_X, F.ACCEL_MEAN_Z + 1)
+        std_cols = slice(F.ACCEL_STD_X, F.ACCEL_STD_Z + 1)
+        window = self.window_size
+        num_samples = len(accel)
+        
+        # A window holding a single sample reports zeros
+        if window < 2:
+            features[:, mean_cols] = 0.0
+            features[:, std_cols] = 0.0
+            return
+        
+        # Leading rows see a partially filled window
+        features[:1, mean_cols] = 0.0
+        features[:1, std_cols] = 0.0
+        for i in range(1, min(window - 1, num_samples)):
+            features[i, mean_cols] = accel[:i + 1].mean(axis=0)
+            features[i, std_cols] = accel[:i + 1].std(axis=0)
+        
+        if num_samples < window:
+            return
+        
+        # Full windows via a strided view, processed block by block
+        windows = sliding_window_view(accel, window, axis=0)
+        for start in range(0, len(windows), chunk_size):
+            block = windows[start:start + chunk_size]
+            rows = slice(start + window - 1, start + window - 1 + len(block))
+            features[rows, mean_cols] = block.mean(axis=-1)
+            features[rows, std_cols] = block.std(axis=-1)
+
     def detect_anomalies(self):
         """
         Detect anomalies in the sensor data that might indicate rollover risk.
@@ -157,47 +431,30 @@ class SensorDataProcessor:
         if len(self.accel_data_buffer) < 3:
             return {'anomaly_detected': False, 'confidence': 0.0}
             
-        # Calculate moving average and detect sudden changes
-        ax_values = [data[0] for data in self.accel_data_buffer]
-        ay_values = [data[1] for data in self.accel_data_buffer]
-        az_values = [data[2] for data in self.accel_data_buffer]
-        
-        # Check for sudden changes in acceleration
-        recent_ax = ax_values[-2:]  # Last 2 values
-        recent_ay = ay_values[-2:]
-        recent_az = az_values[-2:]
-        
-        # Calculate differences
-        if len(recent_ax) == 2:
-            ax_change = abs(recent_ax[1] - recent_ax[0])
-            ay_change = abs(recent_ay[1] - recent_ay[0])
-            az_change = abs(recent_az[1] - recent_az[0])
-            
-            # Define thresholds for anomaly detection
-            threshold = 3.0  # m/s^2
-            
-            anomaly_detected = (ax_change > threshold or 
-                              ay_change > threshold or 
-                              az_change > threshold)
-            
-            max_change = max(ax_change, ay_change, az_change)
-            confidence = min(1.0, max_change / threshold)
-            
-            return {
-                'anomaly_detected': anomaly_detected,
-                'confidence': confidence,
-                'max_change': max_change,
-                'threshold': threshold
-            }
-        else:
-            return {'anomaly_detected': False, 'confidence': 0.0}
+        # Check for sudden changes in acceleration between the last 2 values
+        recent = self.accel_data_buffer.view(2)
+        max_change = float(np.abs(recent[1] - recent[0]).max())
+        
+        # Define thresholds for anomaly detection
+        threshold = 3.0  # m/s^2
+        
+        anomaly_detected = max_change > threshold
+        confidence = min(1.0, max_change / threshold)
+        
+        return {
+            'anomaly_detected': anomaly_detected,
+            'confidence': confidence,
+            'max_change': max_change,
+            'threshold': threshold
+        }
 
 
 def main():
     """
-    Main function for testing the sensor data processor.
+    Main function demonstrating the sensor data processor (the checks live
+    in tests/test_data_processor.py).
     """
-    print("Testing Sensor Data Processor...")
+    print("Sensor Data Processor demo...")
     
     processor = SensorDataProcessor()
     
@@ -218,7 +475,40 @@ def main():
         print(f"Data: {data}, Features pitch: {features['orientation']['pitch']:.2f}, "
               f"Anomaly: {anomalies['anomaly_detected']}, Confidence: {anomalies['confidence']:.2f}")
     
-    print("Sensor data processing test completed.")
+    # Batch extraction over a whole recording (tests/test_data_processor.py
+    # checks it against the streaming path)
+    rng = np.random.default_rng(7)
+    accel = rng.normal((0.0, 0.0, 9.81), (1.0, 1.0, 0.5), size=(500, 3))
+    gyro = rng.normal(0.0, 0.1, size=(500, 3))
+    batch = SensorDataProcessor(window_size=10).extract_features_batch(accel, gyro)
+    print(f"Batch feature matrix: {batch.shape}")
+    
+    # Block ingestion, as used by the sensor/control pipeline
+    blocks = SensorDataProcessor(window_size=10)
+    for start in range(0, len(accel), 32):
+        blocks.add_sensor_batch(accel[start:start + 32], gyro[start:start + 32])
+    print(f"Block ingestion: {len(blocks.accel_data_buffer)} samples buffered")
+    
+    # Gyro trend of a linear ramp in roll rate (2 rad/s^2)
+    ramp = SensorDataProcessor(window_size=10)
+    for i in range(15):
+        t = 0.01 * i
+        ramp.add_sensor_batch(np.array([[0.0, 0.0, 9.81]]), np.array([[0.1 + 2.0 * t, 0.0, 0.0]]),
+                              np.array([t]))
+    print(f"Gyro trend over the window: {ramp.get_gyro_trend()}")
+
+    # Block ingestion feeds the attitude filter sample by sample
+    from .attitude import ComplementaryFilter
+    single = SensorDataProcessor(attitude=ComplementaryFilter())
+    blocks = SensorDataProcessor(attitude=ComplementaryFilter())
+    for i in range(len(accel)):
+        single.add_accel_data(tuple(accel[i]), 0.01 * i)
+        single.add_gyro_data(tuple(gyro[i]), 0.01 * i)
+    for start in range(0, len(accel), 7):
+        blocks.add_sensor_batch(accel[start:start + 7], gyro[start:start + 7],
+                                0.01 * np.arange(start, min(start + 7, len(accel))))
+    print(f"Filtered tilt: pitch {single.attitude.pitch:.2f}, roll {single.attitude.roll:.2f} deg")
+    print("Sensor data processing demo completed.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+"""
+Troll-vs-Troll Project
+Feature Schema Module
+
+This module defines the fixed column layout of the flat feature vectors
+produced by SensorDataProcessor. Streaming and batch feature extraction
+share this schema, so a row computed from one sample and a row of a
+whole-recording feature matrix can be used interchangeably.
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：特征向量列定义 - 成功
+
+# Column names of a feature vector, in column order
+FEATURE_NAMES = (
+    'timestamp',
+    'accel_x',
+    'accel_y',
+    'accel_z',
+    'accel_magnitude',
+    'accel_change_rate',
+    'accel_mean_x',
+    'accel_mean_y',
+    'accel_mean_z',
+    'accel_std_x',
+    'accel_std_y',
+    'accel_std_z',
+    'gyro_x',
+    'gyro_y',
+    'gyro_z',
+    'pitch',
+    'roll',
+)
+
+# Column index by name
+FEATURE_INDEX = {name: index for index, name in enumerate(FEATURE_NAMES)}
+
+NUM_FEATURES = len(FEATURE_NAMES)
+
+# Column indices for direct indexing on the hot path
+(TIMESTAMP,
+ ACCEL_X, ACCEL_Y, ACCEL_Z,
+ ACCEL_MAGNITUDE, ACCEL_CHANGE_RATE,
+ ACCEL_MEAN_X, ACCEL_MEAN_Y, ACCEL_MEAN_Z,
+ ACCEL_STD_X, ACCEL_STD_Y, ACCEL_STD_Z,
+ GYRO_X, GYRO_Y, GYRO_Z,
+ PITCH, ROLL) = range(NUM_FEATURES)
@@ -0,0 +1,99 @@
+"""
+Troll-vs-Troll Project
+IMU Source Module
+
+This module provides the sources of raw IMU samples used by the runtime:
+the UNIHIKER M10 onboard accelerometer/gyroscope (through pinpong) and a
+simulated IMU backed by SensorDataGenerator for running the control
+stack without hardware. Both expose the same read() interface.
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：IMU数据源，板载传感器与模拟数据 - 成功
+
+GRAVITY = 9.81  # m/s^2 per g
+
+
+class OnboardIMU:
+    """
+    Reads the UNIHIKER M10 onboard accelerometer and gyroscope.
+    """
+
+    def __init__(self):
+        """
+        Initialize the pinpong board and the onboard sensors.
+        """
+        # TODO: Verify axis orientation and gyroscope units on the carrier - MEDIUM - Developer
+        # pinpong is imported here so that importing this module stays cheap
+        from pinpong.board import Board
+        from pinpong.extension.unihiker import accelerometer, gyroscope
+
+        Board().begin()
+        self.accelerometer = accelerometer
+        self.gyroscope = gyroscope
+
+    def read(self):
+        """
+        Read one IMU sample.
+
+        Returns:
+            tuple: ((ax, ay, az) in m/s^2, (gx, gy, gz) in rad/s)
+        """
+        accel = (
+            self.accelerometer.get_x() * GRAVITY,
+            self.accelerometer.get_y() * GRAVITY,
+            self.accelerometer.get_z() * GRAVITY,
+        )
+        gyro = (
+            self.gyroscope.get_x(),
+            self.gyroscope.get_y(),
+            self.gyroscope.get_z(),
+        )
+        return accel, gyro
+
+
+class SimulatedIMU:
+    """
+    Produces IMU samples from SensorDataGenerator.
+    """
+
+    def __init__(self, scenario="normal", seed=None):
+        """
+        Initialize the simulated IMU.
+
+        Args:
+            scenario (str): Movement scenario of the data generator
+            seed (int, optional): Random seed for reproducible data
+        """
+        from ..utils.data_generator import SensorDataGenerator
+
+        self.generator = SensorDataGenerator(seed=seed)
+        self.generator.set_scenario(scenario)
+
+    def read(self):
+        """
+        Read one IMU sample.
+
+        Returns:
+            tuple: ((ax, ay, az) in m/s^2, (gx, gy, gz) in rad/s)
+        """
+        return self.generator.generate_accel_data(), self.generator.generate_gyro_data()
+
+
+def create_imu_source(simulate=False, scenario="normal", seed=None):
+    """
+    Create the onboard IMU source, or a simulated one.
+
+    Args:
+        simulate (bool): Use the simulated IMU instead of the hardware
+        scenario (str): Scenario of the simulated IMU
+        seed (int, optional): Seed of the simulated IMU
+
+    Returns:
+        OnboardIMU or SimulatedIMU: IMU source
+    """
+    if simulate:
+        return SimulatedIMU(scenario=scenario, seed=seed)
+    return OnboardIMU()
@@ -0,0 +1,203 @@
+"""
+Troll-vs-Troll Project
+Ring Buffer Module
+
+This module implements a fixed-capacity ring buffer backed by a
+preallocated, contiguous NumPy array. Every sample is written twice
+(at slot i and i + capacity), so the buffered samples are always
+available as a single ordered slice of the storage array. Windowed math
+can therefore run directly on a zero-copy view without rebuilding lists
+or arrays for each sample.
+
+Version: 1.0.1
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：预分配NumPy环形缓冲区 - 成功
+# - v1.0.1 2026-10-17: 自检迁移至tests/test_ring_buffer.py - 成功
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity ring buffer of N x width samples with timestamps.
+    Supports constant-time appends, bulk appends and zero-copy ordered views.
+    """
+
+    def __init__(self, capacity, width=3, dtype=np.float64, with_timestamps=True):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            capacity (int): Maximum number of samples kept in the buffer
+            width (int, optional): Values per sample (3 for IMU axes),
+                None for a buffer of scalars
+            dtype: NumPy dtype of the sample values
+            with_timestamps (bool): Whether to keep a timestamp per sample
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self.width = width
+
+        shape = (2 * capacity,) if width is None else (2 * capacity, width)
+        self._data = np.zeros(shape, dtype=dtype)
+        self._timestamps = np.full(2 * capacity, np.nan) if with_timestamps else None
+
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        return self._data[self._start:self._start + self._size][index]
+
+    @property
+    def is_full(self):
+        """
+        Whether the buffer holds capacity samples.
+        """
+        return self._size == self.capacity
+
+    def append(self, value, timestamp=np.nan):
+        """
+        Append one sample, overwriting the oldest one when full.
+
+        Args:
+            value: Sample value (scalar or sequence of width values)
+            timestamp (float, optional): Timestamp of the sample
+        """
+        if self._size < self.capacity:
+            slot = self._start + self._size
+            if slot >= self.capacity:
+                slot -= self.capacity
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = slot + 1 if slot + 1 < self.capacity else 0
+
+        self._data[slot] = value
+        self._data[slot + self.capacity] = value
+        if self._timestamps is not None:
+            self._timestamps[slot] = timestamp
+            self._timestamps[slot + self.capacity] = timestamp
+
+    def extend(self, values, timestamps=None):
+        """
+        Append a block of samples in one operation.
+
+        Args:
+            values (np.ndarray): Samples, shape (k,) or (k, width)
+            timestamps (np.ndarray, optional): Timestamps, shape (k,)
+        """
+        values = np.asarray(values, dtype=self._data.dtype)
+        count = len(values)
+        if count == 0:
+            return
+
+        if timestamps is None:
+            timestamps = np.full(count, np.nan)
+        else:
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+            if len(timestamps) != count:
+                raise ValueError("timestamps must have one entry per sample")
+
+        # Only the newest capacity samples can survive the append
+        if count >= self.capacity:
+            self._write(0, values[-self.capacity:], timestamps[-self.capacity:])
+            self._start = 0
+            self._size = self.capacity
+            return
+
+        first = (self._start + self._size) % self.capacity
+        head = min(count, self.capacity - first)
+        self._write(first, values[:head], timestamps[:head])
+        if head < count:
+            self._write(0, values[head:], timestamps[head:])
+
+        overflow = self._size + count - self.capacity
+        if overflow > 0:
+            self._start = (self._start + overflow) % self.capacity
+            self._size = self.capacity
+        else:
+            self._size += count
+
+    def _write(self, slot, values, timestamps):
+        """
+        Write a contiguous run of samples and its mirror copy.
+        """
+        end = slot + len(values)
+        self._data[slot:end] = values
+        self._data[slot + self.capacity:end + self.capacity] = values
+        if self._timestamps is not None:
+            self._timestamps[slot:end] = timestamps
+            self._timestamps[slot + self.capacity:end + self.capacity] = timestamps
+
+    def view(self, count=None):
+        """
+        Get the newest samples as an ordered, zero-copy view.
+
+        Args:
+            count (int, optional): Number of newest samples (default: all)
+
+        Returns:
+            np.ndarray: Samples ordered oldest to newest
+        """
+        end = self._start + self._size
+        if count is None or count >= self._size:
+            return self._data[self._start:end]
+        return self._data[end - count:end]
+
+    def timestamps(self, count=None):
+        """
+        Get the timestamps of the newest samples as an ordered view.
+
+        Args:
+            count (int, optional): Number of newest samples (default: all)
+
+        Returns:
+            np.ndarray: Timestamps ordered oldest to newest
+        """
+        if self._timestamps is None:
+            raise ValueError("RingBuffer was created without timestamps")
+
+        end = self._start + self._size
+        if count is None or count >= self._size:
+            return self._timestamps[self._start:end]
+        return self._timestamps[end - count:end]
+
+    def clear(self):
+        """
+        Remove all samples from the buffer.
+        """
+        self._start = 0
+        self._size = 0
+
+
+def main():
+    """
+    Main function demonstrating the ring buffer (the checks live in
+    tests/test_ring_buffer.py).
+    """
+    print("Ring Buffer demo...")
+
+    rng = np.random.default_rng(0)
+    buffer = RingBuffer(capacity=8)
+
+    for i in range(50):
+        if i % 7 == 3:
+            block = rng.normal(size=(rng.integers(1, 12), 3))
+            buffer.extend(block, np.arange(len(block)) + i)
+        else:
+            buffer.append(tuple(rng.normal(size=3)), float(i))
+
+    print(f"Buffer holds {len(buffer)} samples, latest: {buffer[-1]}")
+    print(f"Timestamps: {buffer.timestamps()}")
+    print("Ring buffer demo completed.")
+
+
+if __name__ == "__main__":
+    main()
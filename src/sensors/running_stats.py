@@ -0,0 +1,190 @@
+"""
+Troll-vs-Troll Project
+Running Statistics Module
+
+This module implements constant-time sliding window statistics based on
+Welford's online algorithm. Each new sample updates the window mean and
+variance in O(1) instead of recomputing them over the whole buffer, which
+keeps the per-sample cost of the sensor pipeline flat at 100-1000 Hz on
+the UNIHIKER M10.
+
+Version: 1.1.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：滑动窗口增量均值/方差(Welford) - 成功
+# - v1.1.0 2026-10-17: 新增extend()批量写入 - 成功
+
+import math
+
+
+class SlidingWindowStats:
+    """
+    Sliding window mean/variance for a single scalar stream.
+
+    Samples are added with push(); once the window is full the oldest
+    sample is removed with the inverse Welford update. Rounding errors of
+    the add/remove updates are bounded by periodically recomputing the
+    accumulators from the stored window (see resync_interval).
+    """
+
+    def __init__(self, window_size, resync_interval=1024):
+        """
+        Initialize the sliding window statistics.
+
+        Args:
+            window_size (int): Number of samples in the sliding window
+            resync_interval (int): Number of evictions between exact
+                recomputations of the accumulators (0 disables resync)
+        """
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+
+        self.window_size = window_size
+        self.resync_interval = resync_interval
+
+        # Preallocated ring of the samples currently in the window
+        self._values = [0.0] * window_size
+        self._next = 0
+        self._evictions = 0
+
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value):
+        """
+        Add a sample to the window, evicting the oldest one when full.
+
+        Args:
+            value (float): New sample value
+        """
+        value = float(value)
+
+        if self.count == self.window_size:
+            old = self._values[self._next]
+            self._values[self._next] = value
+            self._next = (self._next + 1) % self.window_size
+
+            # Replace old with value in a single step (window size constant)
+            delta = value - old
+            old_mean = self.mean
+            self.mean = old_mean + delta / self.count
+            self._m2 += delta * (value - self.mean + old - old_mean)
+
+            self._evictions += 1
+            if self.resync_interval and self._evictions >= self.resync_interval:
+                self.resync()
+        else:
+            self._values[self._next] = value
+            self._next = (self._next + 1) % self.window_size
+            self.count += 1
+
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+
+    def extend(self, values):
+        """
+        Add a block of samples.
+
+        Only the newest window_size samples can stay in the window, so a
+        block at least that long replaces the window and is resynced.
+
+        Args:
+            values: Sequence of sample values, oldest first
+        """
+        values = [float(v) for v in values[-self.window_size:]]
+        if len(values) < self.window_size:
+            for value in values:
+                self.push(value)
+            return
+
+        self._values[:] = values
+        self._next = 0
+        self.count = self.window_size
+        self.resync()
+
+    def resync(self):
+        """
+        Recompute mean and variance exactly from the stored window.
+        """
+        self._evictions = 0
+        if self.count == 0:
+            self.mean = 0.0
+            self._m2 = 0.0
+            return
+
+        values = self.values()
+        self.mean = math.fsum(values) / self.count
+        self._m2 = math.fsum((v - self.mean) ** 2 for v in values)
+
+    def values(self):
+        """
+        Get the samples currently in the window, oldest first.
+
+        Returns:
+            list: Window samples
+        """
+        if self.count < self.window_size:
+            return self._values[:self.count]
+        return self._values[self._next:] + self._values[:self._next]
+
+    def reset(self):
+        """
+        Clear the window.
+        """
+        self._next = 0
+        self._evictions = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def variance(self):
+        """
+        Population variance of the window (same as np.var with ddof=0).
+        """
+        if self.count < 2:
+            return 0.0
+        return max(0.0, self._m2 / self.count)
+
+    @property
+    def std(self):
+        """
+        Population standard deviation of the window (same as np.std).
+        """
+        return math.sqrt(self.variance)
+
+
+def main():
+    """
+    Main function demonstrating the running statistics against numpy
+    (the checks live in tests/test_running_stats.py).
+    """
+    import numpy as np
+
+    print("Sliding Window Statistics demo...")
+
+    rng = np.random.default_rng(42)
+    samples = rng.normal(9.81, 2.0, size=5000)
+
+    for window_size in (1, 2, 3, 10, 50, 257):
+        stats = SlidingWindowStats(window_size, resync_interval=1000)
+        max_mean_err = max_std_err = 0.0
+
+        for i, value in enumerate(samples):
+            stats.push(value)
+            window = samples[max(0, i - window_size + 1):i + 1]
+            expected_std = np.std(window) if len(window) > 1 else 0.0
+            max_mean_err = max(max_mean_err, abs(stats.mean - np.mean(window)))
+            max_std_err = max(max_std_err, abs(stats.std - expected_std))
+
+        print(f"  window={window_size:4d}: max |mean err|={max_mean_err:.2e}, "
+              f"max |std err|={max_std_err:.2e}")
+
+    print("Sliding window statistics demo completed.")
+
+
+if __name__ == "__main__":
+    main()
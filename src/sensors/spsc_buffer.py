@@ -0,0 +1,176 @@
+"""
+Troll-vs-Troll Project
+SPSC Ring Buffer Module
+
+This module implements a single-producer/single-consumer ring buffer for
+handing timestamped IMU samples from the sensor reader thread to the
+control thread without locks. The producer owns the head index and the
+consumer owns the tail index; each side only reads the other's index.
+A sample is written into its slot before the head is advanced, so the
+consumer never sees a half-written sample (CPython executes the two
+statements in order under the GIL).
+
+When the buffer is full the newest sample is rejected and counted as an
+overrun, so a stalled consumer shows up in the metrics instead of
+silently overwriting samples it has not read yet.
+
+Version: 1.0.1
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：无锁单生产者/单消费者环形缓冲区 - 成功
+# - v1.0.1 2026-10-17: 自检迁移至tests/test_spsc_buffer.py - 成功
+
+import numpy as np
+
+
+class SPSCRingBuffer:
+    """
+    Lock-free single-producer/single-consumer buffer of timestamped samples.
+    """
+
+    def __init__(self, capacity, width=6, dtype=np.float64):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity (int): Maximum number of samples waiting to be drained
+            width (int): Values per sample (6 for accel + gyro)
+            dtype: NumPy dtype of the sample values
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self.width = width
+        self._data = np.zeros((capacity, width), dtype=dtype)
+        self._timestamps = np.zeros(capacity)
+
+        # Monotonic counters; slot = index % capacity
+        self._head = 0  # written by the producer only
+        self._tail = 0  # written by the consumer only
+
+        # Producer-side metrics
+        self.pushed = 0
+        self.overruns = 0
+        self.high_water = 0
+
+        # Consumer-side metrics
+        self.drained = 0
+        self.drains = 0
+
+    def __len__(self):
+        return self._head - self._tail
+
+    def push(self, value, timestamp):
+        """
+        Add one sample (producer thread only).
+
+        Args:
+            value: Sample values, sequence of width values
+            timestamp (float): Timestamp of the sample
+
+        Returns:
+            bool: True if stored, False if the buffer was full (overrun)
+        """
+        head = self._head
+        pending = head - self._tail
+        if pending >= self.capacity:
+            self.overruns += 1
+            return False
+
+        slot = head % self.capacity
+        self._data[slot] = value
+        self._timestamps[slot] = timestamp
+        # Publish only after the slot is complete
+        self._head = head + 1
+
+        self.pushed += 1
+        if pending + 1 > self.high_water:
+            self.high_water = pending + 1
+        return True
+
+    def drain(self, max_items=None):
+        """
+        Remove the waiting samples, oldest first (consumer thread only).
+
+        Args:
+            max_items (int, optional): Maximum number of samples to take
+
+        Returns:
+            tuple: (values, timestamps) copies with shapes (k, width) and (k,)
+        """
+        tail = self._tail
+        count = self._head - tail
+        if max_items is not None:
+            count = min(count, max_items)
+
+        first = tail % self.capacity
+        head = min(count, self.capacity - first)
+        values = np.empty((count, self.width), dtype=self._data.dtype)
+        timestamps = np.empty(count)
+        values[:head] = self._data[first:first + head]
+        timestamps[:head] = self._timestamps[first:first + head]
+        if head < count:
+            values[head:] = self._data[:count - head]
+            timestamps[head:] = self._timestamps[:count - head]
+
+        # Release the slots only after they have been copied
+        self._tail = tail + count
+
+        self.drained += count
+        self.drains += 1
+        return values, timestamps
+
+    def get_metrics(self):
+        """
+        Get the backpressure and overrun counters.
+
+        Returns:
+            dict: Pushed, drained, pending and overrun counts
+        """
+        return {
+            'capacity': self.capacity,
+            'pushed': self.pushed,
+            'drained': self.drained,
+            'pending': len(self),
+            'overruns': self.overruns,
+            'high_water': self.high_water,
+            'drains': self.drains,
+        }
+
+
+def main():
+    """
+    Main function demonstrating the SPSC ring buffer across two threads
+    (the checks live in tests/test_spsc_buffer.py).
+    """
+    import threading
+
+    print("SPSC Ring Buffer demo...")
+
+    buffer = SPSCRingBuffer(capacity=64, width=2)
+    total = 200000
+    received = 0
+
+    def producer():
+        i = 0
+        while i < total:
+            if buffer.push((i, -i), float(i)):
+                i += 1
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    while received < total:
+        values, timestamps = buffer.drain(max_items=50)
+        received += len(timestamps)
+    thread.join()
+
+    # The producer retries on full, so every overrun here is a retry
+    print(f"Transferred {total} samples in {buffer.drains} drains, "
+          f"high water {buffer.high_water}/{buffer.capacity}, {buffer.overruns} full retries")
+    print("SPSC ring buffer demo completed.")
+
+
+if __name__ == "__main__":
+    main()
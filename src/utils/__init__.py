@@ -10,5 +10,11 @@ Version: 1.0.0
 """
 
 ## 版本日志
-- v1.0.0 2025-12-28: 初始版本 - 成功
-- v1.1.0 2025-12-28: 添加数据生成器模块 - 待测试
\ No newline at end of file
+# - v1.0.0 2025-12-28: 初始版本 - 成功
+# - v1.1.0 2025-12-28: 添加数据生成器模块 - 待测试
+# - v1.2.0 2026-10-17: 添加回放引擎模块(replay)及模拟时钟SimulatedClock - 成功
+# - v1.2.1 2026-10-17: 添加轨迹仿真模块(trajectory_simulator)，向量化车辆动力学生成相关IMU数据 - 成功
+# - v1.2.2 2026-10-17: 添加二进制行驶日志模块(drive_log)，支持追加写入与内存映射读取 - 成功
+# - v1.2.3 2026-10-17: 添加行驶日志稀疏块索引模块(log_index) - 成功
+# - v1.2.4 2026-10-17: 添加控制参数网格搜索模块(parameter_sweep)，进程池+共享内存 - 成功
+# - v1.2.5 2026-10-17: 添加闭环仿真模块(closed_loop)，控制器轮速指令反馈至车辆动力学 - 成功
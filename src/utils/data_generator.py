@@ -6,16 +6,118 @@ This module generates realistic sensor data for training and testing
 the machine learning models. The data simulates real-world scenarios
 for pull-handle carriers including normal movement, turns, and rollover risks.
 
-Version: 1.0.0
+Version: 1.4.3
 """
 
+## 版本日志
+# - v1.0.0 2025-12-28: 初始版本 - 待测试
+# - v1.1.0 2026-10-17: 支持注入时钟与start_time - 成功
+# - v1.2.0 2026-10-17: 向量化场景数据生成 - 成功
+# - v1.3.0 2026-10-17: 固定大小分块流式生成训练集 - 成功
+# - v1.4.0 2026-10-17: 独立随机数流与多进程并行生成 - 成功
+# - v1.4.1 2026-10-17: 向量化生成自检迁移至tests/test_data_generator.py - 成功
+# - v1.4.2 2026-10-17: 流式生成自检迁移至tests/test_data_generator.py - 成功
+# - v1.4.3 2026-10-17: _plan_training_shards()不再修改time_in_scenario；分片自检迁移至tests/test_data_generator.py - 成功
+
 import time
 import math
-import random
 import numpy as np
 from datetime import datetime, timedelta
 
 
+# Movement scenarios; the index is the training label
+SCENARIOS = ("normal", "turning", "risky", "rollover_imminent")
+
+# Share of each scenario in generated training datasets
+SCENARIO_DISTRIBUTION = {
+    "normal": 0.4,      # 40% normal
+    "turning": 0.3,     # 30% turning
+    "risky": 0.2,       # 20% risky
+    "rollover_imminent": 0.1  # 10% rollover imminent
+}
+
+# Standard deviations (x, y, z) of the independent normal terms used by the
+# per-sample generator, by scenario in SCENARIOS order
+BASE_ACCEL_SIGMA = np.array([0.1, 0.1, 0.05])
+ACCEL_NOISE_SIGMA = np.array([0.05, 0.05, 0.02])
+SCENARIO_ACCEL_SIGMA = np.array([
+    [0.2, 0.2, 0.1],
+    [0.5, 0.8, 0.2],
+    [1.0, 1.0, 0.5],
+    [2.0, 2.0, 1.0],
+])
+GYRO_NOISE_SIGMA = np.array([0.005, 0.005, 0.005])
+SCENARIO_GYRO_SIGMA = np.array([
+    [0.01, 0.01, 0.01],
+    [0.05, 0.05, 0.2],
+    [0.1, 0.1, 0.3],
+    [0.3, 0.3, 0.2],
+])
+
+# A sum of independent zero-mean normals is normal with the root sum of
+# squares as sigma, so one draw per axis reproduces all terms
+ACCEL_MEAN = np.array([0.0, 0.0, 9.8])
+ACCEL_SIGMA = np.sqrt(BASE_ACCEL_SIGMA**2 + SCENARIO_ACCEL_SIGMA**2 + ACCEL_NOISE_SIGMA**2)
+GYRO_SIGMA = np.sqrt(SCENARIO_GYRO_SIGMA**2 + GYRO_NOISE_SIGMA**2)
+
+# Structured sample layout returned by the vectorized generators
+SAMPLE_DTYPE = np.dtype([
+    ('timestamp', np.float64),
+    ('accel', np.float64, (3,)),
+    ('gyro', np.float64, (3,)),
+    ('label', np.int8),
+])
+
+# Default samples per shard of a generated training dataset
+DEFAULT_SHARD_SIZE = 65536
+
+
+def fill_samples(samples, rng, accel_bias=(0.0, 0.0, 0.0), gyro_bias=(0.0, 0.0, 0.0)):
+    """
+    Draw accelerometer and gyroscope values for labelled samples.
+    
+    Args:
+        samples (np.ndarray): SAMPLE_DTYPE array with labels set
+        rng (np.random.Generator): Random generator to draw from
+        accel_bias (tuple): Accelerometer bias added to every sample
+        gyro_bias (tuple): Gyroscope bias added to every sample
+    """
+    labels = samples['label']
+    samples['accel'] = rng.normal(size=(len(samples), 3))
+    samples['accel'] *= ACCEL_SIGMA[labels]
+    samples['accel'] += ACCEL_MEAN + np.asarray(accel_bias)
+    samples['gyro'] = rng.normal(size=(len(samples), 3))
+    samples['gyro'] *= GYRO_SIGMA[labels]
+    samples['gyro'] += np.asarray(gyro_bias)
+
+
+def generate_training_shard(label_counts, seed_sequence, accel_bias=(0.0, 0.0, 0.0),
+                            gyro_bias=(0.0, 0.0, 0.0)):
+    """
+    Generate one shard of a training dataset.
+    
+    Depends only on its arguments, so shards can be generated in any
+    order and in any process. Module-level so it can run in a worker process.
+    
+    Args:
+        label_counts (np.ndarray): Samples per scenario in this shard
+        seed_sequence (np.random.SeedSequence): Seed of this shard
+        accel_bias (tuple): Accelerometer bias added to every sample
+        gyro_bias (tuple): Gyroscope bias added to every sample
+        
+    Returns:
+        np.ndarray: Shuffled SAMPLE_DTYPE shard with NaN timestamps
+    """
+    rng = np.random.default_rng(seed_sequence)
+    codes = np.arange(len(SCENARIOS), dtype=np.int8)
+    
+    samples = np.empty(int(np.sum(label_counts)), dtype=SAMPLE_DTYPE)
+    samples['timestamp'] = np.nan
+    samples['label'] = rng.permutation(np.repeat(codes, label_counts))
+    fill_samples(samples, rng, accel_bias, gyro_bias)
+    return samples
+
+
 class SensorDataGenerator:
     """
     Generates realistic sensor data for pull-handle carriers.
@@ -33,9 +135,11 @@ class SensorDataGenerator:
         # TODO: Simulate various movement scenarios (normal, turning, risky) - HIGH - Developer
         # TODO: Add noise and drift to make data more realistic - MEDIUM - Developer
         
-        if seed:
-            random.seed(seed)
-            np.random.seed(seed)
+        # All randomness comes from this instance's seed sequence (the
+        # global random/np.random state is left alone). Child 0 drives the
+        # per-sample and sequence methods, each dataset spawns its own child
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence.spawn(1)[0])
         
         self.start_time = time.time()
         self.scenario = "normal"  # normal, turning, risky, rollover_imminent
@@ -53,7 +157,7 @@ class SensorDataGenerator:
         Args:
             scenario (str): One of "normal", "turning", "risky", "rollover_imminent"
         """
-        if scenario in ["normal", "turning", "risky", "rollover_imminent"]:
+        if scenario in SCENARIOS:
             self.scenario = scenario
             self.time_in_scenario = 0
         else:
@@ -79,9 +183,9 @@ class SensorDataGenerator:
         scenario_x, scenario_y, scenario_z = self._get_scenario_acceleration()
         
         # Add noise to make it more realistic
-        noise_x = np.random.normal(0, 0.05)  # 50 mg noise
-        noise_y = np.random.normal(0, 0.05)
-        noise_z = np.random.normal(0, 0.02)  # Less noise on Z (gravity axis)
+        noise_x = self.rng.normal(0, 0.05)  # 50 mg noise
+        noise_y = self.rng.normal(0, 0.05)
+        noise_z = self.rng.normal(0, 0.02)  # Less noise on Z (gravity axis)
         
         # Add bias (sensor imperfection)
         total_x = base_x + scenario_x + noise_x + self.accel_bias[0]
@@ -113,9 +217,9 @@ class SensorDataGenerator:
         scenario_x, scenario_y, scenario_z = self._get_scenario_angular_velocity()
         
         # Add noise
-        noise_x = np.random.normal(0, 0.005)
-        noise_y = np.random.normal(0, 0.005)
-        noise_z = np.random.normal(0, 0.005)
+        noise_x = self.rng.normal(0, 0.005)
+        noise_y = self.rng.normal(0, 0.005)
+        noise_z = self.rng.normal(0, 0.005)
         
         # Add bias
         total_x = base_x + scenario_x + noise_x + self.gyro_bias[0]
@@ -133,9 +237,9 @@ class SensorDataGenerator:
         """
         # Base acceleration is mostly gravity (9.81 m/s^2) on Z axis
         # With small variations due to normal movement
-        base_x = np.random.normal(0, 0.1)  # Small variations in x
-        base_y = np.random.normal(0, 0.1)  # Small variations in y
-        base_z = 9.8 + np.random.normal(0, 0.05)  # Gravity with small variations
+        base_x = self.rng.normal(0, 0.1)  # Small variations in x
+        base_y = self.rng.normal(0, 0.1)  # Small variations in y
+        base_z = 9.8 + self.rng.normal(0, 0.05)  # Gravity with small variations
         
         return (base_x, base_y, base_z)
 
@@ -148,24 +252,24 @@ class SensorDataGenerator:
         """
         if self.scenario == "normal":
             # Normal walking/rolling - minimal extra acceleration
-            x = np.random.normal(0, 0.2)
-            y = np.random.normal(0, 0.2)
-            z = np.random.normal(0, 0.1)
+            x = self.rng.normal(0, 0.2)
+            y = self.rng.normal(0, 0.2)
+            z = self.rng.normal(0, 0.1)
         elif self.scenario == "turning":
             # Turning - more lateral acceleration
-            x = np.random.normal(0, 0.5)  # More variation in x for turns
-            y = np.random.normal(0, 0.8)  # More variation in y for turns
-            z = np.random.normal(0, 0.2)  # Slight variation in z
+            x = self.rng.normal(0, 0.5)  # More variation in x for turns
+            y = self.rng.normal(0, 0.8)  # More variation in y for turns
+            z = self.rng.normal(0, 0.2)  # Slight variation in z
         elif self.scenario == "risky":
             # Risky movement - higher accelerations
-            x = np.random.normal(0, 1.0)  # Higher variation
-            y = np.random.normal(0, 1.0)
-            z = np.random.normal(0, 0.5)
+            x = self.rng.normal(0, 1.0)  # Higher variation
+            y = self.rng.normal(0, 1.0)
+            z = self.rng.normal(0, 0.5)
         elif self.scenario == "rollover_imminent":
             # About to rollover - high accelerations and tilting
-            x = np.random.normal(0, 2.0)  # Very high variation
-            y = np.random.normal(0, 2.0)
-            z = np.random.normal(0, 1.0)  # Large variations in z due to tilting
+            x = self.rng.normal(0, 2.0)  # Very high variation
+            y = self.rng.normal(0, 2.0)
+            z = self.rng.normal(0, 1.0)  # Large variations in z due to tilting
         else:
             x = y = z = 0.0
         
@@ -190,30 +294,30 @@ class SensorDataGenerator:
         """
         if self.scenario == "normal":
             # Normal - very small angular velocities
-            x = np.random.normal(0, 0.01)
-            y = np.random.normal(0, 0.01)
-            z = np.random.normal(0, 0.01)
+            x = self.rng.normal(0, 0.01)
+            y = self.rng.normal(0, 0.01)
+            z = self.rng.normal(0, 0.01)
         elif self.scenario == "turning":
             # Turning - higher angular velocity around Z axis
-            x = np.random.normal(0, 0.05)
-            y = np.random.normal(0, 0.05)
-            z = np.random.normal(0, 0.2)  # Turning around vertical axis
+            x = self.rng.normal(0, 0.05)
+            y = self.rng.normal(0, 0.05)
+            z = self.rng.normal(0, 0.2)  # Turning around vertical axis
         elif self.scenario == "risky":
             # Risky - more rotation
-            x = np.random.normal(0, 0.1)
-            y = np.random.normal(0, 0.1)
-            z = np.random.normal(0, 0.3)
+            x = self.rng.normal(0, 0.1)
+            y = self.rng.normal(0, 0.1)
+            z = self.rng.normal(0, 0.3)
         elif self.scenario == "rollover_imminent":
             # About to rollover - high rotation rates
-            x = np.random.normal(0, 0.3)  # High rotation around x (roll)
-            y = np.random.normal(0, 0.3)  # High rotation around y (pitch)
-            z = np.random.normal(0, 0.2)  # Some rotation around z
+            x = self.rng.normal(0, 0.3)  # High rotation around x (roll)
+            y = self.rng.normal(0, 0.3)  # High rotation around y (pitch)
+            z = self.rng.normal(0, 0.2)  # Some rotation around z
         else:
             x = y = z = 0.0
         
         return (x, y, z)
 
-    def generate_data_sequence(self, duration, scenario="normal", sample_rate=100):
+    def generate_data_sequence(self, duration, scenario="normal", sample_rate=100, start_time=None):
         """
         Generate a sequence of sensor data over a specified duration.
         
@@ -221,6 +325,8 @@ class SensorDataGenerator:
             duration (float): Duration in seconds
             scenario (str): Movement scenario
             sample_rate (int): Samples per second
+            start_time (float, optional): Timestamp of the first sample
+                (default: current time); fix it for reproducible sequences
             
         Returns:
             list: List of (timestamp, accel_data, gyro_data) tuples
@@ -229,9 +335,11 @@ class SensorDataGenerator:
         self.set_scenario(scenario)
         
         num_samples = int(duration * sample_rate)
+        if start_time is None:
+            start_time = time.time()
         
         for i in range(num_samples):
-            timestamp = time.time() + i / sample_rate
+            timestamp = start_time + i / sample_rate
             accel_data = self.generate_accel_data(timestamp)
             gyro_data = self.generate_gyro_data(timestamp)
             
@@ -254,28 +362,11 @@ class SensorDataGenerator:
                   where label is 0=normal, 1=turning, 2=risky, 3=rollover_imminent
         """
         dataset = []
-        
-        # Define distribution of scenarios in training data
-        scenario_distribution = {
-            "normal": 0.4,      # 40% normal
-            "turning": 0.3,     # 30% turning
-            "risky": 0.2,       # 20% risky
-            "rollover_imminent": 0.1  # 10% rollover imminent
-        }
-        
-        samples_per_scenario = {
-            scenario: int(num_samples * ratio)
-            for scenario, ratio in scenario_distribution.items()
-        }
-        
-        # Adjust for rounding errors
-        total_allocated = sum(samples_per_scenario.values())
-        if total_allocated < num_samples:
-            samples_per_scenario["normal"] += num_samples - total_allocated
+        samples_per_scenario = self._scenario_counts(num_samples)
         
         for scenario, count in samples_per_scenario.items():
             self.set_scenario(scenario)
-            label = ["normal", "turning", "risky", "rollover_imminent"].index(scenario)
+            label = SCENARIOS.index(scenario)
             
             for _ in range(count):
                 accel_data = self.generate_accel_data()
@@ -286,16 +377,177 @@ class SensorDataGenerator:
                 self.time_in_scenario += 0.01
         
         # Shuffle the dataset
-        random.shuffle(dataset)
+        self.rng.shuffle(dataset)
         
         return dataset
 
+    def _scenario_counts(self, num_samples):
+        """
+        Number of training samples per scenario.
+        
+        Args:
+            num_samples (int): Total number of samples
+            
+        Returns:
+            dict: Sample count keyed by scenario
+        """
+        samples_per_scenario = {
+            scenario: int(num_samples * ratio)
+            for scenario, ratio in SCENARIO_DISTRIBUTION.items()
+        }
+        
+        # Adjust for rounding errors
+        total_allocated = sum(samples_per_scenario.values())
+        if total_allocated < num_samples:
+            samples_per_scenario["normal"] += num_samples - total_allocated
+        
+        return samples_per_scenario
+
+    def _fill_samples(self, samples):
+        """
+        Draw accelerometer and gyroscope values for labelled samples.
+        
+        Args:
+            samples (np.ndarray): SAMPLE_DTYPE array with labels set
+        """
+        fill_samples(samples, self.rng, self.accel_bias, self.gyro_bias)
+
+    def _plan_training_shards(self, num_samples, shard_size):
+        """
+        Split a training dataset into shards with their own seeds.
+        
+        The dataset gets a new child of this generator's seed sequence. Its
+        first grandchild draws every shard's label counts (a multivariate
+        hypergeometric over the labels not yet assigned, so the shards
+        together form a uniform shuffle of the scenario mix); the others
+        seed the shards, one each.
+        
+        Args:
+            num_samples (int): Total number of samples
+            shard_size (int): Samples per shard (the last one may be shorter)
+            
+        Returns:
+            list: (label_counts, seed_sequence) per shard, in order
+        """
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        
+        counts = self._scenario_counts(num_samples)
+        remaining = np.array([counts[scenario] for scenario in SCENARIOS], dtype=np.int64)
+        num_shards = -(-num_samples // shard_size)
+        
+        dataset_seed = self.seed_sequence.spawn(1)[0]
+        plan_seed, *shard_seeds = dataset_seed.spawn(num_shards + 1)
+        plan_rng = np.random.default_rng(plan_seed)
+        
+        shards = []
+        for index, shard_seed in enumerate(shard_seeds):
+            size = min(shard_size, num_samples - index * shard_size)
+            label_counts = plan_rng.multivariate_hypergeometric(remaining, size)
+            remaining -= label_counts
+            shards.append((label_counts, shard_seed))
+        
+        return shards
+
+    def generate_sequence_array(self, duration, scenario="normal", sample_rate=100, start_time=0.0):
+        """
+        Vectorized generate_data_sequence() returning a structured array.
+        
+        All noise for the N samples is drawn in single calls; the values
+        follow the same per-scenario distributions as the per-sample path.
+        
+        Args:
+            duration (float): Duration in seconds
+            scenario (str): Movement scenario
+            sample_rate (int): Samples per second
+            start_time (float): Timestamp of the first sample
+            
+        Returns:
+            np.ndarray: SAMPLE_DTYPE array of N samples
+        """
+        self.set_scenario(scenario)
+        num_samples = int(duration * sample_rate)
+        
+        samples = np.empty(num_samples, dtype=SAMPLE_DTYPE)
+        samples['timestamp'] = start_time + np.arange(num_samples) / sample_rate
+        samples['label'] = SCENARIOS.index(scenario)
+        self._fill_samples(samples)
+        
+        self.time_in_scenario += num_samples * (0.01 + 1.0 / sample_rate)
+        return samples
+
+    def generate_training_array(self, num_samples=1000, shard_size=DEFAULT_SHARD_SIZE, workers=1):
+        """
+        Vectorized generate_training_dataset() returning a structured array.
+        
+        Uses the same scenario mix; samples are shuffled and carry a NaN
+        timestamp. The output depends on the seed, num_samples and
+        shard_size only: it is byte-identical for any number of workers
+        and equal to the concatenated iter_training_chunks() stream.
+        
+        Args:
+            num_samples (int): Total number of samples to generate
+            shard_size (int): Samples per independently seeded shard
+            workers (int, optional): Worker processes; 1 generates in this
+                process, None uses all cores
+            
+        Returns:
+            np.ndarray: SAMPLE_DTYPE array of num_samples samples
+        """
+        shards = self._plan_training_shards(num_samples, shard_size)
+        samples = np.empty(num_samples, dtype=SAMPLE_DTYPE)
+        args = [(label_counts, seed, tuple(self.accel_bias), tuple(self.gyro_bias))
+                for label_counts, seed in shards]
+        
+        if workers == 1 or len(shards) < 2:
+            results = (generate_training_shard(*arg) for arg in args)
+            executor = None
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(generate_training_shard, *zip(*args))
+        
+        try:
+            # Shards come back in plan order and go to fixed offsets
+            for index, shard in enumerate(results):
+                samples[index * shard_size:index * shard_size + len(shard)] = shard
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        return samples
+
+    def iter_training_chunks(self, num_samples, chunk_size=DEFAULT_SHARD_SIZE):
+        """
+        Generate a shuffled training dataset as a stream of fixed-size chunks.
+        
+        Memory use depends on chunk_size only, so datasets far larger than
+        RAM can be produced and consumed chunk by chunk. Instead of a
+        shuffle buffer, each chunk's label counts are drawn from a
+        multivariate hypergeometric distribution over the labels not yet
+        emitted, and then permuted within the chunk. The concatenated
+        stream is therefore an exactly uniform shuffle of the same
+        scenario mix as generate_training_dataset(). Each chunk is one
+        independently seeded shard (see generate_training_array()).
+        
+        Args:
+            num_samples (int): Total number of samples to generate
+            chunk_size (int): Samples per chunk (the last one may be shorter)
+            
+        Yields:
+            np.ndarray: SAMPLE_DTYPE chunks with NaN timestamps
+        """
+        for label_counts, seed in self._plan_training_shards(num_samples, chunk_size):
+            yield generate_training_shard(label_counts, seed, tuple(self.accel_bias), tuple(self.gyro_bias))
+
 
 def main():
     """
-    Main function for testing the data generator.
+    Main function demonstrating the data generator (the checks live in
+    tests/test_data_generator.py).
     """
-    print("Testing Sensor Data Generator...")
+    print("Sensor Data Generator demo...")
     
     generator = SensorDataGenerator(seed=42)
     
@@ -322,7 +574,49 @@ def main():
         print(f"  {i+1}: Accel=({accel[0]:.3f}, {accel[1]:.3f}, {accel[2]:.3f}), "
               f"Gyro=({gyro[0]:.3f}, {gyro[1]:.3f}, {gyro[2]:.3f})")
     
-    print("\nData generation test completed.")
+    # Vectorized generation, distributed like the loop path
+    first = SensorDataGenerator(seed=7).generate_training_array(20000)
+    
+    loop_generator = SensorDataGenerator(seed=7)
+    vector_generator = SensorDataGenerator(seed=8)
+    print("\nPer-scenario accel/gyro std, loop vs vectorized (20000 samples):")
+    for label, scenario in enumerate(SCENARIOS):
+        loop = loop_generator.generate_data_sequence(200.0, scenario, start_time=0.0)
+        loop_accel = np.array([sample[1] for sample in loop])
+        loop_gyro = np.array([sample[2] for sample in loop])
+        vector = vector_generator.generate_sequence_array(200.0, scenario)
+        
+        print(f"  {scenario:18s} accel {np.round(loop_accel.std(axis=0), 3)} vs "
+              f"{np.round(vector['accel'].std(axis=0), 3)}, gyro {np.round(loop_gyro.std(axis=0), 3)} vs "
+              f"{np.round(vector['gyro'].std(axis=0), 3)}")
+    
+    print(f"Label counts: {np.bincount(first['label']).tolist()}")
+    
+    # Streaming generation in constant memory
+    import tracemalloc
+    
+    num_samples = 2000000
+    totals = np.zeros(len(SCENARIOS), dtype=np.int64)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for chunk in SensorDataGenerator(seed=9).iter_training_chunks(num_samples, chunk_size=65536):
+        totals += np.bincount(chunk['label'], minlength=len(SCENARIOS))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    print(f"Streamed {num_samples} samples in {elapsed:.2f} s, peak traced memory "
+          f"{peak / 2**20:.1f} MiB, labels {totals.tolist()}")
+    
+    # Sharded generation: same bytes for any worker count and for the stream
+    reference = SensorDataGenerator(seed=10).generate_training_array(300000, shard_size=50000, workers=1)
+    streamed = np.concatenate(list(SensorDataGenerator(seed=10).iter_training_chunks(300000, chunk_size=50000)))
+    identical = streamed.tobytes() == reference.tobytes()
+    for workers in (2, 3):
+        parallel = SensorDataGenerator(seed=10).generate_training_array(300000, shard_size=50000, workers=workers)
+        identical = identical and parallel.tobytes() == reference.tobytes()
+    print(f"Sharded dataset identical for 1, 2 and 3 workers and for the chunk stream: {identical}")
+    print("\nData generation demo completed.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,404 @@
+"""
+Troll-vs-Troll Project
+Drive Log Module
+
+This module records drives to a compact binary log and reads them back
+through a memory map. A log file is an 8-byte magic, a 4-byte header
+length and a JSON header (format version, record dtype, feature names,
+user metadata), padded to HEADER_ALIGN bytes, followed by fixed-size
+records of RECORD_DTYPE: one per IMU sample with the sample, its feature
+vector and the latest controller output.
+
+DriveLogWriter fills a preallocated record block and writes it with a
+single write() when it is full, so logging at 1 kHz allocates nothing
+per sample. The record count is derived from the file size, so a log
+can be reopened for appending and a partially written last record after
+a power loss is ignored. DriveLogReader memory-maps the records; time
+range queries are a binary search on the timestamp column and return
+zero-copy views.
+
+Version: 1.0.3
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：二进制行驶日志与内存映射读取 - 成功
+# - v1.0.1 2026-10-17: RolloverPredictor不再读取时钟 - 成功
+# - v1.0.2 2026-10-17: 自检迁移至tests/test_drive_log.py - 成功
+# - v1.0.3 2026-10-17: DriveLogReader.close()不再强制关闭内存映射，关闭后视图仍可用 - 成功
+
+import json
+import os
+
+import numpy as np
+
+from ..sensors.features import FEATURE_NAMES, NUM_FEATURES
+
+
+MAGIC = b'TVTDRIVE'
+FORMAT_VERSION = 1
+HEADER_ALIGN = 4096
+
+# Risk levels by code in RECORD_DTYPE['risk_level'] (-1 = no assessment yet)
+RISK_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+
+# One record per IMU sample; controller fields hold the latest control step
+RECORD_DTYPE = np.dtype([
+    ('timestamp', np.float64),
+    ('accel', np.float32, (3,)),
+    ('gyro', np.float32, (3,)),
+    ('features', np.float32, (NUM_FEATURES,)),
+    ('left_wheel_speed', np.float32),
+    ('right_wheel_speed', np.float32),
+    ('risk_score', np.float32),
+    ('anomaly_score', np.float32),
+    ('risk_level', np.int8),
+    ('control_active', np.bool_),
+    ('control_step', np.bool_),
+])
+
+
+def _encode_header(metadata):
+    """
+    Build the padded file header.
+
+    Args:
+        metadata (dict): JSON-serializable user metadata
+
+    Returns:
+        bytes: Header, a multiple of HEADER_ALIGN bytes long
+    """
+    header = {
+        'version': FORMAT_VERSION,
+        'dtype': RECORD_DTYPE.descr,
+        'feature_names': list(FEATURE_NAMES),
+        'metadata': metadata or {},
+    }
+    text = json.dumps(header).encode('utf-8')
+    size = len(MAGIC) + 4 + len(text)
+    padded = -(-size // HEADER_ALIGN) * HEADER_ALIGN
+    return MAGIC + np.uint32(padded).tobytes() + text + b' ' * (padded - size)
+
+
+def read_header(path):
+    """
+    Read and check the header of a drive log.
+
+    Args:
+        path (str): Log file path
+
+    Returns:
+        tuple: (header dict, header size in bytes)
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(len(MAGIC) + 4)
+        if len(prefix) < len(MAGIC) + 4 or prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a drive log")
+        size = int(np.frombuffer(prefix[len(MAGIC):], dtype=np.uint32)[0])
+        header = json.loads(f.read(size - len(prefix)).decode('utf-8'))
+
+    if header['version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported drive log version {header['version']}")
+    if np.dtype([tuple(field) for field in header['dtype']]) != RECORD_DTYPE:
+        raise ValueError("Drive log record layout does not match RECORD_DTYPE")
+    return header, size
+
+
+class DriveLogWriter:
+    """
+    Appends IMU samples, features and controller outputs to a drive log.
+    """
+
+    def __init__(self, path, metadata=None, block_size=1024):
+        """
+        Open a drive log for appending, creating it if needed.
+
+        Args:
+            path (str): Log file path
+            metadata (dict, optional): Stored in the header of a new log
+            block_size (int): Records buffered per write
+        """
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            _, header_size = read_header(path)
+            self._file = open(path, 'r+b')
+            # Drop a partially written last record
+            count = (os.path.getsize(path) - header_size) // RECORD_DTYPE.itemsize
+            self._file.truncate(header_size + count * RECORD_DTYPE.itemsize)
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(_encode_header(metadata))
+            count = 0
+        self.records_written = count
+
+        self._block = np.zeros(block_size, dtype=RECORD_DTYPE)
+        self._fill = 0
+        # Column views for cheap per-sample writes
+        self._timestamp = self._block['timestamp']
+        self._accel = self._block['accel']
+        self._gyro = self._block['gyro']
+        self._features = self._block['features']
+        self._left = self._block['left_wheel_speed']
+        self._right = self._block['right_wheel_speed']
+        self._risk = self._block['risk_score']
+        self._anomaly = self._block['anomaly_score']
+        self._level = self._block['risk_level']
+        self._active = self._block['control_active']
+        self._step = self._block['control_step']
+
+        # Latest controller output, repeated until the next control step
+        self._output = [0.0, 0.0, np.nan, np.nan, -1, False]
+        self._level_codes = {level: code for code, level in enumerate(RISK_LEVELS)}
+
+        print("DriveLogWriter initialized")
+
+    def set_output(self, output):
+        """
+        Store a controller output for the following records.
+
+        Args:
+            output (dict): Output of DifferentialController.step_control()
+        """
+        held = self._output
+        held[0] = output['left_wheel_speed']
+        held[1] = output['right_wheel_speed']
+        held[5] = output['control_active']
+        risk = output.get('risk_assessment')
+        if risk is not None:
+            anomaly = risk.get('anomaly_score')
+            held[2] = risk['risk_score']
+            held[3] = np.nan if anomaly is None else anomaly
+            held[4] = self._level_codes[risk['risk_level']]
+
+    def record(self, timestamp, accel, gyro=None, features=None, output=None):
+        """
+        Append one sample.
+
+        Args:
+            timestamp (float): Sample time in seconds
+            accel (tuple): (x, y, z) acceleration values
+            gyro (tuple, optional): (x, y, z) gyroscope values
+            features (np.ndarray, optional): Feature vector (FEATURE_NAMES order)
+            output (dict, optional): Controller output of a control step run
+                on this sample
+        """
+        i = self._fill
+        self._timestamp[i] = timestamp
+        self._accel[i] = accel
+        if gyro is None:
+            self._gyro[i] = np.nan
+        else:
+            self._gyro[i] = gyro
+        if features is None:
+            self._features[i] = np.nan
+        else:
+            self._features[i] = features
+        if output is not None:
+            self.set_output(output)
+        held = self._output
+        self._left[i] = held[0]
+        self._right[i] = held[1]
+        self._risk[i] = held[2]
+        self._anomaly[i] = held[3]
+        self._level[i] = held[4]
+        self._active[i] = held[5]
+        self._step[i] = output is not None
+
+        self._fill = i + 1
+        if self._fill == len(self._block):
+            self.flush()
+
+    def record_batch(self, records):
+        """
+        Append a block of complete records.
+
+        Args:
+            records (np.ndarray): RECORD_DTYPE array
+        """
+        self.flush()
+        records = np.ascontiguousarray(records, dtype=RECORD_DTYPE)
+        self._file.write(memoryview(records).cast('B'))
+        self.records_written += len(records)
+
+    def flush(self):
+        """
+        Write the buffered records to the file.
+        """
+        if self._fill:
+            self._file.write(memoryview(self._block[:self._fill]).cast('B'))
+            self.records_written += self._fill
+            self._fill = 0
+        self._file.flush()
+
+    def close(self):
+        """
+        Flush and close the log.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class DriveLogReader:
+    """
+    Memory-mapped read access to a drive log.
+    """
+
+    def __init__(self, path):
+        """
+        Open a drive log.
+
+        Args:
+            path (str): Log file path
+        """
+        self.path = path
+        self.header, self.header_size = read_header(path)
+        self.metadata = self.header['metadata']
+        count = (os.path.getsize(path) - self.header_size) // RECORD_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r',
+                                     offset=self.header_size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+        self.timestamps = self.records['timestamp']
+
+    def __len__(self):
+        return len(self.records)
+
+    def index_range(self, t0=None, t1=None):
+        """
+        Record index range [start, stop) with t0 <= timestamp < t1.
+
+        Args:
+            t0 (float, optional): Start time (default: first record)
+            t1 (float, optional): End time, exclusive (default: after the last record)
+
+        Returns:
+            tuple: (start, stop) record indices
+        """
+        start = 0 if t0 is None else int(np.searchsorted(self.timestamps, t0, side='left'))
+        stop = len(self) if t1 is None else int(np.searchsorted(self.timestamps, t1, side='left'))
+        return start, max(start, stop)
+
+    def time_range(self, t0=None, t1=None):
+        """
+        Records with t0 <= timestamp < t1, as a zero-copy view of the map.
+
+        Args:
+            t0 (float, optional): Start time
+            t1 (float, optional): End time, exclusive
+
+        Returns:
+            np.ndarray: RECORD_DTYPE view
+        """
+        start, stop = self.index_range(t0, t1)
+        return self.records[start:stop]
+
+    def control_steps(self, t0=None, t1=None):
+        """
+        Records on which a control step ran, in a time range.
+
+        Args:
+            t0 (float, optional): Start time
+            t1 (float, optional): End time, exclusive
+
+        Returns:
+            np.ndarray: RECORD_DTYPE copy of the control-step records
+        """
+        records = self.time_range(t0, t1)
+        return records[records['control_step']]
+
+    def close(self):
+        """
+        Drop the reader's references to the memory map.
+
+        The map itself is released once the last view returned by
+        time_range() or taken from records is gone, so those views stay
+        valid after the reader is closed.
+        """
+        self.records = self.timestamps = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """
+    Main function demonstrating the drive log (the checks live in
+    tests/test_drive_log.py).
+    """
+    import tempfile
+    import time
+    import tracemalloc
+    from ..control.differential_controller import DifferentialController
+    from .replay import SimulatedClock
+    from .trajectory_simulator import TrajectorySimulator, to_samples
+
+    print("Drive Log demo...")
+
+    samples = to_samples(TrajectorySimulator(seed=3, sample_rate=1000.0).run(30.0))
+    clock = SimulatedClock()
+    controller = DifferentialController(clock=clock)
+    controller.sensor_processor.clock = clock
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'drive.tvt')
+
+        # Log a 1 kHz drive with a 10 Hz controller, as on the device
+        with DriveLogWriter(path, metadata={'sample_rate': 1000}) as writer:
+            for timestamp, accel, gyro, _ in samples:
+                clock.set(timestamp)
+                controller.ingest_sensor_data(accel, gyro, timestamp)
+                output = None
+                if (controller.last_control_time is None
+                        or clock() - controller.last_control_time >= controller.control_interval):
+                    output = controller.step_control()
+                features = controller.sensor_processor.get_feature_vector()
+                writer.record(timestamp, accel, gyro, features, output)
+
+        with DriveLogReader(path) as reader:
+            steps = reader.control_steps()
+            print(f"  {len(reader)} records of {RECORD_DTYPE.itemsize} bytes, {len(steps)} control steps, "
+                  f"control active in {steps['control_active'].mean():.1%}, metadata {reader.metadata}")
+
+            window = reader.time_range(10.0, 10.5)
+            print(f"  time_range(10.0, 10.5): {len(window)} records, "
+                  f"zero-copy view: {np.shares_memory(window, reader.records)}")
+
+        # Torn last record after a power loss, then append
+        with open(path, 'ab') as f:
+            f.write(b'\x00' * 17)
+        with DriveLogWriter(path) as writer:
+            writer.record_batch(np.zeros(10, dtype=RECORD_DTYPE))
+        with DriveLogReader(path) as reader:
+            appended = len(reader) - len(samples)
+        print(f"  reopened after a torn write: partial record dropped, {appended} records appended")
+
+        # Per-sample append cost and allocations
+        accel, gyro, features = (0.1, 0.2, 9.8), (0.0, 0.0, 0.1), np.zeros(NUM_FEATURES)
+        count = 200000
+        with DriveLogWriter(os.path.join(directory, 'bench.tvt')) as writer:
+            tracemalloc.start()
+            start = time.perf_counter()
+            for i in range(count):
+                writer.record(i * 0.001, accel, gyro, features)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        print(f"  record(): {elapsed / count * 1e6:.2f} us/sample ({count / elapsed:,.0f} samples/s), "
+              f"peak allocation {peak} bytes")
+
+    print("Drive log demo completed.")
+
+
+if __name__ == "__main__":
+    main()
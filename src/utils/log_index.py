@@ -0,0 +1,350 @@
+"""
+Troll-vs-Troll Project
+Drive Log Index Module
+
+This module keeps a sparse block index over drive logs. Every block of
+block_size records gets one index row with its record range, first and
+last timestamp, maximum and mean risk score and control counts. Queries
+use the index to pick the blocks that can match, and read only those
+from the memory-mapped log:
+
+- time_range(t0, t1) finds the records between two times by searching
+  the per-block times, then one block at each end;
+- risk_windows(threshold) reads only blocks whose maximum risk exceeds
+  the threshold and returns the contiguous windows above it.
+
+The index is stored next to the log (<log>.idx.npz). Reopening it
+indexes only the records appended since it was saved.
+
+Version: 1.0.1
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：行驶日志稀疏块索引 - 成功
+# - v1.0.1 2026-10-17: 自检迁移至tests/test_log_index.py - 成功
+
+import os
+
+import numpy as np
+
+from .drive_log import RECORD_DTYPE
+
+
+DEFAULT_BLOCK_SIZE = 4096
+
+# One row per block of records
+BLOCK_DTYPE = np.dtype([
+    ('start', np.int64),
+    ('stop', np.int64),
+    ('t_min', np.float64),
+    ('t_max', np.float64),
+    ('risk_max', np.float32),
+    ('risk_mean', np.float32),
+    ('control_steps', np.int32),
+    ('control_active', np.int32),
+])
+
+# One row per contiguous window of records above a risk threshold
+WINDOW_DTYPE = np.dtype([
+    ('start', np.int64),
+    ('stop', np.int64),
+    ('t_start', np.float64),
+    ('t_end', np.float64),
+    ('risk_max', np.float32),
+])
+
+
+def summarize_blocks(records, first, block_size):
+    """
+    Compute index rows for consecutive blocks of records.
+
+    Args:
+        records (np.ndarray): RECORD_DTYPE records starting at a block boundary
+        first (int): Record index of records[0] in the log
+        block_size (int): Records per block
+
+    Returns:
+        np.ndarray: BLOCK_DTYPE rows, the last one possibly for a partial block
+    """
+    count = len(records)
+    offsets = np.arange(0, count, block_size)
+    blocks = np.empty(len(offsets), dtype=BLOCK_DTYPE)
+    if not count:
+        return blocks
+
+    timestamps = records['timestamp']
+    risk = records['risk_score']
+    scored = np.isfinite(risk)
+    blocks['start'] = first + offsets
+    blocks['stop'] = first + np.minimum(offsets + block_size, count)
+    blocks['t_min'] = np.fmin.reduceat(timestamps, offsets)
+    blocks['t_max'] = np.fmax.reduceat(timestamps, offsets)
+    # NaN (no assessment yet) for blocks without any risk score
+    blocks['risk_max'] = np.fmax.reduceat(risk, offsets)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        blocks['risk_mean'] = (np.add.reduceat(np.where(scored, risk, 0.0), offsets)
+                               / np.add.reduceat(scored, offsets))
+    blocks['control_steps'] = np.add.reduceat(records['control_step'], offsets)
+    blocks['control_active'] = np.add.reduceat(records['control_active'], offsets)
+    return blocks
+
+
+def find_runs(mask):
+    """
+    Start and stop indices of the runs of True values in a mask.
+
+    Args:
+        mask (np.ndarray): Boolean array
+
+    Returns:
+        tuple: (starts, stops) index arrays, stops exclusive
+    """
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def scan_risk_windows(records, threshold, first=0):
+    """
+    Windows of consecutive records with risk_score > threshold (full scan).
+
+    Args:
+        records (np.ndarray): RECORD_DTYPE records
+        threshold (float): Risk score threshold
+        first (int): Record index of records[0] in the log
+
+    Returns:
+        np.ndarray: WINDOW_DTYPE rows
+    """
+    risk = records['risk_score']
+    starts, stops = find_runs(risk > threshold)
+    windows = np.empty(len(starts), dtype=WINDOW_DTYPE)
+    windows['start'] = first + starts
+    windows['stop'] = first + stops
+    windows['t_start'] = records['timestamp'][starts]
+    windows['t_end'] = records['timestamp'][stops - 1]
+    if len(starts):
+        # Each segment runs up to the next window; the gap is below the threshold
+        windows['risk_max'] = np.fmax.reduceat(risk, starts)
+    return windows
+
+
+class DriveLogIndex:
+    """
+    Sparse per-block index over a memory-mapped drive log.
+    """
+
+    def __init__(self, reader, block_size=DEFAULT_BLOCK_SIZE, chunk_blocks=256):
+        """
+        Initialize an empty index for a log.
+
+        Args:
+            reader (DriveLogReader): Open drive log
+            block_size (int): Records per index block
+            chunk_blocks (int): Blocks read per step while building
+        """
+        self.reader = reader
+        self.block_size = block_size
+        self.chunk_blocks = chunk_blocks
+        self.blocks = np.zeros(0, dtype=BLOCK_DTYPE)
+
+        # Records read by queries, to show what the index saves
+        self.records_read = 0
+
+        print("DriveLogIndex initialized")
+
+    @staticmethod
+    def index_path(log_path):
+        """
+        Sidecar file of the index of a log.
+        """
+        return log_path + '.idx.npz'
+
+    @classmethod
+    def open(cls, reader, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Load the saved index of a log, index new records and save it again.
+
+        Args:
+            reader (DriveLogReader): Open drive log
+            block_size (int): Records per index block for a new index
+
+        Returns:
+            DriveLogIndex: Up-to-date index
+        """
+        path = cls.index_path(reader.path)
+        index = None
+        if os.path.exists(path):
+            with np.load(path) as saved:
+                index = cls(reader, int(saved['block_size']))
+                index.blocks = saved['blocks']
+            # A log can only grow; a shorter one was rewritten
+            if len(index.blocks) and index.blocks['stop'][-1] > len(reader):
+                index.blocks = index.blocks[:0]
+        if index is None:
+            index = cls(reader, block_size)
+        if index.update():
+            index.save()
+        return index
+
+    def update(self):
+        """
+        Index the records added since the last update.
+
+        Returns:
+            int: Number of records indexed
+        """
+        indexed = int(self.blocks['stop'][-1]) if len(self.blocks) else 0
+        if indexed == len(self.reader):
+            return 0
+
+        # Recompute a partial last block together with the new records
+        keep = len(self.blocks)
+        if keep and self.blocks['stop'][-1] - self.blocks['start'][-1] < self.block_size:
+            keep -= 1
+        first = keep * self.block_size
+        records = self.reader.records
+        new_blocks = [self.blocks[:keep]]
+        step = self.block_size * self.chunk_blocks
+        for start in range(first, len(records), step):
+            new_blocks.append(summarize_blocks(records[start:start + step], start, self.block_size))
+        self.blocks = np.concatenate(new_blocks)
+        return len(records) - indexed
+
+    def save(self, path=None):
+        """
+        Save the index next to the log.
+
+        Args:
+            path (str, optional): Index file (default: index_path(log path))
+        """
+        path = path or self.index_path(self.reader.path)
+        with open(path, 'wb') as f:
+            np.savez(f, blocks=self.blocks, block_size=self.block_size)
+
+    def index_range(self, t0=None, t1=None):
+        """
+        Record index range [start, stop) with t0 <= timestamp < t1.
+
+        Args:
+            t0 (float, optional): Start time
+            t1 (float, optional): End time, exclusive
+
+        Returns:
+            tuple: (start, stop) record indices
+        """
+        blocks = self.blocks
+        timestamps = self.reader.timestamps
+        start, stop = 0, len(self.reader)
+
+        if t0 is not None:
+            # First block that reaches t0, then search inside it
+            block = int(np.searchsorted(blocks['t_max'], t0, side='left'))
+            if block == len(blocks):
+                return stop, stop
+            lo, hi = blocks['start'][block], blocks['stop'][block]
+            start = lo + int(np.searchsorted(timestamps[lo:hi], t0, side='left'))
+            self.records_read += hi - lo
+        if t1 is not None:
+            # First block that reaches t1
+            block = int(np.searchsorted(blocks['t_max'], t1, side='left'))
+            if block < len(blocks):
+                lo, hi = blocks['start'][block], blocks['stop'][block]
+                stop = lo + int(np.searchsorted(timestamps[lo:hi], t1, side='left'))
+                self.records_read += hi - lo
+        return start, max(start, stop)
+
+    def time_range(self, t0=None, t1=None):
+        """
+        Records with t0 <= timestamp < t1, as a zero-copy view of the log.
+
+        Args:
+            t0 (float, optional): Start time
+            t1 (float, optional): End time, exclusive
+
+        Returns:
+            np.ndarray: RECORD_DTYPE view
+        """
+        start, stop = self.index_range(t0, t1)
+        return self.reader.records[start:stop]
+
+    def risk_windows(self, threshold, t0=None, t1=None):
+        """
+        Windows of consecutive records with risk_score > threshold, reading
+        only the blocks whose maximum risk exceeds the threshold.
+
+        Args:
+            threshold (float): Risk score threshold
+            t0 (float, optional): Start time
+            t1 (float, optional): End time, exclusive
+
+        Returns:
+            np.ndarray: WINDOW_DTYPE rows in time order
+        """
+        start, stop = self.index_range(t0, t1)
+        blocks = self.blocks
+        candidates = ((blocks['risk_max'] > threshold)
+                      & (blocks['stop'] > start) & (blocks['start'] < stop))
+
+        # Adjacent candidate blocks are read together so windows that cross
+        # a block boundary come out whole
+        windows = []
+        records = self.reader.records
+        for first, last in zip(*find_runs(candidates)):
+            lo = max(start, int(blocks['start'][first]))
+            hi = min(stop, int(blocks['stop'][last - 1]))
+            windows.append(scan_risk_windows(records[lo:hi], threshold, lo))
+            self.records_read += hi - lo
+        if not windows:
+            return np.zeros(0, dtype=WINDOW_DTYPE)
+        return np.concatenate(windows)
+
+
+def main():
+    """
+    Main function demonstrating the drive log index (the checks live in
+    tests/test_log_index.py).
+    """
+    import tempfile
+    from .drive_log import DriveLogReader, DriveLogWriter
+
+    print("Drive Log Index demo...")
+
+    rng = np.random.default_rng(5)
+    count = 1000000
+    records = np.zeros(count, dtype=RECORD_DTYPE)
+    records['timestamp'] = np.arange(count) * 0.001
+    records['risk_score'] = np.clip(rng.normal(0.2, 0.05, count), 0.0, 1.0)
+    records['risk_score'][:150] = np.nan  # before the first assessment
+    for event in rng.choice(count - 3000, size=12, replace=False):
+        records['risk_score'][event:event + 2000] = np.linspace(0.5, 0.95, 2000)
+    records['control_active'] = records['risk_score'] > 0.3
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'drive.tvt')
+        with DriveLogWriter(path) as writer:
+            writer.record_batch(records[:700000])
+
+        with DriveLogReader(path) as reader:
+            index = DriveLogIndex.open(reader)
+
+        # Append, reopen: only the new records are indexed
+        with DriveLogWriter(path) as writer:
+            writer.record_batch(records[700000:])
+        with DriveLogReader(path) as reader:
+            index = DriveLogIndex.open(reader)
+
+            index.records_read = 0
+            windows = index.risk_windows(0.8)
+            expected = scan_risk_windows(reader.records, 0.8)
+            print(f"  {len(index.blocks)} blocks of {index.block_size} records; risk_score > 0.8: "
+                  f"{len(windows)} windows, {index.records_read} of {len(reader)} records read, "
+                  f"same as full scan: {windows.tobytes() == expected.tobytes()}")
+
+            window = index.risk_windows(0.8, 300.0, 600.0)
+            print(f"  between 300 s and 600 s: {len(window)} windows")
+
+    print("Drive log index demo completed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+Troll-vs-Troll Project
+Parameter Sweep Module
+
+This module grid-searches the control parameters (control_threshold,
+max_wheel_diff and the predictor's rollover_angle_threshold) on
+labelled, time-ordered IMU runs. A chunk of configs is evaluated as one
+FleetController whose carriers are (config, run) pairs, with the
+thresholds set per carrier. Chunks of configs are spread over a process
+pool. The input arrays are placed in shared memory once, and the
+workers map them without copying.
+
+The processor's window_size is not swept: the served risk score uses
+only the tilt angles (and, with a look-ahead horizon, the gyro rates),
+never the window statistics, so configs that differ only in window size
+score the same. It is a fixed setting of the sweep instead.
+
+Each config is scored on:
+- detection latency: time from the onset of a rollover_imminent
+  segment to the first control step with control active (and the share
+  of segments missed entirely);
+- false-positive rate: share of control steps on normal and turning
+  samples with control active;
+- wheel smoothness: mean absolute change of the two wheel commands
+  between consecutive control steps (lower is smoother).
+
+Version: 1.0.1
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：控制参数网格搜索，进程池+共享内存 - 成功
+# - v1.0.1 2026-10-17: window_size不再作为扫描参数（风险评分不使用窗口统计），改为固定设置；自检迁移至tests/test_parameter_sweep.py - 成功
+
+import itertools
+import os
+
+import numpy as np
+
+from .data_generator import SCENARIOS
+from .log_index import find_runs
+from .replay import SimulatedClock
+
+
+PARAMETER_NAMES = ('control_threshold', 'max_wheel_diff', 'rollover_angle_threshold')
+
+# Label codes scored as negatives and as events
+NEGATIVE_LABELS = (SCENARIOS.index('normal'), SCENARIOS.index('turning'))
+EVENT_LABEL = SCENARIOS.index('rollover_imminent')
+
+# One row per config
+RESULT_DTYPE = np.dtype([
+    ('control_threshold', np.float64),
+    ('max_wheel_diff', np.float64),
+    ('rollover_angle_threshold', np.float64),
+    ('events', np.int32),
+    ('missed_rate', np.float64),
+    ('detection_latency', np.float64),
+    ('false_positive_rate', np.float64),
+    ('wheel_smoothness', np.float64),
+])
+
+
+def parameter_grid(**values):
+    """
+    All combinations of the given parameter values.
+
+    Args:
+        **values: Sequence of values per name in PARAMETER_NAMES; missing
+            names use the controller defaults
+
+    Returns:
+        list: Config dicts
+    """
+    defaults = {'control_threshold': (0.3,), 'max_wheel_diff': (0.3,),
+                'rollover_angle_threshold': (15.0,)}
+    unknown = set(values) - set(PARAMETER_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    defaults.update(values)
+    columns = [defaults[name] for name in PARAMETER_NAMES]
+    return [dict(zip(PARAMETER_NAMES, combo)) for combo in itertools.product(*columns)]
+
+
+def simulate_runs(num_runs=8, duration=300.0, sample_rate=100.0, seed=0):
+    """
+    Labelled runs from the trajectory simulator.
+
+    Samples after a carrier has tipped over get label -1 and are not scored.
+
+    Args:
+        num_runs (int): Carriers simulated
+        duration (float): Run length in seconds
+        sample_rate (float): Sample rate in Hz
+        seed (int): Random seed
+
+    Returns:
+        dict: 'accel', 'gyro' (T, R, 3), 'label' (T, R) and 'timestamp' (T,)
+    """
+    from .trajectory_simulator import TrajectorySimulator
+
+    result = TrajectorySimulator(num_vehicles=num_runs, sample_rate=sample_rate, seed=seed).run(duration)
+    label = result['label'].copy()
+    label[result['tipped']] = -1
+    return {'accel': result['accel'], 'gyro': result['gyro'], 'label': label,
+            'timestamp': result['timestamp']}
+
+
+def share_arrays(arrays):
+    """
+    Copy arrays into one shared memory block.
+
+    Args:
+        arrays (dict): Arrays by name
+
+    Returns:
+        tuple: (SharedMemory, spec) where spec lets attach_arrays() map them
+    """
+    from multiprocessing import shared_memory
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = (array.shape, array.dtype.str, offset)
+        offset += -(-array.nbytes // 64) * 64
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for name, array in arrays.items():
+        shape, dtype, start = layout[name]
+        np.ndarray(shape, dtype, buffer=shm.buf, offset=start)[...] = array
+    return shm, (shm.name, layout)
+
+
+def attach_arrays(spec):
+    """
+    Map arrays placed in shared memory by share_arrays() (no copy).
+
+    Args:
+        spec (tuple): Spec returned by share_arrays()
+
+    Returns:
+        tuple: (SharedMemory, dict of read-only array views)
+    """
+    from multiprocessing import shared_memory
+
+    name, layout = spec
+    shm = shared_memory.SharedMemory(name=name)
+    arrays = {}
+    for key, (shape, dtype, start) in layout.items():
+        view = np.ndarray(shape, dtype, buffer=shm.buf, offset=start)
+        view.flags.writeable = False
+        arrays[key] = view
+    return shm, arrays
+
+
+def evaluate_configs(data, configs, control_interval=0.1, window_size=10):
+    """
+    Replay all runs through one FleetController and score every config.
+
+    Args:
+        data (dict): Runs as returned by simulate_runs()
+        configs (list): Config dicts
+        control_interval (float): Control update interval in seconds
+        window_size (int): Sensor processor window size
+
+    Returns:
+        np.ndarray: RESULT_DTYPE rows in config order
+    """
+    from ..control.fleet_controller import FleetController
+
+    accel, gyro, label, timestamps = data['accel'], data['gyro'], data['label'], data['timestamp']
+    num_runs = accel.shape[1]
+    num_configs = len(configs)
+
+    # Carrier c * num_runs + r replays run r with config c
+    clock = SimulatedClock()
+    fleet = FleetController(num_configs * num_runs, window_size=window_size, clock=clock)
+    per_carrier = {name: np.repeat([config[name] for config in configs], num_runs)
+                   for name in PARAMETER_NAMES}
+    fleet.control_threshold = per_carrier['control_threshold']
+    fleet.max_wheel_diff = per_carrier['max_wheel_diff']
+    fleet.rollover_predictor.rollover_angle_threshold = per_carrier['rollover_angle_threshold']
+
+    steps, active, left, right = [], [], [], []
+    for i, timestamp in enumerate(timestamps):
+        clock.set(timestamp)
+        fleet.ingest_sensor_data(np.tile(accel[i], (num_configs, 1)), np.tile(gyro[i], (num_configs, 1)))
+        if fleet.last_control_time is None or clock() - fleet.last_control_time >= control_interval:
+            output = fleet.step_control()
+            steps.append(i)
+            active.append(output['control_active'].copy())
+            left.append(output['left_wheel_speed'].copy())
+            right.append(output['right_wheel_speed'].copy())
+
+    steps = np.array(steps)
+    shape = (len(steps), num_configs, num_runs)
+    active = np.array(active).reshape(shape)
+    left = np.array(left).reshape(shape)
+    right = np.array(right).reshape(shape)
+    step_label = label[steps]  # (S, R)
+
+    results = np.zeros(num_configs, dtype=RESULT_DTYPE)
+    for name in PARAMETER_NAMES:
+        results[name] = [config[name] for config in configs]
+
+    # False positives on benign samples, pooled over runs
+    negative = np.isin(step_label, NEGATIVE_LABELS)
+    with np.errstate(invalid='ignore'):
+        results['false_positive_rate'] = (active & negative[:, None, :]).sum(axis=(0, 2)) / negative.sum()
+
+    # Wheel command changes between consecutive control steps
+    if len(steps) > 1:
+        change = np.abs(np.diff(left, axis=0)) + np.abs(np.diff(right, axis=0))
+        results['wheel_smoothness'] = change.mean(axis=(0, 2))
+
+    # Latency from each rollover_imminent onset to the first active step
+    latencies = [[] for _ in range(num_configs)]
+    missed = np.zeros(num_configs, dtype=np.int64)
+    events = 0
+    for run in range(num_runs):
+        for start, stop in zip(*find_runs(label[:, run] == EVENT_LABEL)):
+            first, last = np.searchsorted(steps, (start, stop))
+            events += 1
+            hits = active[first:last, :, run]
+            detected = hits.any(axis=0)
+            missed += ~detected
+            first_hit = np.argmax(hits, axis=0) if last > first else np.zeros(num_configs, dtype=np.int64)
+            for config in np.flatnonzero(detected):
+                latencies[config].append(timestamps[steps[first + first_hit[config]]] - timestamps[start])
+    results['events'] = events
+    results['missed_rate'] = missed / events if events else np.nan
+    results['detection_latency'] = [np.mean(values) if values else np.nan for values in latencies]
+    return results
+
+
+# Shared inputs of a sweep worker process
+_worker_data = None
+
+
+def _attach_worker(spec):
+    """
+    Pool initializer: map the shared input arrays once per worker.
+    """
+    global _worker_data
+    _worker_data = attach_arrays(spec)
+
+
+def _evaluate_shared(configs, control_interval, window_size):
+    """
+    Pool task: evaluate configs on the worker's shared input arrays.
+    """
+    return evaluate_configs(_worker_data[1], configs, control_interval, window_size)
+
+
+class ParameterSweep:
+    """
+    Grid search of control parameters over labelled runs.
+    """
+
+    def __init__(self, data, control_interval=0.1, workers=None, chunk_configs=16, window_size=10):
+        """
+        Initialize the sweep.
+
+        Args:
+            data (dict): Runs as returned by simulate_runs() ('accel', 'gyro'
+                (T, R, 3), 'label' (T, R), 'timestamp' (T,))
+            control_interval (float): Control update interval in seconds
+            workers (int, optional): Worker processes (default: os.cpu_count());
+                1 evaluates in this process
+            chunk_configs (int): Configs per pool task
+            window_size (int): Sensor processor window size of every config
+        """
+        self.data = {name: np.ascontiguousarray(data[name]) for name in ('accel', 'gyro', 'label', 'timestamp')}
+        self.control_interval = control_interval
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_configs = chunk_configs
+        self.window_size = window_size
+
+        print("ParameterSweep initialized")
+
+    def _tasks(self, configs):
+        """
+        Split configs into chunks of chunk_configs.
+
+        Returns:
+            list: (config indices, configs) per task
+        """
+        tasks = []
+        for start in range(0, len(configs), self.chunk_configs):
+            chunk = list(range(start, min(start + self.chunk_configs, len(configs))))
+            tasks.append((chunk, configs[start:start + self.chunk_configs]))
+        return tasks
+
+    def run(self, configs):
+        """
+        Evaluate every config.
+
+        Args:
+            configs (list): Config dicts, e.g. from parameter_grid()
+
+        Returns:
+            np.ndarray: RESULT_DTYPE rows in config order
+        """
+        results = np.zeros(len(configs), dtype=RESULT_DTYPE)
+        tasks = self._tasks(configs)
+
+        if self.workers == 1 or len(tasks) < 2:
+            for indices, chunk in tasks:
+                results[indices] = evaluate_configs(self.data, chunk, self.control_interval,
+                                                    self.window_size)
+            return results
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        shm, spec = share_arrays(self.data)
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_attach_worker,
+                                     initargs=(spec,)) as executor:
+                futures = [(indices, executor.submit(_evaluate_shared, chunk, self.control_interval,
+                                                        self.window_size))
+                           for indices, chunk in tasks]
+                for indices, future in futures:
+                    results[indices] = future.result()
+        finally:
+            shm.close()
+            shm.unlink()
+        return results
+
+
+def main():
+    """
+    Main function demonstrating the parameter sweep (the checks live in
+    tests/test_parameter_sweep.py).
+    """
+    import time
+
+    print("Parameter Sweep demo...")
+
+    data = simulate_runs(num_runs=6, duration=120.0, seed=2)
+    configs = parameter_grid(control_threshold=(0.3, 0.5, 0.7), max_wheel_diff=(0.2, 0.4),
+                             rollover_angle_threshold=(10.0, 15.0, 20.0))
+
+    serial = ParameterSweep(data, workers=1)
+    start = time.perf_counter()
+    expected = serial.run(configs)
+    serial_time = time.perf_counter() - start
+
+    parallel = ParameterSweep(data, workers=2, chunk_configs=6)
+    start = time.perf_counter()
+    results = parallel.run(configs)
+    parallel_time = time.perf_counter() - start
+
+    print(f"  {len(configs)} configs x {data['accel'].shape[1]} runs x {len(data['timestamp'])} samples: "
+          f"serial {serial_time:.2f} s, 2 workers {parallel_time:.2f} s "
+          f"(identical results: {results.tobytes() == expected.tobytes()})")
+    print(f"  {expected['events'][0]} rollover_imminent events")
+    order = np.lexsort((results['detection_latency'], results['false_positive_rate']))
+    print("  threshold  max_diff  angle   missed  latency      FPR  smoothness")
+    for row in results[order[:8]]:
+        print(f"  {row['control_threshold']:9.1f}  {row['max_wheel_diff']:8.1f}  "
+              f"{row['rollover_angle_threshold']:5.0f}  {row['missed_rate']:7.1%}  "
+              f"{row['detection_latency']:6.2f} s  {row['false_positive_rate']:7.1%}  {row['wheel_smoothness']:10.4f}")
+    print("Parameter sweep demo completed.")
+
+
+if __name__ == "__main__":
+    main()
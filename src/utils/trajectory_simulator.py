@@ -0,0 +1,455 @@
+"""
+Troll-vs-Troll Project
+Trajectory Simulator Module
+
+This module simulates pull-handle carriers as rigid bodies on two wheels
+and produces temporally correlated IMU traces. A driver model moves each
+carrier through the movement scenarios (normal, turning, risky,
+rollover_imminent) with Markov transitions and smooth speed/steering
+commands. The turn gives a lateral acceleration v^2/R, which leans the
+body through a compliant roll and lifts the inner wheel once it exceeds
+the static stability limit (SSF * g). A carrier that rolls past its
+tipping angle falls over. The IMU model adds white noise and random-walk
+bias drift.
+
+All carriers are simulated at once with NumPy arrays (one Python step
+per tick), so large fleets and long drives are cheap to generate.
+
+Axis conventions match SensorDataProcessor: x forward, y left, z up,
+the accelerometer reads +g on z at rest and roll = atan2(ay, az). A left
+turn (positive curvature) gives positive lateral acceleration and rolls
+the body outward, to positive roll.
+
+Version: 1.1.1
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：向量化手推车动力学与轨迹模拟器 - 成功
+# - v1.1.0 2026-10-17: step()新增curvature_offset - 成功
+# - v1.1.1 2026-10-17: 自检迁移至tests/test_trajectory_simulator.py - 成功
+
+import math
+
+import numpy as np
+
+from .data_generator import SCENARIOS, SCENARIO_DISTRIBUTION
+
+
+GRAVITY = 9.81  # m/s^2
+
+# Driver behaviour per scenario, in SCENARIOS order:
+# (target speed m/s, turn curvature 1/m, turn direction flips per second,
+#  mean scenario duration s)
+SCENARIO_PROFILES = np.array([
+    [1.2, 0.0, 0.0, 10.0],
+    [1.4, 0.5, 0.15, 6.0],
+    [2.2, 0.8, 0.4, 4.0],
+    [2.8, 0.9, 0.3, 2.0],
+])
+
+
+class TrolleyParams:
+    """
+    Geometry and mass properties of a pull-handle carrier.
+    """
+
+    def __init__(self, track_width=0.36, cog_height=0.40, mass=18.0,
+                 roll_compliance=0.04, roll_time_constant=0.15, lift_damping=2.0):
+        """
+        Initialize the carrier parameters.
+
+        Args:
+            track_width (float): Distance between the wheel contact points in m
+            cog_height (float): Centre of gravity height above ground in m
+            mass (float): Loaded mass in kg
+            roll_compliance (float): Body roll in rad per g of lateral
+                acceleration while both wheels are on the ground
+            roll_time_constant (float): Time constant of the compliant roll in s
+            lift_damping (float): Roll damping during wheel lift in N*m*s/rad
+        """
+        self.track_width = track_width
+        self.cog_height = cog_height
+        self.mass = mass
+        self.roll_compliance = roll_compliance
+        self.roll_time_constant = roll_time_constant
+        self.lift_damping = lift_damping
+
+    @property
+    def static_stability_factor(self):
+        """
+        Static stability factor SSF = track width / (2 * CoG height).
+        """
+        return self.track_width / (2.0 * self.cog_height)
+
+    @property
+    def lift_acceleration(self):
+        """
+        Lateral acceleration in m/s^2 at which the inner wheel lifts.
+        """
+        return self.static_stability_factor * GRAVITY
+
+    @property
+    def tip_angle(self):
+        """
+        Lift angle in rad at which the CoG passes over the outer wheel.
+        """
+        return math.atan2(self.track_width / 2.0, self.cog_height)
+
+    @property
+    def roll_inertia(self):
+        """
+        Roll moment of inertia about a wheel contact line (uniform box).
+        """
+        half_track = self.track_width / 2.0
+        return 4.0 / 3.0 * self.mass * (half_track**2 + self.cog_height**2)
+
+
+class TrolleyDynamics:
+    """
+    Roll dynamics of N carriers driven with given speeds and curvatures.
+
+    While both wheels touch the ground the body leans with a first-order
+    compliant roll. Above the lift acceleration the carrier pivots on the
+    outer wheel: I * theta'' = m * (a_out * (b sin + h cos) - g * (b cos - h sin))
+    - c * theta', with b the half track and h the CoG height. At the tip
+    angle the carrier falls over and stops.
+    """
+
+    def __init__(self, num_vehicles=1, params=None):
+        """
+        Initialize the dynamics of a fleet at rest.
+
+        Args:
+            num_vehicles (int): Number of carriers
+            params (TrolleyParams, optional): Carrier properties shared by the fleet
+        """
+        self.num_vehicles = num_vehicles
+        self.params = params or TrolleyParams()
+
+        self.speed = np.zeros(num_vehicles)
+        self.yaw_rate = np.zeros(num_vehicles)
+        self.lateral_accel = np.zeros(num_vehicles)
+        self.compliant_roll = np.zeros(num_vehicles)
+        self.lift_angle = np.zeros(num_vehicles)
+        self.lift_rate = np.zeros(num_vehicles)
+        self.lift_side = np.ones(num_vehicles)
+        self.roll = np.zeros(num_vehicles)
+        self.tipped = np.zeros(num_vehicles, dtype=bool)
+
+    def step(self, dt, speed, curvature):
+        """
+        Advance the fleet by one time step.
+
+        Args:
+            dt (float): Time step in s
+            speed (np.ndarray): Forward speed per carrier in m/s
+            curvature (np.ndarray): Path curvature per carrier in 1/m (positive = left)
+
+        Returns:
+            tuple: (accel, gyro) noise-free IMU readings, shape (N, 3) each,
+                in m/s^2 and rad/s
+        """
+        p = self.params
+        half_track = p.track_width / 2.0
+        height = p.cog_height
+
+        # Fallen carriers stop
+        speed = np.where(self.tipped, 0.0, speed)
+        long_accel = (speed - self.speed) / dt
+        self.speed = speed
+        self.yaw_rate = speed * curvature
+        self.lateral_accel = speed * self.yaw_rate
+
+        # Compliant roll towards its steady state (exact first-order step)
+        alpha = 1.0 - math.exp(-dt / p.roll_time_constant)
+        target = p.roll_compliance * self.lateral_accel / GRAVITY
+        self.compliant_roll += alpha * (target - self.compliant_roll)
+
+        # Wheel lift about the outer wheel (semi-implicit Euler)
+        lifted = self.lift_angle > 0.0
+        side = np.where(lifted, self.lift_side, np.where(self.lateral_accel >= 0.0, 1.0, -1.0))
+        outward_accel = side * self.lateral_accel
+        theta = self.lift_angle
+        sin_theta, cos_theta = np.sin(theta), np.cos(theta)
+        moment = (
+            p.mass * (outward_accel * (half_track * sin_theta + height * cos_theta)
+                      - GRAVITY * (half_track * cos_theta - height * sin_theta))
+            - p.lift_damping * self.lift_rate
+        )
+        self.lift_rate = self.lift_rate + moment / p.roll_inertia * dt
+        self.lift_angle = theta + self.lift_rate * dt
+
+        # Back on both wheels, or lying on its side
+        landed = self.lift_angle <= 0.0
+        self.lift_angle[landed] = 0.0
+        self.lift_rate[landed] = 0.0
+        flat = self.lift_angle >= math.pi / 2
+        self.lift_angle[flat] = math.pi / 2
+        self.lift_rate[flat] = 0.0
+        self.lift_side = side
+        self.tipped |= self.lift_angle >= p.tip_angle
+
+        previous_roll = self.roll
+        self.roll = self.compliant_roll + side * self.lift_angle
+        roll_rate = (self.roll - previous_roll) / dt
+
+        # Specific force and body rates in the rolled body frame
+        sin_roll, cos_roll = np.sin(self.roll), np.cos(self.roll)
+        accel = np.empty((self.num_vehicles, 3))
+        accel[:, 0] = long_accel
+        accel[:, 1] = self.lateral_accel * cos_roll + GRAVITY * sin_roll
+        accel[:, 2] = GRAVITY * cos_roll - self.lateral_accel * sin_roll
+        gyro = np.empty((self.num_vehicles, 3))
+        gyro[:, 0] = roll_rate
+        gyro[:, 1] = self.yaw_rate * sin_roll
+        gyro[:, 2] = self.yaw_rate * cos_roll
+        return accel, gyro
+
+    @property
+    def load_transfer_ratio(self):
+        """
+        Lateral load transfer ratio, 1 when the inner wheel starts to lift.
+        """
+        return self.lateral_accel / self.params.lift_acceleration
+
+
+class ImuSensorModel:
+    """
+    Accelerometer/gyroscope errors: white noise plus random-walk bias drift.
+    """
+
+    def __init__(self, num_vehicles, rng, accel_noise=(0.05, 0.05, 0.02), gyro_noise=0.005,
+                 accel_bias=0.05, gyro_bias=0.002, accel_bias_walk=0.002, gyro_bias_walk=0.0005):
+        """
+        Initialize the sensor errors.
+
+        Args:
+            num_vehicles (int): Number of carriers
+            rng (np.random.Generator): Random generator
+            accel_noise (tuple): Accelerometer white noise sigma per axis in m/s^2
+            gyro_noise (float): Gyroscope white noise sigma in rad/s
+            accel_bias (float): Initial accelerometer bias sigma in m/s^2
+            gyro_bias (float): Initial gyroscope bias sigma in rad/s
+            accel_bias_walk (float): Accelerometer bias drift in m/s^2 per sqrt(s)
+            gyro_bias_walk (float): Gyroscope bias drift in rad/s per sqrt(s)
+        """
+        self.rng = rng
+        self.accel_noise = np.asarray(accel_noise, dtype=np.float64)
+        self.gyro_noise = gyro_noise
+        self.accel_bias_walk = accel_bias_walk
+        self.gyro_bias_walk = gyro_bias_walk
+        self.accel_bias = rng.normal(0.0, accel_bias, size=(num_vehicles, 3))
+        self.gyro_bias = rng.normal(0.0, gyro_bias, size=(num_vehicles, 3))
+
+    def measure(self, dt, accel, gyro):
+        """
+        Add sensor errors to true IMU values (in place) and drift the biases.
+
+        Args:
+            dt (float): Time step in s
+            accel (np.ndarray): True specific force, shape (N, 3)
+            gyro (np.ndarray): True angular rate, shape (N, 3)
+
+        Returns:
+            tuple: (accel, gyro) measured values
+        """
+        noise = self.rng.normal(size=(4,) + accel.shape)
+        walk = math.sqrt(dt)
+        self.accel_bias += noise[0] * (self.accel_bias_walk * walk)
+        self.gyro_bias += noise[1] * (self.gyro_bias_walk * walk)
+        accel += self.accel_bias + noise[2] * self.accel_noise
+        gyro += self.gyro_bias + noise[3] * self.gyro_noise
+        return accel, gyro
+
+
+class TrajectorySimulator:
+    """
+    Driver model, carrier dynamics and IMU errors for a fleet of carriers.
+    """
+
+    def __init__(self, num_vehicles=1, sample_rate=100.0, params=None, seed=None,
+                 initial_scenario=None, speed_time_constant=0.8, steer_time_constant=0.3):
+        """
+        Initialize the simulator.
+
+        Args:
+            num_vehicles (int): Number of carriers simulated together
+            sample_rate (float): IMU sample rate in Hz
+            params (TrolleyParams, optional): Carrier properties
+            seed (int, optional): Random seed for reproducible traces
+            initial_scenario (str, optional): Scenario of every carrier at
+                the start (default: drawn from SCENARIO_DISTRIBUTION)
+            speed_time_constant (float): Lag of the speed command in s
+            steer_time_constant (float): Lag of the steering command in s
+        """
+        self.num_vehicles = num_vehicles
+        self.sample_rate = sample_rate
+        self.dt = 1.0 / sample_rate
+        self.rng = np.random.default_rng(np.random.SeedSequence(seed))
+        self.dynamics = TrolleyDynamics(num_vehicles, params)
+        self.sensor = ImuSensorModel(num_vehicles, self.rng)
+
+        self.scenario_probabilities = np.array([SCENARIO_DISTRIBUTION[s] for s in SCENARIOS])
+        if initial_scenario is None:
+            self.scenario = self.rng.choice(len(SCENARIOS), size=num_vehicles, p=self.scenario_probabilities)
+        else:
+            self.scenario = np.full(num_vehicles, SCENARIOS.index(initial_scenario))
+        self.direction = self.rng.choice([-1.0, 1.0], size=num_vehicles)
+
+        self.speed_alpha = 1.0 - math.exp(-self.dt / speed_time_constant)
+        self.steer_alpha = 1.0 - math.exp(-self.dt / steer_time_constant)
+        self.speed_command = np.zeros(num_vehicles)
+        self.curvature_command = np.zeros(num_vehicles)
+        self.time = 0.0
+
+    def _update_driver(self):
+        """
+        Scenario transitions and smoothed speed/steering commands.
+        """
+        rng = self.rng
+        n = self.num_vehicles
+        profile = SCENARIO_PROFILES[self.scenario]
+
+        # Markov scenario changes with the scenario's mean duration
+        switch = rng.random(n) < self.dt / profile[:, 3]
+        if switch.any():
+            self.scenario[switch] = rng.choice(len(SCENARIOS), size=int(switch.sum()),
+                                               p=self.scenario_probabilities)
+            profile = SCENARIO_PROFILES[self.scenario]
+
+        # Turn direction changes (S-curves)
+        flip = rng.random(n) < profile[:, 2] * self.dt
+        self.direction[flip] *= -1.0
+
+        # Commands follow their targets with first-order lags plus small wander
+        wander = rng.normal(size=(2, n))
+        speed_target = profile[:, 0] * (1.0 + 0.1 * wander[0])
+        curvature_target = self.direction * profile[:, 1] + 0.05 * wander[1]
+        self.speed_command += self.speed_alpha * (speed_target - self.speed_command)
+        self.curvature_command += self.steer_alpha * (curvature_target - self.curvature_command)
+
+    def step(self, speed_scale=None, curvature_offset=None):
+        """
+        Advance all carriers by one sample.
+
+        Args:
+            speed_scale (np.ndarray, optional): Factor applied to the driver's
+                speed per carrier (e.g. from a controller slowing the wheels)
+            curvature_offset (np.ndarray, optional): Curvature in 1/m added to
+                the driver's steering per carrier (e.g. from differential braking)
+
+        Returns:
+            tuple: (accel, gyro) measured IMU values, shape (N, 3) each
+        """
+        self._update_driver()
+        speed = self.speed_command if speed_scale is None else self.speed_command * speed_scale
+        curvature = self.curvature_command if curvature_offset is None else self.curvature_command + curvature_offset
+        accel, gyro = self.dynamics.step(self.dt, speed, curvature)
+        self.time += self.dt
+        return self.sensor.measure(self.dt, accel, gyro)
+
+    def run(self, duration):
+        """
+        Simulate all carriers for a fixed time.
+
+        Args:
+            duration (float): Simulated time in s
+
+        Returns:
+            dict: 'timestamp' (T,), 'accel' and 'gyro' (T, N, 3), and per
+                sample ground truth (T, N): 'label', 'roll' (deg),
+                'lateral_accel', 'lift_angle' (deg) and 'tipped'
+        """
+        num_steps = int(round(duration * self.sample_rate))
+        n = self.num_vehicles
+        result = {
+            'timestamp': np.empty(num_steps),
+            'accel': np.empty((num_steps, n, 3)),
+            'gyro': np.empty((num_steps, n, 3)),
+            'label': np.empty((num_steps, n), dtype=np.int8),
+            'roll': np.empty((num_steps, n)),
+            'lateral_accel': np.empty((num_steps, n)),
+            'lift_angle': np.empty((num_steps, n)),
+            'tipped': np.empty((num_steps, n), dtype=bool),
+        }
+        dynamics = self.dynamics
+        for i in range(num_steps):
+            result['accel'][i], result['gyro'][i] = self.step()
+            result['timestamp'][i] = self.time
+            result['label'][i] = self.scenario
+            result['roll'][i] = dynamics.roll
+            result['lateral_accel'][i] = dynamics.lateral_accel
+            result['lift_angle'][i] = dynamics.lift_angle
+            result['tipped'][i] = dynamics.tipped
+
+        result['roll'] *= 180 / np.pi
+        result['lift_angle'] *= 180 / np.pi
+        return result
+
+
+def to_samples(result, vehicle=0):
+    """
+    Convert one carrier of a run() result to the generator's sample layout.
+
+    Args:
+        result (dict): Output of TrajectorySimulator.run()
+        vehicle (int): Carrier index
+
+    Returns:
+        np.ndarray: SAMPLE_DTYPE array (timestamp, accel, gyro, label)
+    """
+    from .data_generator import SAMPLE_DTYPE
+
+    samples = np.empty(len(result['timestamp']), dtype=SAMPLE_DTYPE)
+    samples['timestamp'] = result['timestamp']
+    samples['accel'] = result['accel'][:, vehicle]
+    samples['gyro'] = result['gyro'][:, vehicle]
+    samples['label'] = result['label'][:, vehicle]
+    return samples
+
+
+def main():
+    """
+    Main function demonstrating the trajectory simulator (the checks live
+    in tests/test_trajectory_simulator.py).
+    """
+    import time
+
+    print("Trajectory Simulator demo...")
+
+    params = TrolleyParams()
+    print(f"SSF={params.static_stability_factor:.2f}, wheel lift at {params.lift_acceleration:.2f} m/s^2, "
+          f"tip angle {math.degrees(params.tip_angle):.1f} deg")
+
+    # Steady left turns below and above the lift limit
+    dt = 0.01
+    dynamics = TrolleyDynamics(3, params)
+    speed = np.array([1.5, 2.0, 3.0])
+    curvature = np.array([0.5, 1.0, 1.0])  # a_lat = 1.1, 4.0 and 9.0 m/s^2
+    for _ in range(300):
+        accel, gyro = dynamics.step(dt, speed, curvature)
+    measured_roll = np.degrees(np.arctan2(accel[:, 1], accel[:, 2]))
+    print(f"  lateral accel {dynamics.lateral_accel.round(2)} m/s^2 -> body roll "
+          f"{np.degrees(dynamics.roll).round(2)} deg, IMU roll {measured_roll.round(2)} deg, "
+          f"tipped {dynamics.tipped}")
+
+    # Fleet run: correlated traces
+    simulator = TrajectorySimulator(num_vehicles=1000, seed=4)
+    start = time.perf_counter()
+    result = simulator.run(60.0)
+    elapsed = time.perf_counter() - start
+
+    lateral = result['accel'][:, :, 1]
+    lag1 = np.mean([np.corrcoef(lateral[:-1, v], lateral[1:, v])[0, 1] for v in range(20)])
+    samples = result['accel'].shape[0] * result['accel'].shape[1]
+    print(f"  {samples} samples in {elapsed:.2f} s ({samples / elapsed / 1e6:.1f} M samples/s), "
+          f"lag-1 autocorrelation of ay {lag1:.3f}")
+    print(f"  time per scenario: {np.bincount(result['label'].ravel(), minlength=4) / result['label'].size}")
+    upright = ~result['tipped']
+    print(f"  wheel lift in {np.mean(result['lift_angle'][upright] > 0):.2%} of upright samples, "
+          f"{result['tipped'][-1].sum()} of 1000 carriers tipped over in 60 s")
+    print("Trajectory simulator demo completed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Troll-vs-Troll Project
+Async Runtime Tests
+
+Unit tests for AsyncRuntime (src/main/async_runtime.py).
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：异步运行时与慢速I/O隔离测试 - 成功
+
+import asyncio
+import io
+import json
+import time
+import unittest
+
+from src.control.differential_controller import DifferentialController
+from src.main.async_runtime import AsyncRuntime, LogTelemetry
+from src.sensors.imu_source import SimulatedIMU
+
+
+class SlowTelemetry:
+    """
+    Telemetry sink with a 300 ms network stall per publish.
+    """
+
+    def __init__(self):
+        self.payloads = []
+
+    def publish(self, payload):
+        time.sleep(0.3)
+        self.payloads.append(payload)
+
+
+class SlowDisplay:
+    """
+    Display taking 150 ms per redraw.
+    """
+
+    def __init__(self):
+        self.frames = 0
+
+    def show(self, state):
+        time.sleep(0.15)
+        self.frames += 1
+
+
+class AsyncRuntimeTest(unittest.TestCase):
+    """
+    Blocking telemetry and display I/O must not hold up sensing and control.
+    """
+
+    def test_slow_io_does_not_delay_control(self):
+        telemetry = SlowTelemetry()
+        display = SlowDisplay()
+        runtime = AsyncRuntime(
+            SimulatedIMU(scenario='turning', seed=3), DifferentialController(),
+            sensor_rate=100.0, control_rate=20.0,
+            telemetry=telemetry, telemetry_rate=5.0, display=display, display_rate=10.0
+        )
+        asyncio.run(runtime.run(duration=1.0))
+
+        stats = runtime.get_stats()
+        self.assertGreaterEqual(stats['control']['releases'], 18)
+        self.assertGreaterEqual(stats['sensor']['releases'], 90)
+        self.assertLess(stats['control']['jitter_us']['max'], 50e3)
+        self.assertGreater(stats['telemetry']['dropped'], 0)
+        self.assertGreater(stats['telemetry']['budget_overruns'], 0)
+        self.assertGreater(stats['display']['dropped'], 0)
+        self.assertGreater(len(telemetry.payloads), 0)
+        self.assertIn('risk_level', telemetry.payloads[0])
+
+    def test_samples_are_timestamped(self):
+        controller = DifferentialController()
+        runtime = AsyncRuntime(SimulatedIMU(seed=4), controller, sensor_rate=200.0, control_rate=10.0)
+        asyncio.run(runtime.run(duration=0.1))
+        timestamps = controller.sensor_processor.accel_data_buffer.timestamps()
+        self.assertEqual(len(timestamps), 10)
+        self.assertTrue((timestamps[1:] > timestamps[:-1]).all())
+
+    def test_stop(self):
+        runtime = AsyncRuntime(SimulatedIMU(seed=5), DifferentialController(), control_rate=10.0)
+
+        async def run_then_stop():
+            task = asyncio.create_task(runtime.run())
+            await asyncio.sleep(0.15)
+            runtime.stop()
+            await asyncio.wait_for(task, timeout=5)
+
+        asyncio.run(run_then_stop())
+        self.assertGreater(runtime.get_stats()['control']['releases'], 0)
+
+
+class LogTelemetryTest(unittest.TestCase):
+    """
+    The fallback telemetry sink writes one JSON line per payload.
+    """
+
+    def test_json_lines(self):
+        stream = io.StringIO()
+        sink = LogTelemetry(stream)
+        sink.publish({'risk_score': 0.5})
+        sink.publish({'risk_score': 0.7})
+        lines = stream.getvalue().splitlines()
+        self.assertEqual([json.loads(line)['risk_score'] for line in lines], [0.5, 0.7])
+        self.assertEqual(sink.published, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
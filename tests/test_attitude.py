@@ -0,0 +1,118 @@
+"""
+Troll-vs-Troll Project
+Attitude Estimation Tests
+
+Unit tests for ComplementaryFilter and AttitudeEKF (src/sensors/attitude.py).
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：互补滤波与EKF标量/批量一致性及精度测试 - 成功
+
+import math
+import unittest
+
+import numpy as np
+
+from src.sensors.attitude import (
+    AttitudeEKF, ComplementaryFilter, accel_tilt, accel_tilt_batch
+)
+from src.utils.trajectory_simulator import TrajectorySimulator
+
+FILTERS = (ComplementaryFilter, AttitudeEKF)
+
+
+class AccelTiltTest(unittest.TestCase):
+    """
+    Tilt angles of single accelerometer samples.
+    """
+
+    def test_scalar_and_batch(self):
+        accel = np.random.default_rng(1).normal((0.0, 0.0, 9.81), (3.0, 3.0, 1.0), size=(50, 3))
+        pitch, roll = accel_tilt_batch(accel)
+        for i, sample in enumerate(accel.tolist()):
+            self.assertAlmostEqual(accel_tilt(*sample)[0], pitch[i], places=12)
+            self.assertAlmostEqual(accel_tilt(*sample)[1], roll[i], places=12)
+
+    def test_right_roll_is_positive(self):
+        pitch, roll = accel_tilt(0.0, 9.81 * math.sin(0.2), 9.81 * math.cos(0.2))
+        self.assertAlmostEqual(roll, 0.2)
+        self.assertAlmostEqual(pitch, 0.0)
+
+
+class AttitudeFilterTest(unittest.TestCase):
+    """
+    Scalar and vectorized updates on a simulated drive.
+    """
+
+    runs = 8
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = TrajectorySimulator(num_vehicles=cls.runs, seed=2).run(30.0)
+
+    def rms_error(self, estimate):
+        upright = ~self.data['tipped']
+        return float(np.sqrt(np.mean((estimate - self.data['roll'])[upright] ** 2)))
+
+    def run_batch(self, factory):
+        fleet = factory(num_vehicles=self.runs)
+        roll = np.empty_like(self.data['roll'])
+        for i, t in enumerate(self.data['timestamp']):
+            roll[i] = fleet.update_batch(self.data['accel'][i], self.data['gyro'][i], t)[1]
+        return roll
+
+    def test_batch_matches_scalar(self):
+        data = self.data
+        for factory in FILTERS:
+            with self.subTest(filter=factory.__name__):
+                fleet = factory(num_vehicles=self.runs)
+                singles = [factory() for _ in range(3)]
+                for i, t in enumerate(data['timestamp'][:1500]):
+                    fleet.update_batch(data['accel'][i], data['gyro'][i], t)
+                    for run, single in enumerate(singles):
+                        pitch, roll = single.update(tuple(data['accel'][i, run]), tuple(data['gyro'][i, run]), t)
+                        self.assertTrue(math.isclose(roll, fleet.roll[run], rel_tol=1e-9, abs_tol=1e-9))
+                        self.assertTrue(math.isclose(pitch, fleet.pitch[run], rel_tol=1e-9, abs_tol=1e-9))
+
+    def test_beats_accelerometer_angle(self):
+        accel = self.data['accel']
+        accel_error = self.rms_error(np.degrees(np.arctan2(accel[..., 1], accel[..., 2])))
+        for factory in FILTERS:
+            with self.subTest(filter=factory.__name__):
+                self.assertLess(self.rms_error(self.run_batch(factory)), accel_error)
+
+    def test_first_sample_initializes_from_accelerometer(self):
+        for factory in FILTERS:
+            with self.subTest(filter=factory.__name__):
+                single = factory()
+                self.assertFalse(single.initialized)
+                pitch, roll = single.update((0.0, 9.81 * math.sin(0.2), 9.81 * math.cos(0.2)), (0.0, 0.0, 0.0))
+                self.assertTrue(single.initialized)
+                self.assertAlmostEqual(roll, math.degrees(0.2))
+                single.reset()
+                self.assertFalse(single.initialized)
+                self.assertEqual(single.orientation(), (0.0, 0.0))
+
+    def test_missing_timestamps_use_sample_period(self):
+        for factory in FILTERS:
+            with self.subTest(filter=factory.__name__):
+                timed, untimed = factory(), factory()
+                for i in range(100):
+                    accel, gyro = (0.0, 1.0, 9.76), (0.3, 0.0, 0.0)
+                    timed.update(accel, gyro, 0.01 * i)
+                    untimed.update(accel, gyro)
+                self.assertAlmostEqual(timed.roll, untimed.roll, places=9)
+
+    def test_batch_rejects_bad_input(self):
+        for factory in FILTERS:
+            with self.subTest(filter=factory.__name__):
+                with self.assertRaises(ValueError):
+                    factory().update_batch(np.zeros((2, 3)), np.zeros((2, 3)))
+                with self.assertRaises(ValueError):
+                    factory(num_vehicles=2).update_batch(np.zeros((3, 3)), np.zeros((3, 3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
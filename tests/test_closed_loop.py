@@ -0,0 +1,102 @@
+"""
+Troll-vs-Troll Project
+Closed-Loop Simulation Tests
+
+Unit tests for ClosedLoopPlant and ClosedLoopSimulation (src/utils/closed_loop.py).
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：闭环手推车模型与仿真测试 - 成功
+
+import unittest
+
+import numpy as np
+
+from src.control.differential_controller import DifferentialController
+from src.utils.closed_loop import ClosedLoopPlant, ClosedLoopSimulation
+from src.utils.replay import SimulatedClock
+
+
+class ClosedLoopPlantTest(unittest.TestCase):
+    """
+    Wheel commands through the actuator into the dynamics.
+    """
+
+    def test_actuator_lag(self):
+        plant = ClosedLoopPlant(num_runs=2, seed=1)
+        command = np.array([0.5, 1.0])
+        plant.step(command, command)
+        # First-order response: part of the way after one sample
+        self.assertTrue(0.5 < plant.left_wheel[0] < 1.0)
+        for _ in range(100):
+            plant.step(command, command)
+        np.testing.assert_allclose(plant.left_wheel, command, atol=1e-6)
+        np.testing.assert_allclose(plant.right_wheel, command, atol=1e-6)
+
+    def test_same_seed_same_samples(self):
+        full = ClosedLoopPlant(num_runs=3, seed=4)
+        again = ClosedLoopPlant(num_runs=3, seed=4)
+        ones = np.ones(3)
+        for _ in range(50):
+            np.testing.assert_array_equal(full.step(ones, ones)[0], again.step(ones, ones)[0])
+
+    def test_single_controller_drives_plant(self):
+        clock = SimulatedClock()
+        controller = DifferentialController(clock=clock)
+        plant = ClosedLoopPlant(num_runs=1, seed=1, initial_scenario='rollover_imminent')
+        left = right = np.ones(1)
+        commands = []
+        for _ in range(500):
+            accel, gyro = plant.step(left, right)
+            clock.set(plant.time)
+            output = controller.update_control(tuple(accel[0]), tuple(gyro[0]))
+            left = np.array([output['left_wheel_speed']])
+            right = np.array([output['right_wheel_speed']])
+            commands.append(output['control_active'])
+        self.assertTrue(any(commands))
+        self.assertAlmostEqual(plant.time, 5.0)
+
+
+class ClosedLoopSimulationTest(unittest.TestCase):
+    """
+    Tip-over rate with and without control.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.open_loop = ClosedLoopSimulation(num_runs=100, control=False, seed=5).run(40.0)
+        cls.closed = ClosedLoopSimulation(num_runs=100, control_interval=0.1, seed=5).run(40.0)
+
+    def test_control_prevents_tip_overs(self):
+        self.assertGreater(self.open_loop['tip_rate'], 0.0)
+        self.assertLess(self.closed['tip_rate'], self.open_loop['tip_rate'])
+        self.assertGreater(self.closed['control_active'], 0.0)
+
+    def test_open_loop_keeps_full_speed(self):
+        self.assertEqual(self.open_loop['mean_speed_scale'], 1.0)
+        self.assertLess(self.closed['mean_speed_scale'], 1.0)
+
+    def test_tip_times(self):
+        tipped = self.open_loop['tipped']
+        self.assertEqual(self.open_loop['tip_rate'], tipped.mean())
+        self.assertTrue(np.all(np.isnan(self.open_loop['tip_time'][~tipped])))
+        self.assertTrue(np.all(self.open_loop['tip_time'][tipped] <= 40.0))
+
+    def test_reproducible(self):
+        again = ClosedLoopSimulation(num_runs=100, control_interval=0.1, seed=5).run(40.0)
+        np.testing.assert_array_equal(again['tip_time'], self.closed['tip_time'])
+
+    def test_command_delay(self):
+        simulation = ClosedLoopSimulation(num_runs=4, command_delay=0.05, seed=5)
+        self.assertEqual(simulation.delay_steps, 5)
+        simulation.run(0.03)
+        # The first command is queued for sample 1 + 5 and has not been applied yet
+        self.assertEqual(len(simulation._pending), 1)
+        self.assertEqual(simulation._pending[0][0], 6)
+        self.assertTrue(np.all(simulation.left_command == 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
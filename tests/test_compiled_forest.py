@@ -0,0 +1,91 @@
+"""
+Troll-vs-Troll Project
+Compiled Isolation Forest Tests
+
+Unit tests for CompiledIsolationForest (src/ml/compiled_forest.py).
+
+Version: 1.1.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：编译模型与sklearn评分一致性测试 - 成功
+# - v1.1.0 2026-10-17: 新增阈值边界样本的批量评分一致性测试 - 成功
+
+import importlib.util
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.ml.compiled_forest import CompiledIsolationForest, average_path_length
+
+HAVE_SKLEARN = importlib.util.find_spec("sklearn") is not None
+
+
+@unittest.skipUnless(HAVE_SKLEARN, "scikit-learn not installed")
+class CompiledIsolationForestTest(unittest.TestCase):
+    """
+    Compiled scores against IsolationForest.score_samples.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        from sklearn.ensemble import IsolationForest
+        from sklearn.preprocessing import StandardScaler
+
+        rng = np.random.default_rng(5)
+        mean = (0.0, 0.0, 9.81, 9.81, 0.0, 0.0)
+        train = rng.normal(mean, (0.3, 0.3, 0.2, 0.2, 2.0, 2.0), size=(300, 6))
+        cls.test_data = rng.normal(mean, (1.0, 1.0, 0.8, 0.8, 8.0, 8.0), size=(2000, 6))
+
+        scaler = StandardScaler().fit(train)
+        detector = IsolationForest(contamination=0.1, random_state=42).fit(scaler.transform(train))
+        cls.compiled = CompiledIsolationForest.from_model(scaler, detector)
+        cls.expected = detector.score_samples(scaler.transform(cls.test_data))
+
+    def test_batch_scores_are_identical(self):
+        for chunk_size in (1, 333, 5000):
+            with self.subTest(chunk_size=chunk_size):
+                np.testing.assert_array_equal(
+                    self.compiled.score_samples(self.test_data, chunk_size=chunk_size), self.expected)
+
+    def test_samples_on_split_thresholds(self):
+        # float32 neighbours of the thresholds hit both sides of every comparison
+        from sklearn.ensemble import IsolationForest
+
+        rng = np.random.default_rng(6)
+        train = rng.normal(0.0, 1.0, size=(300, 3))
+        identity = SimpleNamespace(mean_=np.zeros(3), scale_=np.ones(3))
+        detector = IsolationForest(random_state=1).fit(train)
+        compiled = CompiledIsolationForest.from_model(identity, detector)
+        thresholds = compiled.threshold[compiled.children_left != np.arange(len(compiled.threshold))]
+        near = thresholds.astype(np.float32)
+        values = np.concatenate([near, np.nextafter(near, np.float32(np.inf)),
+                                 np.nextafter(near, np.float32(-np.inf))]).astype(np.float64)
+        samples = rng.permuted(np.tile(values, (3, 1)), axis=1).T
+        np.testing.assert_array_equal(compiled.score_samples(samples), detector.score_samples(samples))
+
+    def test_single_scores_are_identical(self):
+        single = [self.compiled.score_one(x) for x in self.test_data[:200]]
+        np.testing.assert_array_equal(single, self.expected[:200])
+
+    def test_array_round_trip(self):
+        restored = CompiledIsolationForest.from_arrays(self.compiled.to_arrays())
+        self.assertEqual(restored.n_features, 6)
+        self.assertEqual(restored.n_estimators, self.compiled.n_estimators)
+        np.testing.assert_array_equal(restored.score_samples(self.test_data), self.expected)
+
+
+class AveragePathLengthTest(unittest.TestCase):
+    """
+    Average unsuccessful search length c(n) of a binary search tree.
+    """
+
+    def test_small_values(self):
+        self.assertEqual(average_path_length(1), 0.0)
+        self.assertEqual(average_path_length(2), 1.0)
+        self.assertAlmostEqual(average_path_length(256), 2.0 * (np.log(255) + np.euler_gamma) - 2.0 * 255 / 256)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Troll-vs-Troll Project
+Sensor Data Generator Tests
+
+Unit tests for SensorDataGenerator (src/utils/data_generator.py).
+
+Version: 1.2.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：向量化生成与逐样本生成分布一致性测试 - 成功
+# - v1.1.0 2026-10-17: 新增分块流式生成测试 - 成功
+# - v1.2.0 2026-10-17: 新增独立随机流分片与多进程一致性测试 - 成功
+
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from src.utils.data_generator import SCENARIOS, SensorDataGenerator
+
+
+class VectorizedGenerationTest(unittest.TestCase):
+    """
+    generate_sequence_array and generate_training_array against the per-sample generator.
+    """
+
+    def test_training_array_is_reproducible(self):
+        first = SensorDataGenerator(seed=7).generate_training_array(5000)
+        second = SensorDataGenerator(seed=7).generate_training_array(5000)
+        self.assertEqual(first.tobytes(), second.tobytes())
+        self.assertNotEqual(first.tobytes(), SensorDataGenerator(seed=8).generate_training_array(5000).tobytes())
+
+    def test_training_array_label_mix(self):
+        samples = SensorDataGenerator(seed=7).generate_training_array(1001)
+        expected = SensorDataGenerator()._scenario_counts(1001)
+        self.assertEqual(np.bincount(samples['label'], minlength=len(SCENARIOS)).tolist(),
+                         [expected[scenario] for scenario in SCENARIOS])
+        self.assertTrue(np.isnan(samples['timestamp']).all())
+
+    def test_sequence_array_matches_loop_distribution(self):
+        loop_generator = SensorDataGenerator(seed=7)
+        vector_generator = SensorDataGenerator(seed=8)
+        for scenario in SCENARIOS:
+            with self.subTest(scenario=scenario):
+                loop = loop_generator.generate_data_sequence(200.0, scenario, start_time=0.0)
+                loop_accel = np.array([sample[1] for sample in loop])
+                loop_gyro = np.array([sample[2] for sample in loop])
+                vector = vector_generator.generate_sequence_array(200.0, scenario)
+
+                self.assertEqual(len(vector), len(loop))
+                np.testing.assert_allclose(vector['timestamp'], [sample[0] for sample in loop])
+                self.assertTrue((vector['label'] == SCENARIOS.index(scenario)).all())
+                np.testing.assert_allclose(vector['accel'].mean(axis=0), loop_accel.mean(axis=0), atol=0.05)
+                np.testing.assert_allclose(vector['accel'].std(axis=0), loop_accel.std(axis=0), rtol=0.05)
+                np.testing.assert_allclose(vector['gyro'].std(axis=0), loop_gyro.std(axis=0), rtol=0.05)
+
+
+class StreamingGenerationTest(unittest.TestCase):
+    """
+    iter_training_chunks streams the dataset in bounded memory.
+    """
+
+    def test_chunk_sizes_and_label_mix(self):
+        num_samples = 100003
+        chunks = list(SensorDataGenerator(seed=9).iter_training_chunks(num_samples, chunk_size=8192))
+        self.assertEqual([len(chunk) for chunk in chunks[:-1]], [8192] * (len(chunks) - 1))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), num_samples)
+
+        totals = sum(np.bincount(chunk['label'], minlength=len(SCENARIOS)) for chunk in chunks)
+        expected = SensorDataGenerator()._scenario_counts(num_samples)
+        self.assertEqual(totals.tolist(), [expected[scenario] for scenario in SCENARIOS])
+
+    def test_memory_is_bounded_by_chunk_size(self):
+        chunk_size = 4096
+        tracemalloc.start()
+        try:
+            for chunk in SensorDataGenerator(seed=9).iter_training_chunks(500000, chunk_size=chunk_size):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        # A handful of chunks at most, far below the 29 MB of the whole dataset
+        self.assertLess(peak, 8 * chunk_size * chunk.itemsize)
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            next(SensorDataGenerator().iter_training_chunks(10, chunk_size=0))
+
+
+class ShardedGenerationTest(unittest.TestCase):
+    """
+    Independently seeded shards give the same dataset for any worker count.
+    """
+
+    def test_identical_for_any_worker_count(self):
+        reference = SensorDataGenerator(seed=10).generate_training_array(30000, shard_size=7000, workers=1)
+        streamed = np.concatenate(list(SensorDataGenerator(seed=10).iter_training_chunks(30000, chunk_size=7000)))
+        self.assertEqual(streamed.tobytes(), reference.tobytes())
+        parallel = SensorDataGenerator(seed=10).generate_training_array(30000, shard_size=7000, workers=2)
+        self.assertEqual(parallel.tobytes(), reference.tobytes())
+
+    def test_datasets_use_fresh_streams(self):
+        generator = SensorDataGenerator(seed=10)
+        first = generator.generate_training_array(1000)
+        second = generator.generate_training_array(1000)
+        self.assertNotEqual(first.tobytes(), second.tobytes())
+
+    def test_planning_leaves_generator_state_alone(self):
+        generator = SensorDataGenerator(seed=10)
+        generator.generate_training_array(1000, shard_size=300)
+        self.assertEqual(generator.time_in_scenario, 0)
+
+    def test_global_random_state_is_untouched(self):
+        state = np.random.get_state()[1].copy()
+        SensorDataGenerator(seed=1).generate_training_array(1000, shard_size=300)
+        np.testing.assert_array_equal(np.random.get_state()[1], state)
+
+
+if __name__ == "__main__":
+    unittest.main()
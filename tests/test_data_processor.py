@@ -0,0 +1,213 @@
+"""
+Troll-vs-Troll Project
+Sensor Data Processor Tests
+
+Unit tests for SensorDataProcessor (src/sensors/data_processor.py).
+
+Version: 1.5.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：窗口统计与numpy对比测试 - 成功
+# - v1.1.0 2026-10-17: 新增批量特征提取与流式路径一致性测试（含姿态滤波器） - 成功
+# - v1.2.0 2026-10-17: 新增扁平特征向量原地填充测试 - 成功
+# - v1.3.0 2026-10-17: 新增批量写入与逐样本写入一致性测试 - 成功
+# - v1.4.0 2026-10-17: 新增陀螺仪趋势最小二乘斜率测试 - 成功
+# - v1.5.0 2026-10-17: 新增批量写入逐样本更新姿态滤波器测试 - 成功
+
+import unittest
+
+import numpy as np
+
+from src.sensors import features as F
+from src.sensors.attitude import AttitudeEKF, ComplementaryFilter
+from src.sensors.data_processor import SensorDataProcessor
+
+
+def make_samples(count=400, seed=7):
+    """
+    Random accelerometer and gyro samples around 1 g.
+    """
+    rng = np.random.default_rng(seed)
+    accel = rng.normal((0.0, 0.0, 9.81), (1.0, 1.0, 0.5), size=(count, 3))
+    gyro = rng.normal(0.0, 0.1, size=(count, 3))
+    return accel, gyro
+
+
+class WindowStatisticsTest(unittest.TestCase):
+    """
+    Window mean/std features against numpy over the same window.
+    """
+
+    def test_window_statistics_match_numpy(self):
+        accel, _ = make_samples()
+        magnitude = np.linalg.norm(accel, axis=1)
+        for window_size in (1, 2, 5, 10, 64):
+            with self.subTest(window_size=window_size):
+                processor = SensorDataProcessor(window_size=window_size)
+                for i, sample in enumerate(accel):
+                    processor.add_accel_data(tuple(sample))
+                    features = processor.get_processed_features()['acceleration']
+                    window = accel[max(0, i + 1 - window_size):i + 1]
+                    if len(window) < 2:
+                        continue
+                    np.testing.assert_allclose(list(features['mean'].values()), window.mean(axis=0),
+                                               rtol=0, atol=1e-9)
+                    np.testing.assert_allclose(list(features['std'].values()), window.std(axis=0),
+                                               rtol=0, atol=1e-9)
+                    expected_std = magnitude[max(0, i + 1 - window_size):i + 1].std()
+                    self.assertAlmostEqual(processor.std_buffer.view()[-1], expected_std, delta=1e-9)
+
+
+class FeatureVectorTest(unittest.TestCase):
+    """
+    The flat feature vector used on the control path.
+    """
+
+    def test_feature_vector_is_filled_in_place(self):
+        processor = SensorDataProcessor()
+        self.assertIsNone(processor.get_feature_vector())
+        processor.add_accel_data((0.1, 0.2, 9.8))
+        vector = processor.get_feature_vector()
+        processor.add_accel_data((0.3, 0.4, 9.7))
+        self.assertIs(processor.get_feature_vector(), vector)
+        out = np.empty_like(vector)
+        self.assertIs(processor.get_feature_vector(out), out)
+        np.testing.assert_array_equal(out, vector)
+
+
+    def test_matches_feature_dictionary(self):
+        accel, gyro = make_samples(count=20)
+        processor = SensorDataProcessor(window_size=5)
+        for sample_accel, sample_gyro in zip(accel, gyro):
+            processor.add_accel_data(tuple(sample_accel))
+            processor.add_gyro_data(tuple(sample_gyro))
+            features = processor.get_processed_features()
+            vector = processor.get_feature_vector()
+            np.testing.assert_array_equal(vector[F.GYRO_X:F.GYRO_Z + 1], sample_gyro)
+            self.assertEqual(vector[F.ROLL], features['orientation']['roll'])
+            self.assertEqual(vector[F.ACCEL_STD_Z], features['acceleration']['std']['z'])
+
+
+class BatchExtractionTest(unittest.TestCase):
+    """
+    extract_features_batch against the streaming path, row by row.
+    """
+
+    def assert_matches_streaming(self, processor, accel, gyro, timestamps=None):
+        batch = processor.extract_features_batch(accel, gyro, timestamps, chunk_size=97)
+        for i in range(len(accel)):
+            timestamp = np.nan if timestamps is None else timestamps[i]
+            processor.add_accel_data(tuple(accel[i]), timestamp)
+            if gyro is not None:
+                processor.add_gyro_data(tuple(gyro[i]), timestamp)
+            np.testing.assert_allclose(batch[i, F.ACCEL_X:], processor.get_feature_vector()[F.ACCEL_X:],
+                                       rtol=1e-12, atol=1e-12, err_msg=f"row {i}")
+
+    def test_matches_streaming(self):
+        accel, gyro = make_samples()
+        for window_size in (1, 2, 5, 10, 64):
+            with self.subTest(window_size=window_size):
+                self.assert_matches_streaming(SensorDataProcessor(window_size=window_size), accel, gyro)
+
+    def test_matches_streaming_without_gyro(self):
+        accel, _ = make_samples(count=100)
+        self.assert_matches_streaming(SensorDataProcessor(window_size=5), accel, None)
+
+    def test_matches_streaming_with_attitude_filter(self):
+        accel, gyro = make_samples()
+        timestamps = 0.01 * np.arange(len(accel))
+        for attitude in (ComplementaryFilter(), AttitudeEKF()):
+            with self.subTest(attitude=type(attitude).__name__):
+                self.assert_matches_streaming(SensorDataProcessor(attitude=attitude), accel, gyro, timestamps)
+
+    def test_batch_leaves_attitude_filter_untouched(self):
+        accel, gyro = make_samples(count=50)
+        processor = SensorDataProcessor(attitude=ComplementaryFilter())
+        processor.extract_features_batch(accel, gyro)
+        self.assertFalse(processor.attitude.initialized)
+
+
+class BlockIngestionTest(unittest.TestCase):
+    """
+    add_sensor_batch against sample-by-sample ingestion.
+    """
+
+    def test_matches_single_samples(self):
+        accel, gyro = make_samples()
+        rng = np.random.default_rng(11)
+        for window_size in (1, 2, 5, 10):
+            with self.subTest(window_size=window_size):
+                single = SensorDataProcessor(window_size=window_size)
+                blocks = SensorDataProcessor(window_size=window_size)
+                start = 0
+                while start < len(accel):
+                    end = min(len(accel), start + int(rng.integers(1, 3 * window_size + 2)))
+                    for i in range(start, end):
+                        single.add_accel_data(tuple(accel[i]), float(i))
+                        single.add_gyro_data(tuple(gyro[i]), float(i))
+                    blocks.add_sensor_batch(accel[start:end], gyro[start:end], np.arange(start, end, dtype=float))
+                    np.testing.assert_allclose(blocks.get_feature_vector(), single.get_feature_vector(),
+                                               rtol=1e-9, atol=1e-9, err_msg=f"row {end}")
+                    np.testing.assert_allclose(blocks.std_buffer.view(), single.std_buffer.view(),
+                                               rtol=1e-9, atol=1e-9)
+                    np.testing.assert_array_equal(blocks.gyro_data_buffer.view(), single.gyro_data_buffer.view())
+                    np.testing.assert_array_equal(blocks.accel_data_buffer.timestamps(),
+                                                  single.accel_data_buffer.timestamps())
+                    start = end
+
+    def test_feeds_attitude_filter_per_sample(self):
+        accel, gyro = make_samples()
+        for factory in (ComplementaryFilter, AttitudeEKF):
+            with self.subTest(filter=factory.__name__):
+                single = SensorDataProcessor(attitude=factory())
+                blocks = SensorDataProcessor(attitude=factory())
+                for i in range(len(accel)):
+                    single.add_accel_data(tuple(accel[i]), 0.01 * i)
+                    single.add_gyro_data(tuple(gyro[i]), 0.01 * i)
+                for start in range(0, len(accel), 7):
+                    blocks.add_sensor_batch(accel[start:start + 7], gyro[start:start + 7],
+                                            0.01 * np.arange(start, min(start + 7, len(accel))))
+                self.assertEqual(blocks.attitude.orientation(), single.attitude.orientation())
+                self.assertEqual(blocks.get_feature_vector()[F.ROLL], single.get_feature_vector()[F.ROLL])
+
+    def test_rejects_bad_shapes(self):
+        processor = SensorDataProcessor()
+        with self.assertRaises(ValueError):
+            processor.add_sensor_batch(np.zeros((3, 2)))
+        with self.assertRaises(ValueError):
+            processor.add_sensor_batch(np.zeros((3, 3)), np.zeros((2, 3)))
+
+
+class GyroTrendTest(unittest.TestCase):
+    """
+    Least-squares slope of the gyro rates over the window.
+    """
+
+    def test_recovers_linear_ramp(self):
+        processor = SensorDataProcessor(window_size=10)
+        for i in range(15):
+            t = 0.01 * i
+            processor.add_sensor_batch(np.array([[0.0, 0.0, 9.81]]), np.array([[0.1 + 2.0 * t, 0.0, -t]]),
+                                       np.array([t]))
+        np.testing.assert_allclose(processor.get_gyro_trend(), (2.0, 0.0, -1.0), atol=1e-9)
+
+    def test_matches_numpy_polyfit(self):
+        accel, gyro = make_samples(count=30)
+        timestamps = np.cumsum(np.random.default_rng(3).uniform(0.005, 0.015, size=30))
+        processor = SensorDataProcessor(window_size=8)
+        processor.add_sensor_batch(accel, gyro, timestamps)
+        expected = [np.polyfit(timestamps[-8:], gyro[-8:, axis], 1)[0] for axis in range(3)]
+        np.testing.assert_allclose(processor.get_gyro_trend(), expected, rtol=1e-9, atol=1e-9)
+
+    def test_zero_without_usable_samples(self):
+        processor = SensorDataProcessor()
+        processor.add_sensor_batch(np.zeros((2, 3)), np.ones((2, 3)), np.array([0.0, 0.01]))
+        self.assertEqual(processor.get_gyro_trend(), (0.0, 0.0, 0.0))
+        # Samples without timestamps
+        processor.add_sensor_batch(np.zeros((3, 3)), np.ones((3, 3)))
+        self.assertEqual(processor.get_gyro_trend(), (0.0, 0.0, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Troll-vs-Troll Project
+Differential Controller Tests
+
+Unit tests for DifferentialController (src/control/differential_controller.py).
+
+Version: 1.2.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：预训练模型热启动测试 - 成功
+# - v1.1.0 2026-10-17: 新增采样与控制分频测试 - 成功
+# - v1.2.0 2026-10-17: 新增update_control()陀螺仪趋势测试 - 成功
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.control.differential_controller import DifferentialController
+from src.ml.rollover_prediction import RolloverPredictor
+from src.utils.replay import SimulatedClock
+
+
+class WarmStartTest(unittest.TestCase):
+    """
+    A controller created with model_path serves the saved model from the first sample.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "model.npz")
+
+        predictor = RolloverPredictor(background_training=False)
+        rng = np.random.default_rng(9)
+        for sample in rng.normal((0.0, 0.0, 9.81), 0.5, size=(20, 3)):
+            predictor.update_model(predictor.preprocess_sensor_data(tuple(sample)))
+        predictor.save(self.path)
+
+    def test_first_step_scores_anomaly(self):
+        controller = DifferentialController(model_path=self.path)
+        result = controller.update_control((1.5, 3.0, 8.5))
+        self.assertIsNotNone(result['risk_assessment']['anomaly_score'])
+
+    def test_reset_reloads_model(self):
+        controller = DifferentialController(model_path=self.path)
+        controller.reset_control()
+        self.assertTrue(controller.rollover_predictor.is_trained)
+
+    def test_without_model_uses_thresholds(self):
+        result = DifferentialController().update_control((1.5, 3.0, 8.5))
+        self.assertIsNone(result['risk_assessment']['anomaly_score'])
+        self.assertTrue(result['control_active'])
+
+
+class ControlRateTest(unittest.TestCase):
+    """
+    Every sample is buffered; the control step runs once per control_interval.
+    """
+
+    def test_samples_inside_interval_are_buffered(self):
+        clock = SimulatedClock()
+        controller = DifferentialController(clock=clock)
+        steps = 0
+        for i in range(100):
+            clock.set(0.01 * i)
+            result = controller.update_control((0.1, 0.05, 9.81), (0.0, 0.0, 0.0))
+            steps += 'risk_assessment' in result
+        self.assertEqual(steps, 10)
+        self.assertEqual(len(controller.sensor_processor.accel_data_buffer), controller.sensor_processor.window_size)
+
+    def test_lookahead_sees_gyro_trend(self):
+        clock = SimulatedClock()
+        controller = DifferentialController(clock=clock)
+        controller.rollover_predictor.lookahead = 0.25
+        for i in range(20):
+            clock.set(0.01 * i)
+            controller.update_control((0.1, 0.05, 9.81), (0.5 * clock(), 0.0, 0.0))
+        np.testing.assert_allclose(controller.sensor_processor.get_gyro_trend(), (0.5, 0.0, 0.0), atol=1e-9)
+
+    def test_ingest_then_step(self):
+        controller = DifferentialController()
+        for i in range(5):
+            controller.ingest_sensor_data((0.1, 0.05, 9.81), (0.0, 0.0, 0.0), 0.01 * i)
+        self.assertEqual(len(controller.sensor_processor.accel_data_buffer), 5)
+        np.testing.assert_array_equal(controller.sensor_processor.accel_data_buffer.timestamps(),
+                                      0.01 * np.arange(5))
+        self.assertIn('risk_assessment', controller.step_control())
+
+
+if __name__ == "__main__":
+    unittest.main()
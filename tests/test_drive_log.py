@@ -0,0 +1,201 @@
+"""
+Troll-vs-Troll Project
+Drive Log Tests
+
+Unit tests for DriveLogWriter and DriveLogReader (src/utils/drive_log.py).
+
+Version: 1.1.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：二进制行驶日志读写测试 - 成功
+# - v1.1.0 2026-10-17: 新增关闭读取器后访问time_range()视图的测试 - 成功
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.control.differential_controller import DifferentialController
+from src.sensors.features import NUM_FEATURES
+from src.utils.drive_log import (
+    HEADER_ALIGN, MAGIC, RECORD_DTYPE, DriveLogReader, DriveLogWriter, read_header
+)
+from src.utils.replay import SimulatedClock
+from src.utils.trajectory_simulator import TrajectorySimulator, to_samples
+
+
+def log_drive(path, samples, block_size=1024):
+    """
+    Log a drive with a 10 Hz controller, as on the device.
+
+    Returns:
+        int: Number of control steps run
+    """
+    clock = SimulatedClock()
+    controller = DifferentialController(clock=clock)
+    controller.sensor_processor.clock = clock
+    steps = 0
+    with DriveLogWriter(path, metadata={'sample_rate': 1000}, block_size=block_size) as writer:
+        for timestamp, accel, gyro, _ in samples:
+            clock.set(timestamp)
+            controller.ingest_sensor_data(accel, gyro, timestamp)
+            output = None
+            if (controller.last_control_time is None
+                    or clock() - controller.last_control_time >= controller.control_interval):
+                output = controller.step_control()
+                steps += 1
+            features = controller.sensor_processor.get_feature_vector()
+            writer.record(timestamp, accel, gyro, features, output)
+    return steps
+
+
+class DriveLogTestCase(unittest.TestCase):
+    """
+    Logs a short 1 kHz drive into a temporary directory.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.samples = to_samples(TrajectorySimulator(seed=3, sample_rate=1000.0).run(3.0))
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        self.path = os.path.join(self._directory.name, 'drive.tvt')
+
+
+class RoundTripTest(DriveLogTestCase):
+    """
+    Records read back as written.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Block size not dividing the sample count exercises the final flush
+        self.steps = log_drive(self.path, self.samples, block_size=100 + 7)
+
+    def test_header(self):
+        header, size = read_header(self.path)
+        self.assertEqual(size % HEADER_ALIGN, 0)
+        self.assertEqual(header['metadata'], {'sample_rate': 1000})
+        self.assertEqual(len(header['feature_names']), NUM_FEATURES)
+
+    def test_samples(self):
+        with DriveLogReader(self.path) as reader:
+            self.assertEqual(len(reader), len(self.samples))
+            self.assertEqual(reader.metadata, {'sample_rate': 1000})
+            np.testing.assert_array_equal(reader.records['timestamp'], self.samples['timestamp'])
+            np.testing.assert_array_equal(reader.records['accel'],
+                                          self.samples['accel'].astype(np.float32))
+            np.testing.assert_array_equal(reader.records['gyro'],
+                                          self.samples['gyro'].astype(np.float32))
+
+    def test_control_steps(self):
+        with DriveLogReader(self.path) as reader:
+            steps = reader.control_steps()
+            self.assertEqual(len(steps), self.steps)
+            self.assertTrue(np.all(steps['risk_level'] >= 0))
+            self.assertFalse(np.any(np.isnan(steps['risk_score'])))
+
+    def test_output_held_between_steps(self):
+        with DriveLogReader(self.path) as reader:
+            records = reader.records
+            step_index = np.flatnonzero(records['control_step'])
+            # Each record repeats the output of the latest control step
+            latest = step_index[np.searchsorted(step_index, np.arange(len(records)), side='right') - 1]
+            np.testing.assert_array_equal(records['left_wheel_speed'],
+                                          records['left_wheel_speed'][latest])
+            np.testing.assert_array_equal(records['risk_score'], records['risk_score'][latest])
+
+
+class TimeRangeTest(DriveLogTestCase):
+    """
+    Time range queries on the memory map.
+    """
+
+    def setUp(self):
+        super().setUp()
+        with DriveLogWriter(self.path) as writer:
+            for timestamp, accel, gyro, _ in self.samples:
+                writer.record(timestamp, accel, gyro)
+
+    def test_bounds(self):
+        with DriveLogReader(self.path) as reader:
+            window = reader.time_range(1.0, 1.5)
+            timestamps = self.samples['timestamp']
+            expected = timestamps[(timestamps >= 1.0) & (timestamps < 1.5)]
+            np.testing.assert_array_equal(window['timestamp'], expected)
+
+    def test_zero_copy(self):
+        with DriveLogReader(self.path) as reader:
+            window = reader.time_range(1.0, 1.5)
+            self.assertTrue(np.shares_memory(window, reader.records))
+
+    def test_view_outlives_reader(self):
+        with DriveLogReader(self.path) as reader:
+            window = reader.time_range(1.0, 1.5)
+        self.assertIsNone(reader.records)
+        timestamps = self.samples['timestamp']
+        inside = (timestamps >= 1.0) & (timestamps < 1.5)
+        np.testing.assert_array_equal(window['timestamp'], timestamps[inside])
+        np.testing.assert_array_equal(window['accel'], self.samples['accel'][inside].astype(np.float32))
+
+    def test_open_ended_and_empty_ranges(self):
+        with DriveLogReader(self.path) as reader:
+            self.assertEqual(reader.index_range(), (0, len(reader)))
+            self.assertEqual(len(reader.time_range(2.0, 1.0)), 0)
+            self.assertEqual(len(reader.time_range(t0=100.0)), 0)
+
+    def test_missing_values_are_nan(self):
+        with DriveLogReader(self.path) as reader:
+            self.assertTrue(np.all(np.isnan(reader.records['features'])))
+            self.assertTrue(np.all(reader.records['risk_level'] == -1))
+            self.assertFalse(np.any(reader.records['control_step']))
+
+
+class AppendTest(DriveLogTestCase):
+    """
+    Reopening a log for appending.
+    """
+
+    def test_torn_record_dropped(self):
+        with DriveLogWriter(self.path) as writer:
+            for timestamp, accel, gyro, _ in self.samples[:50]:
+                writer.record(timestamp, accel, gyro)
+        # Partial last record after a power loss
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00' * 17)
+        with DriveLogWriter(self.path) as writer:
+            self.assertEqual(writer.records_written, 50)
+            writer.record_batch(np.zeros(10, dtype=RECORD_DTYPE))
+        with DriveLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 60)
+            np.testing.assert_array_equal(reader.records['timestamp'][:50],
+                                          self.samples['timestamp'][:50])
+
+    def test_record_batch_after_buffered_records(self):
+        batch = np.zeros(5, dtype=RECORD_DTYPE)
+        batch['timestamp'] = np.arange(5) + 10.0
+        with DriveLogWriter(self.path) as writer:
+            writer.record(1.0, (0.0, 0.0, 9.81))
+            writer.record_batch(batch)
+        with DriveLogReader(self.path) as reader:
+            np.testing.assert_array_equal(reader.timestamps, [1.0, 10.0, 11.0, 12.0, 13.0, 14.0])
+
+    def test_empty_log(self):
+        DriveLogWriter(self.path).close()
+        with DriveLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 0)
+            self.assertEqual(len(reader.time_range(0.0, 1.0)), 0)
+
+    def test_not_a_drive_log(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\x00' * (len(MAGIC) + 4))
+        with self.assertRaises(ValueError):
+            read_header(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
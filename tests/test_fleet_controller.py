@@ -0,0 +1,201 @@
+"""
+Troll-vs-Troll Project
+Fleet Controller Tests
+
+Unit tests for FleetController (src/control/fleet_controller.py).
+
+Version: 1.2.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：车队控制器与单车控制器一致性测试 - 成功
+# - v1.1.0 2026-10-17: 新增逐车陀螺仪趋势与lookahead一致性测试 - 成功
+# - v1.2.0 2026-10-17: 新增批量姿态滤波器一致性测试 - 成功
+
+import unittest
+
+import numpy as np
+
+from src.control.differential_controller import DifferentialController
+from src.control.fleet_controller import FleetController
+from src.sensors import features as F
+from src.sensors.attitude import AttitudeEKF, ComplementaryFilter
+from src.utils.replay import SimulatedClock
+from src.utils.trajectory_simulator import TrajectorySimulator
+
+
+class FleetControllerTestCase(unittest.TestCase):
+    """
+    Runs a fleet and one DifferentialController per carrier on a simulated drive.
+    """
+
+    num_vehicles = 6
+
+    @classmethod
+    def setUpClass(cls):
+        result = TrajectorySimulator(num_vehicles=cls.num_vehicles, seed=21).run(12.0)
+        cls.accel, cls.gyro, cls.timestamps = result['accel'], result['gyro'], result['timestamp']
+
+    def assert_matches_singles(self, fleet, singles, clock, rtol=1e-12):
+        """
+        Tick the fleet and the single controllers together and compare the
+        outputs of every tick and the features of every 37th. The singles
+        get the sample timestamps too, as update_control() would buffer
+        them on the device. Outputs agree within rtol, features to 1e-9.
+
+        Returns:
+            int: Number of control steps with control active
+        """
+        active = 0
+        for i, timestamp in enumerate(self.timestamps):
+            clock.set(timestamp)
+            output = fleet.update_control(self.accel[i], self.gyro[i], timestamp)
+            for v, controller in enumerate(singles):
+                controller.ingest_sensor_data(tuple(self.accel[i, v]), tuple(self.gyro[i, v]), timestamp)
+                if (controller.last_control_time is None
+                        or clock() - controller.last_control_time >= controller.control_interval):
+                    expected = controller.step_control()
+                else:
+                    expected = {'left_wheel_speed': controller.left_wheel_speed,
+                                'right_wheel_speed': controller.right_wheel_speed,
+                                'control_active': controller.control_active}
+                self.assertEqual(output['control_active'][v], expected['control_active'], (i, v))
+                np.testing.assert_allclose(output['left_wheel_speed'][v], expected['left_wheel_speed'],
+                                           rtol=rtol, atol=0)
+                np.testing.assert_allclose(output['right_wheel_speed'][v], expected['right_wheel_speed'],
+                                           rtol=rtol, atol=0)
+                if 'risk_assessment' in expected:
+                    risk = output['risk_assessment']
+                    self.assertEqual(risk['needs_control'][v], expected['risk_assessment']['needs_control'])
+                    np.testing.assert_allclose(risk['risk_score'][v],
+                                               expected['risk_assessment']['risk_score'],
+                                               rtol=rtol, atol=0)
+                    active += int(expected['control_active'])
+            if i % 37 == 0:
+                matrix = fleet.get_feature_matrix()
+                for v, controller in enumerate(singles):
+                    vector = controller.sensor_processor.get_feature_vector()
+                    np.testing.assert_allclose(matrix[v, 1:], vector[1:],
+                                               rtol=1e-9, atol=1e-9)
+                    np.testing.assert_allclose(fleet.get_gyro_trend()[v],
+                                               controller.sensor_processor.get_gyro_trend(),
+                                               rtol=1e-9, atol=1e-9)
+        return active
+
+
+class SingleControllerEquivalenceTest(FleetControllerTestCase):
+    """
+    Per carrier, the fleet matches a DifferentialController fed the same samples.
+    """
+
+    def test_window_sizes(self):
+        for window_size in (1, 2, 10):
+            with self.subTest(window_size=window_size):
+                clock = SimulatedClock()
+                fleet = FleetController(self.num_vehicles, window_size=window_size, clock=clock,
+                                        resync_interval=256)
+                singles = [DifferentialController(clock=clock) for _ in range(self.num_vehicles)]
+                for controller in singles:
+                    controller.sensor_processor.__init__(window_size)
+                    for stats in controller.sensor_processor.axis_stats:
+                        stats.resync_interval = 256
+                active = self.assert_matches_singles(fleet, singles, clock)
+                # The drive has to exercise the control branch
+                self.assertGreater(active, 0)
+
+    def test_lookahead(self):
+        for window_size in (3, 10):
+            with self.subTest(window_size=window_size):
+                clock = SimulatedClock()
+                fleet = FleetController(self.num_vehicles, window_size=window_size, clock=clock)
+                fleet.rollover_predictor.lookahead = 0.25
+                singles = [DifferentialController(clock=clock) for _ in range(self.num_vehicles)]
+                for controller in singles:
+                    controller.sensor_processor.__init__(window_size, clock=clock)
+                    controller.rollover_predictor.lookahead = 0.25
+                # The trend sums in another order, which shifts the risk score in the last bits
+                self.assertGreater(self.assert_matches_singles(fleet, singles, clock, rtol=1e-9), 0)
+
+    def test_attitude_filters(self):
+        # The fleet's vectorized filter matches one scalar filter per controller
+        for factory in (ComplementaryFilter, AttitudeEKF):
+            with self.subTest(filter=factory.__name__):
+                clock = SimulatedClock()
+                fleet = FleetController(self.num_vehicles, clock=clock, attitude=factory(self.num_vehicles))
+                singles = [DifferentialController(clock=clock, attitude=factory())
+                           for _ in range(self.num_vehicles)]
+                self.assertGreater(self.assert_matches_singles(fleet, singles, clock, rtol=1e-9), 0)
+
+    def test_attitude_filter_size(self):
+        with self.assertRaises(ValueError):
+            FleetController(3, attitude=ComplementaryFilter(2))
+
+
+class FleetControllerTest(unittest.TestCase):
+    """
+    Input checks, rate limiting and reset.
+    """
+
+    def test_rejects_wrong_shape(self):
+        fleet = FleetController(3)
+        with self.assertRaises(ValueError):
+            fleet.ingest_sensor_data(np.zeros((2, 3)))
+        with self.assertRaises(ValueError):
+            FleetController(3, window_size=0)
+
+    def test_no_data(self):
+        fleet = FleetController(3)
+        self.assertIsNone(fleet.get_feature_matrix())
+        output = fleet.step_control()
+        self.assertFalse(output['control_active'].any())
+        self.assertNotIn('risk_assessment', output)
+
+    def test_rate_limited(self):
+        clock = SimulatedClock()
+        fleet = FleetController(2, clock=clock)
+        sample = np.tile((0.0, 0.0, 9.81), (2, 1))
+        self.assertIn('risk_assessment', fleet.update_control(sample))
+        clock.advance(0.05)
+        self.assertNotIn('risk_assessment', fleet.update_control(sample))
+        clock.advance(0.05)
+        self.assertIn('risk_assessment', fleet.update_control(sample))
+
+    def test_gyro_trend(self):
+        fleet = FleetController(2, window_size=10)
+        for i in range(15):
+            t = 0.01 * i
+            fleet.ingest_sensor_data(np.tile((0.0, 0.0, 9.81), (2, 1)),
+                                     np.array([[0.1 + 2.0 * t, 0.0, -t], [0.0, 0.0, 0.0]]), t)
+            if i == 1:
+                # Fewer than 3 gyro samples
+                np.testing.assert_array_equal(fleet.get_gyro_trend(), np.zeros((2, 3)))
+        np.testing.assert_allclose(fleet.get_gyro_trend(), [[2.0, 0.0, -1.0], [0.0, 0.0, 0.0]], atol=1e-9)
+
+    def test_gyro_trend_without_timestamps(self):
+        fleet = FleetController(2)
+        for _ in range(5):
+            fleet.ingest_sensor_data(np.zeros((2, 3)), np.ones((2, 3)))
+        np.testing.assert_array_equal(fleet.get_gyro_trend(), np.zeros((2, 3)))
+
+    def test_resync_matches_running_statistics(self):
+        rng = np.random.default_rng(4)
+        fleet = FleetController(4, window_size=5, resync_interval=0)
+        for _ in range(50):
+            fleet.ingest_sensor_data(rng.normal(0.0, 3.0, size=(4, 3)))
+        mean, m2 = fleet._mean.copy(), fleet._m2.copy()
+        fleet.resync()
+        np.testing.assert_allclose(fleet._mean, mean, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(fleet._m2, m2, rtol=1e-9, atol=1e-12)
+
+    def test_reset(self):
+        fleet = FleetController(2)
+        fleet.update_control(np.tile((0.0, 5.0, 8.0), (2, 1)))
+        fleet.reset_control()
+        self.assertIsNone(fleet.last_control_time)
+        self.assertEqual(fleet.sample_count, 0)
+        self.assertIsNone(fleet.get_feature_matrix())
+        self.assertTrue(np.all(fleet.feature_matrix[:, F.ROLL] == 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
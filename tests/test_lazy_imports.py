@@ -0,0 +1,65 @@
+"""
+Troll-vs-Troll Project
+Lazy Import Tests
+
+Checks that importing the control stack loads no heavy optional
+dependency (scikit-learn, SciPy, pandas, the board libraries).
+
+Version: 1.1.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：控制栈延迟导入测试 - 成功
+# - v1.1.0 2026-10-17: 新增imports基准跳过无计时模块的测试 - 成功
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src.main import perf_benchmark
+from src.main.perf_benchmark import HEAVY_MODULES, IMPORT_TARGETS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LazyImportTest(unittest.TestCase):
+    """
+    Each module is imported in a fresh interpreter.
+    """
+
+    def test_no_heavy_modules_loaded(self):
+        for module in IMPORT_TARGETS:
+            with self.subTest(module=module):
+                code = (f"import sys, {module}; "
+                        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+                result = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                                        capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(result.stdout.strip(), "")
+
+
+
+class ImportTimeBenchmarkTest(unittest.TestCase):
+    """
+    The imports benchmark skips modules it gets no timing for.
+    """
+
+    def test_skips_modules_without_timing(self):
+        # sys is already loaded, so -X importtime reports nothing for it
+        targets = ('sys', 'src.no_such_module')
+        output = io.StringIO()
+        with mock.patch.object(perf_benchmark, 'IMPORT_TARGETS', targets), contextlib.redirect_stdout(output):
+            perf_benchmark.bench_import_time(SimpleNamespace(import_budget_ms=0.0))
+        lines = output.getvalue().splitlines()
+        self.assertIn("no import time reported, skipped", lines[1])
+        self.assertIn("import failed, skipped", lines[2])
+        self.assertIn("ModuleNotFoundError", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Troll-vs-Troll Project
+Drive Log Index Tests
+
+Unit tests for DriveLogIndex (src/utils/log_index.py).
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：行驶日志稀疏块索引测试 - 成功
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.utils.drive_log import RECORD_DTYPE, DriveLogReader, DriveLogWriter
+from src.utils.log_index import (
+    DriveLogIndex, find_runs, scan_risk_windows, summarize_blocks
+)
+
+
+def make_records(count=50000, seed=5):
+    """
+    1 kHz records with a few ramps of high risk scores.
+    """
+    rng = np.random.default_rng(seed)
+    records = np.zeros(count, dtype=RECORD_DTYPE)
+    records['timestamp'] = np.arange(count) * 0.001
+    records['risk_score'] = np.clip(rng.normal(0.2, 0.05, count), 0.0, 1.0)
+    records['risk_score'][:150] = np.nan  # before the first assessment
+    for event in rng.choice(count - 3000, size=6, replace=False):
+        records['risk_score'][event:event + 700] = np.linspace(0.5, 0.95, 700)
+    records['control_active'] = records['risk_score'] > 0.3
+    return records
+
+
+class FindRunsTest(unittest.TestCase):
+    """
+    Runs of True values in a mask.
+    """
+
+    def test_runs(self):
+        mask = np.array([True, True, False, True, False, False, True])
+        starts, stops = find_runs(mask)
+        np.testing.assert_array_equal(starts, [0, 3, 6])
+        np.testing.assert_array_equal(stops, [2, 4, 7])
+
+    def test_no_runs(self):
+        starts, stops = find_runs(np.zeros(5, dtype=bool))
+        self.assertEqual(len(starts), 0)
+        self.assertEqual(len(stops), 0)
+
+
+class DriveLogIndexTest(unittest.TestCase):
+    """
+    Indexed queries against full scans of the log.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.records = make_records()
+        cls.block_size = 1024
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'drive.tvt')
+        with DriveLogWriter(self.path) as writer:
+            writer.record_batch(self.records[:30000])
+
+    def open_reader(self):
+        reader = DriveLogReader(self.path)
+        self.addCleanup(reader.close)
+        return reader
+
+    def test_open_saves_index(self):
+        DriveLogIndex.open(self.open_reader(), self.block_size)
+        self.assertTrue(os.path.exists(DriveLogIndex.index_path(self.path)))
+
+    def test_incremental_update_matches_full_build(self):
+        DriveLogIndex.open(self.open_reader(), self.block_size)
+        # 30000 is not a multiple of the block size, so the last block is redone
+        with DriveLogWriter(self.path) as writer:
+            writer.record_batch(self.records[30000:])
+        reader = self.open_reader()
+        index = DriveLogIndex.open(reader)
+        self.assertEqual(index.block_size, self.block_size)
+        full = summarize_blocks(reader.records, 0, self.block_size)
+        self.assertEqual(index.blocks.tobytes(), full.tobytes())
+
+    def test_rewritten_log_reindexed(self):
+        with DriveLogWriter(self.path) as writer:
+            writer.record_batch(self.records[30000:])
+        DriveLogIndex.open(self.open_reader(), self.block_size)
+        # Replace the log by a shorter one
+        os.remove(self.path)
+        with DriveLogWriter(self.path) as writer:
+            writer.record_batch(self.records[:10000])
+        reader = self.open_reader()
+        index = DriveLogIndex.open(reader)
+        full = summarize_blocks(reader.records, 0, self.block_size)
+        self.assertEqual(index.blocks.tobytes(), full.tobytes())
+
+    def test_index_range_matches_reader(self):
+        reader = self.open_reader()
+        index = DriveLogIndex.open(reader, self.block_size)
+        ranges = ((0.0, 0.5), (12.3456, 13.0), (-1.0, 200.0), (29.9995, None), (None, 0.0),
+                  (5.0, 4.0), (100.0, None))
+        for t0, t1 in ranges:
+            with self.subTest(t0=t0, t1=t1):
+                self.assertEqual(index.index_range(t0, t1), reader.index_range(t0, t1))
+
+    def test_risk_windows_match_full_scan(self):
+        reader = self.open_reader()
+        index = DriveLogIndex.open(reader, self.block_size)
+        index.records_read = 0
+        windows = index.risk_windows(0.8)
+        expected = scan_risk_windows(reader.records, 0.8)
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(windows.tobytes(), expected.tobytes())
+        # Only the blocks around the events are read
+        self.assertLess(index.records_read, len(reader) // 2)
+
+    def test_risk_windows_in_time_range(self):
+        reader = self.open_reader()
+        index = DriveLogIndex.open(reader, self.block_size)
+        start, stop = reader.index_range(5.0, 20.0)
+        windows = index.risk_windows(0.8, 5.0, 20.0)
+        expected = scan_risk_windows(reader.records[start:stop], 0.8, start)
+        self.assertEqual(windows.tobytes(), expected.tobytes())
+
+    def test_no_windows_above_threshold(self):
+        index = DriveLogIndex.open(self.open_reader(), self.block_size)
+        self.assertEqual(len(index.risk_windows(1.0)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
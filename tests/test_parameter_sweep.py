@@ -0,0 +1,110 @@
+"""
+Troll-vs-Troll Project
+Parameter Sweep Tests
+
+Unit tests for the control parameter sweep (src/utils/parameter_sweep.py).
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：控制参数网格搜索测试 - 成功
+
+import unittest
+
+import numpy as np
+
+from src.control.differential_controller import DifferentialController
+from src.utils.parameter_sweep import (
+    NEGATIVE_LABELS, PARAMETER_NAMES, ParameterSweep, attach_arrays, evaluate_configs,
+    parameter_grid, share_arrays, simulate_runs
+)
+from src.utils.replay import SimulatedClock
+
+
+class ParameterGridTest(unittest.TestCase):
+    """
+    Config grids.
+    """
+
+    def test_product_with_defaults(self):
+        configs = parameter_grid(control_threshold=(0.3, 0.5), rollover_angle_threshold=(10.0, 15.0, 20.0))
+        self.assertEqual(len(configs), 6)
+        self.assertEqual(set(configs[0]), set(PARAMETER_NAMES))
+        self.assertTrue(all(config['max_wheel_diff'] == 0.3 for config in configs))
+
+    def test_unknown_parameter(self):
+        # window_size is a setting of the sweep, not a swept parameter
+        with self.assertRaises(ValueError):
+            parameter_grid(window_size=(5, 10))
+
+
+class SharedArraysTest(unittest.TestCase):
+    """
+    Input arrays placed in shared memory.
+    """
+
+    def test_round_trip(self):
+        arrays = {'a': np.arange(10.0).reshape(5, 2), 'b': np.array([1, 2, 3], dtype=np.int8)}
+        shm, spec = share_arrays(arrays)
+        try:
+            view_shm, views = attach_arrays(spec)
+            for name, array in arrays.items():
+                np.testing.assert_array_equal(views[name], array)
+                self.assertFalse(views[name].flags.writeable)
+            del views
+            view_shm.close()
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+class ParameterSweepTest(unittest.TestCase):
+    """
+    Sweep results against the serial evaluation and a single controller.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = simulate_runs(num_runs=4, duration=60.0, seed=2)
+        cls.configs = parameter_grid(control_threshold=(0.3, 0.6), max_wheel_diff=(0.2, 0.4),
+                                     rollover_angle_threshold=(10.0, 20.0))
+
+    def test_pool_matches_serial(self):
+        expected = ParameterSweep(self.data, workers=1).run(self.configs)
+        results = ParameterSweep(self.data, workers=2, chunk_configs=3).run(self.configs)
+        self.assertEqual(results.tobytes(), expected.tobytes())
+        self.assertGreater(expected['events'][0], 0)
+
+    def test_chunks_keep_config_order(self):
+        results = ParameterSweep(self.data, workers=1, chunk_configs=3).run(self.configs)
+        for name in PARAMETER_NAMES:
+            np.testing.assert_array_equal(results[name], [config[name] for config in self.configs])
+
+    def test_thresholds_change_results(self):
+        results = ParameterSweep(self.data, workers=1).run(self.configs)
+        # A higher control threshold cannot raise the false-positive rate
+        low = results['control_threshold'] == 0.3
+        self.assertTrue(np.all(results['false_positive_rate'][~low] <= results['false_positive_rate'][low]))
+
+    def test_default_config_matches_differential_controller(self):
+        run = {name: values[:, :1] if values.ndim > 1 else values for name, values in self.data.items()}
+        reference = evaluate_configs(run, parameter_grid())
+
+        clock = SimulatedClock()
+        controller = DifferentialController(clock=clock)
+        controller.sensor_processor.clock = clock
+        steps, active = [], []
+        for i, timestamp in enumerate(self.data['timestamp']):
+            clock.set(timestamp)
+            output = controller.update_control(tuple(self.data['accel'][i, 0]), tuple(self.data['gyro'][i, 0]))
+            if 'risk_assessment' in output:
+                steps.append(i)
+                active.append(output['control_active'])
+        negative = np.isin(self.data['label'][steps, 0], NEGATIVE_LABELS)
+        self.assertAlmostEqual(reference['false_positive_rate'][0],
+                               np.sum(np.array(active) & negative) / negative.sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
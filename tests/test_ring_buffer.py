@@ -0,0 +1,88 @@
+"""
+Troll-vs-Troll Project
+Ring Buffer Tests
+
+Unit tests for RingBuffer (src/sensors/ring_buffer.py).
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：环形缓冲区与deque对比测试 - 成功
+
+import unittest
+from collections import deque
+
+import numpy as np
+
+from src.sensors.ring_buffer import RingBuffer
+
+
+class RingBufferTest(unittest.TestCase):
+    """
+    RingBuffer against a deque(maxlen) reference.
+    """
+
+    def test_matches_deque(self):
+        rng = np.random.default_rng(0)
+        buffer = RingBuffer(capacity=8)
+        reference = deque(maxlen=8)
+        stamps = deque(maxlen=8)
+
+        for i in range(200):
+            if i % 7 == 3:
+                block = rng.normal(size=(rng.integers(1, 12), 3))
+                block_stamps = np.arange(len(block)) + float(i)
+                buffer.extend(block, block_stamps)
+                reference.extend(map(tuple, block))
+                stamps.extend(block_stamps)
+            else:
+                sample = tuple(rng.normal(size=3))
+                buffer.append(sample, float(i))
+                reference.append(sample)
+                stamps.append(float(i))
+
+            np.testing.assert_array_equal(buffer.view(), np.array(reference))
+            np.testing.assert_array_equal(buffer.timestamps(), np.array(stamps))
+            self.assertEqual(len(buffer), len(reference))
+
+    def test_view_is_zero_copy(self):
+        buffer = RingBuffer(capacity=4)
+        for i in range(11):
+            buffer.append((i, i, i), float(i))
+            self.assertTrue(np.shares_memory(buffer.view(), buffer._data))
+
+    def test_partial_view_and_indexing(self):
+        buffer = RingBuffer(capacity=5, width=None)
+        for i in range(9):
+            buffer.append(float(i))
+        np.testing.assert_array_equal(buffer.view(), [4, 5, 6, 7, 8])
+        np.testing.assert_array_equal(buffer.view(2), [7, 8])
+        self.assertEqual(buffer[-1], 8)
+        self.assertTrue(buffer.is_full)
+
+    def test_extend_larger_than_capacity(self):
+        buffer = RingBuffer(capacity=4, width=None)
+        buffer.append(-1.0)
+        buffer.extend(np.arange(10.0))
+        np.testing.assert_array_equal(buffer.view(), [6, 7, 8, 9])
+
+    def test_clear(self):
+        buffer = RingBuffer(capacity=3)
+        buffer.extend(np.ones((3, 3)))
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.view().shape, (0, 3))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(capacity=0)
+        buffer = RingBuffer(capacity=3, with_timestamps=False)
+        with self.assertRaises(ValueError):
+            buffer.timestamps()
+        with self.assertRaises(ValueError):
+            RingBuffer(capacity=3).extend(np.ones((2, 3)), timestamps=[0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,323 @@
+"""
+Troll-vs-Troll Project
+Rollover Prediction Tests
+
+Unit tests for RolloverPredictor (src/ml/rollover_prediction.py).
+
+Version: 1.7.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：特征向量预测路径测试 - 成功
+# - v1.1.0 2026-10-17: 新增批量推理与逐样本一致性测试 - 成功
+# - v1.2.0 2026-10-17: 新增增量学习模式测试 - 成功
+# - v1.3.0 2026-10-17: 新增模型输入布局与后台训练测试 - 成功
+# - v1.4.0 2026-10-17: 新增模型保存/加载与热启动测试 - 成功
+# - v1.5.0 2026-10-17: 新增前瞻(lookahead)风险与批量一致性测试 - 成功
+# - v1.6.0 2026-10-17: 新增批量推理异常分数测试 - 成功
+# - v1.7.0 2026-10-17: 新增带姿态滤波器的批量推理一致性测试 - 成功
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.ml.rollover_prediction import RolloverPredictor, time_to_threshold
+from src.sensors import features as F
+from src.sensors.attitude import AttitudeEKF, ComplementaryFilter
+from src.sensors.data_processor import SensorDataProcessor
+
+
+def make_samples(count=500, seed=3):
+    """
+    Random accelerometer and gyro samples, wide enough to cover every risk level.
+    """
+    rng = np.random.default_rng(seed)
+    accel = rng.normal((0.0, 0.0, 9.81), (3.0, 3.0, 2.0), size=(count, 3))
+    gyro = rng.normal(0.0, 0.5, size=(count, 3))
+    return accel, gyro
+
+
+class RolloverPredictorTestCase(unittest.TestCase):
+    """
+    Shared helpers for the predictor tests.
+    """
+
+    def make_predictor(self, **kwargs):
+        predictor = RolloverPredictor(background_training=False, **kwargs)
+        self.addCleanup(predictor.wait_for_training)
+        return predictor
+
+    def train(self, predictor, with_gyro):
+        accel, gyro = make_samples(count=20)
+        for sample_accel, sample_gyro in zip(accel, gyro):
+            point = predictor.preprocess_sensor_data(tuple(sample_accel), tuple(sample_gyro) if with_gyro else None)
+            predictor.update_model(point)
+        return predictor
+
+    def assert_same_assessment(self, actual, expected, msg=None):
+        self.assertEqual(set(actual), set(expected), msg)
+        for key, value in expected.items():
+            if value is None or isinstance(value, (str, bool, np.bool_)):
+                self.assertEqual(actual[key], value, f"{key}: {msg}")
+            else:
+                self.assertAlmostEqual(float(actual[key]), float(value), delta=1e-9, msg=f"{key}: {msg}")
+
+
+class FeatureVectorPathTest(RolloverPredictorTestCase):
+    """
+    predict_from_features against predict_rollover_risk on the raw readings.
+    """
+
+    def test_matches_raw_path(self):
+        accel, gyro = make_samples()
+        predictor = self.make_predictor()
+        processor = SensorDataProcessor()
+        for i, (sample_accel, sample_gyro) in enumerate(zip(accel, gyro)):
+            processor.add_accel_data(tuple(sample_accel))
+            processor.add_gyro_data(tuple(sample_gyro))
+            self.assert_same_assessment(
+                predictor.predict_from_features(processor.get_feature_vector()),
+                predictor.predict_rollover_risk(tuple(sample_accel), tuple(sample_gyro)),
+                msg=f"sample {i}")
+
+
+class BatchPredictionTest(RolloverPredictorTestCase):
+    """
+    predict_rollover_risk_batch against the per-sample path.
+    """
+
+    def test_matches_per_sample_path(self):
+        accel, gyro = make_samples(count=2000)
+        predictor = self.make_predictor()
+        for rates in (None, gyro):
+            batch = predictor.predict_rollover_risk_batch(accel, rates)
+            for i, sample in enumerate(accel):
+                single = predictor.predict_rollover_risk(tuple(sample), None if rates is None else tuple(rates[i]))
+                del single["anomaly_score"]
+                self.assert_same_assessment({key: batch[key][i] for key in single}, single, msg=f"sample {i}")
+
+    def test_anomaly_scores(self):
+        accel, gyro = make_samples(count=200)
+        self.assertIsNone(self.make_predictor().predict_rollover_risk_batch(accel, gyro)["anomaly_score"])
+        for with_gyro in (False, True):
+            with self.subTest(with_gyro=with_gyro):
+                predictor = self.train(self.make_predictor(), with_gyro)
+                for rates in (None, gyro):
+                    batch = predictor.predict_rollover_risk_batch(accel, rates)["anomaly_score"]
+                    expected = [predictor.predict_rollover_risk(tuple(sample), None if rates is None else tuple(rates[i]))
+                                ["anomaly_score"] for i, sample in enumerate(accel)]
+                    if expected[0] is None:
+                        # A gyro model cannot score accelerometer-only samples
+                        self.assertIsNone(batch)
+                    else:
+                        np.testing.assert_allclose(batch, expected, rtol=1e-12, atol=1e-12)
+
+    def test_attitude_filter(self):
+        # The batch runs its own copy of the filter, live scoring the shared one
+        accel, gyro = make_samples(count=500)
+        timestamps = 0.01 * np.arange(len(accel))
+        for factory in (ComplementaryFilter, AttitudeEKF):
+            with self.subTest(filter=factory.__name__):
+                predictor = self.make_predictor(attitude=factory())
+                batch = predictor.predict_rollover_risk_batch(accel, gyro, timestamps)
+                self.assertFalse(predictor.attitude.initialized)
+                for i, (sample_accel, sample_gyro) in enumerate(zip(accel, gyro)):
+                    predictor.attitude.update(tuple(sample_accel), tuple(sample_gyro), timestamps[i])
+                    single = predictor.predict_rollover_risk(tuple(sample_accel), tuple(sample_gyro))
+                    del single["anomaly_score"]
+                    self.assert_same_assessment({key: batch[key][i] for key in single}, single, msg=f"sample {i}")
+                # Without gyro data the filter cannot run
+                np.testing.assert_array_equal(predictor.predict_rollover_risk_batch(accel)["tilt_angle"],
+                                              self.make_predictor().predict_rollover_risk_batch(accel)["tilt_angle"])
+
+    def test_rejects_bad_shapes(self):
+        predictor = self.make_predictor()
+        with self.assertRaises(ValueError):
+            predictor.predict_rollover_risk_batch(np.zeros((4, 2)))
+        with self.assertRaises(ValueError):
+            predictor.predict_rollover_risk_batch(np.zeros((4, 3)), np.zeros((3, 3)))
+
+
+class LookAheadTest(RolloverPredictorTestCase):
+    """
+    Look-ahead risk from the gyro rates and their trend.
+    """
+
+    def test_time_to_threshold(self):
+        self.assertAlmostEqual(time_to_threshold(10.0, 20.0, 0.0, 15.0), 0.25)
+        self.assertAlmostEqual(time_to_threshold(10.0, 0.0, 40.0, 15.0), 0.5)
+        self.assertAlmostEqual(time_to_threshold(-10.0, -20.0, 0.0, 15.0), 0.25)
+        self.assertEqual(time_to_threshold(10.0, 0.0, 0.0, 15.0), np.inf)
+        self.assertEqual(time_to_threshold(20.0, 0.0, 0.0, 15.0), 0.0)
+
+    def test_rolling_carrier_flagged_early(self):
+        # About 10 deg of roll, rolling further at 30 deg/s
+        accel, rates = (0.0, 1.7, 9.66), (np.radians(30.0), 0.0, 0.0)
+        current = self.make_predictor().predict_rollover_risk(accel, rates)
+        ahead = self.make_predictor(lookahead=0.25).predict_rollover_risk(accel, rates)
+        self.assertGreater(ahead['predicted_tilt'], ahead['tilt_angle'])
+        self.assertGreater(ahead['risk_score'], current['risk_score'])
+        self.assertLess(ahead['time_to_rollover'], 0.25)
+
+    def test_batch_matches_scalar(self):
+        accel, gyro = make_samples(count=2000)
+        trend = np.random.default_rng(5).normal(0.0, 2.0, size=accel.shape)
+        matrix = np.zeros((len(accel), F.NUM_FEATURES))
+        matrix[:, F.ACCEL_MAGNITUDE] = np.linalg.norm(accel, axis=1)
+        matrix[:, F.PITCH] = np.degrees(np.arctan2(accel[:, 0], np.hypot(accel[:, 1], accel[:, 2])))
+        matrix[:, F.ROLL] = np.degrees(np.arctan2(accel[:, 1], accel[:, 2]))
+        matrix[:, F.GYRO_X:F.GYRO_Z + 1] = gyro
+        predictor = self.make_predictor(lookahead=0.25)
+        for trends in (None, trend):
+            batch = predictor.predict_from_features_batch(matrix, trends)
+            for i in range(len(matrix)):
+                single = predictor.predict_from_features(matrix[i], None if trends is None else trends[i])
+                self.assert_same_assessment({key: batch[key][i] for key in single if key != 'anomaly_score'},
+                                            {key: single[key] for key in single if key != 'anomaly_score'},
+                                            msg=f"sample {i}")
+
+    def test_without_horizon_unchanged(self):
+        accel, gyro = make_samples(count=20)
+        predictor = self.make_predictor()
+        processor = SensorDataProcessor()
+        processor.add_sensor_batch(accel, gyro, 0.01 * np.arange(len(accel)))
+        vector = processor.get_feature_vector()
+        plain = predictor.predict_from_features(vector, processor.get_gyro_trend())
+        self.assertNotIn('predicted_tilt', plain)
+        self.assertEqual(plain, predictor.predict_from_features(vector))
+
+
+class IncrementalLearningTest(RolloverPredictorTestCase):
+    """
+    Incremental learning mode with a running scaler and periodic refits.
+    """
+
+    def test_incremental_updates(self):
+        accel, gyro = make_samples()
+        predictor = self.make_predictor(learning_mode="incremental", refit_interval=50)
+        for sample_accel, sample_gyro in zip(accel, gyro):
+            predictor.update_model(predictor.preprocess_sensor_data(tuple(sample_accel), tuple(sample_gyro)))
+        self.assertTrue(predictor.is_trained)
+        self.assertEqual(predictor.scaler.n_samples_seen_, len(accel))
+        self.assertEqual(len(predictor.historical_data), predictor.max_history)
+        result = predictor.predict_rollover_risk((2.0, 4.0, 8.0), (0.1, 0.2, 0.3))
+        self.assertIsNotNone(result["anomaly_score"])
+
+    def test_batch_mode_trains_once(self):
+        accel, _ = make_samples(count=100)
+        predictor = self.make_predictor()
+        for sample in accel[:20]:
+            predictor.update_model(predictor.preprocess_sensor_data(tuple(sample)))
+        self.assertTrue(predictor.is_trained)
+        model = predictor.model
+        for sample in accel[20:]:
+            predictor.update_model(predictor.preprocess_sensor_data(tuple(sample)))
+        self.assertIs(predictor.model, model)
+
+    def test_invalid_learning_mode(self):
+        with self.assertRaises(ValueError):
+            RolloverPredictor(learning_mode="online")
+
+
+class ModelInputTest(RolloverPredictorTestCase):
+    """
+    Layout of the anomaly model input.
+    """
+
+    def test_zero_timestamp_is_kept(self):
+        predictor = self.make_predictor()
+        features = predictor.preprocess_sensor_data((0.0, 0.0, 9.81), (0.1, 0.2, 0.3), 0.0)
+        self.assertEqual(features.shape, (1, 10))
+        self.assertEqual(features[0, -1], 0.0)
+        self.assertEqual(predictor.preprocess_sensor_data((0.0, 0.0, 9.81), time_stamp=0.0).shape, (1, 7))
+
+    def test_gyro_model_scores_every_path(self):
+        predictor = self.train(self.make_predictor(), with_gyro=True)
+        self.assertEqual(predictor.model.n_features, 9)
+        accel, gyro = (2.0, 4.0, 8.0), (0.1, 0.2, 0.3)
+        raw = predictor.predict_rollover_risk(accel, gyro)["anomaly_score"]
+        self.assertIsNotNone(raw)
+        self.assertIsNone(predictor.predict_rollover_risk(accel)["anomaly_score"])
+
+        processor = SensorDataProcessor()
+        processor.add_accel_data(accel)
+        processor.add_gyro_data(gyro)
+        vector = processor.get_feature_vector()
+        self.assertAlmostEqual(predictor.predict_from_features(vector)["anomaly_score"], raw, delta=1e-12)
+        batch = predictor.predict_from_features_batch(vector.reshape(1, -1))["anomaly_score"]
+        self.assertAlmostEqual(batch[0], raw, delta=1e-12)
+
+    def test_accelerometer_model_ignores_gyro(self):
+        predictor = self.train(self.make_predictor(), with_gyro=False)
+        self.assertEqual(predictor.model.n_features, 6)
+        accel = (2.0, 4.0, 8.0)
+        self.assertEqual(predictor.predict_rollover_risk(accel, (0.1, 0.2, 0.3))["anomaly_score"],
+                         predictor.predict_rollover_risk(accel)["anomaly_score"])
+
+    def test_mismatched_layout_is_rejected(self):
+        predictor = self.train(self.make_predictor(), with_gyro=False)
+        with self.assertRaises(ValueError):
+            predictor.score_anomaly(np.zeros((1, 9)))
+        with self.assertRaises(ValueError):
+            predictor.update_model(predictor.preprocess_sensor_data((0.0, 0.0, 9.81), time_stamp=0.0))
+
+    def test_background_training_swaps_model(self):
+        predictor = RolloverPredictor()
+        self.addCleanup(predictor.training_worker.shutdown)
+        self.train(predictor, with_gyro=True)
+        predictor.wait_for_training(timeout=30)
+        self.assertTrue(predictor.is_trained)
+        self.assertEqual(predictor.get_training_metrics()["trainings_completed"], 1)
+
+
+class PersistenceTest(RolloverPredictorTestCase):
+    """
+    save()/load() round trips and warm starts.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "model.npz")
+        accel, gyro = make_samples(count=200)
+        self.points = np.vstack([
+            self.make_predictor().preprocess_sensor_data(tuple(a), tuple(g)) for a, g in zip(accel, gyro)
+        ])
+        self.trained = self.make_predictor(learning_mode="incremental", max_history=200, refit_interval=1000)
+        for point in self.points:
+            self.trained.update_model(point)
+        self.trained.rollover_angle_threshold = 12.0
+        self.trained.save(self.path)
+
+    def test_round_trip_scores(self):
+        loaded = RolloverPredictor.load(self.path, background_training=False)
+        self.assertTrue(loaded.is_trained)
+        self.assertEqual(loaded.rollover_angle_threshold, 12.0)
+        np.testing.assert_array_equal(loaded.model.score_samples(self.points),
+                                      self.trained.model.score_samples(self.points))
+
+    def test_incremental_warm_start(self):
+        loaded = RolloverPredictor.load(self.path, learning_mode="incremental", background_training=False)
+        scaler = loaded.scaler
+        self.assertEqual(scaler.n_samples_seen_, self.trained.model.n_samples)
+        np.testing.assert_allclose(scaler.mean_, self.trained.model.compiled.scaler_mean)
+        loaded.update_model(self.points[0])
+        self.assertEqual(scaler.n_samples_seen_, self.trained.model.n_samples + 1)
+
+    def test_save_without_model(self):
+        with self.assertRaises(ValueError):
+            self.make_predictor().save(self.path)
+
+    def test_unsupported_format_version(self):
+        with np.load(self.path) as data:
+            arrays = dict(data)
+        arrays["format_version"] = np.array(99)
+        np.savez(self.path, **arrays)
+        with self.assertRaises(ValueError):
+            RolloverPredictor.load(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Troll-vs-Troll Project
+Running Scaler Tests
+
+Unit tests for RunningScaler (src/ml/running_scaler.py).
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：增量标准化与StandardScaler对比测试 - 成功
+
+import unittest
+
+import numpy as np
+
+from src.ml.running_scaler import RunningScaler
+
+try:
+    from sklearn.preprocessing import StandardScaler
+except ImportError:
+    StandardScaler = None
+
+
+def make_data(count=1000, seed=1):
+    """
+    Random rows with one constant column.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.normal((0.0, 0.0, 9.81, 1.0), (1.0, 2.0, 0.5, 0.0), size=(count, 4))
+
+
+class RunningScalerTest(unittest.TestCase):
+    """
+    RunningScaler estimates against batch statistics.
+    """
+
+    def test_row_and_block_updates_match_numpy(self):
+        data = make_data()
+        scaler = RunningScaler()
+        for row in data[:500]:
+            scaler.partial_fit(row)
+        scaler.partial_fit(data[500:])
+        self.assertEqual(scaler.n_samples_seen_, len(data))
+        np.testing.assert_allclose(scaler.mean_, data.mean(axis=0))
+        np.testing.assert_allclose(scaler.var_, data.var(axis=0), atol=1e-12)
+        self.assertEqual(scaler.scale_[3], 1.0)
+
+    @unittest.skipIf(StandardScaler is None, "scikit-learn not installed")
+    def test_matches_standard_scaler(self):
+        data = make_data()
+        scaler = RunningScaler()
+        for start in range(0, len(data), 37):
+            scaler.partial_fit(data[start:start + 37])
+        reference = StandardScaler().fit(data)
+        np.testing.assert_allclose(scaler.mean_, reference.mean_)
+        np.testing.assert_allclose(scaler.var_, reference.var_, atol=1e-12)
+        np.testing.assert_allclose(scaler.transform(data), reference.transform(data), atol=1e-9)
+
+    def test_copy_is_independent(self):
+        data = make_data(count=20)
+        scaler = RunningScaler().partial_fit(data[:10])
+        snapshot = scaler.copy()
+        scaler.partial_fit(data[10:])
+        np.testing.assert_allclose(snapshot.mean_, data[:10].mean(axis=0))
+        self.assertEqual(snapshot.n_samples_seen_, 10)
+
+    def test_fit_transform_resets(self):
+        data = make_data(count=50)
+        scaler = RunningScaler().partial_fit(data + 100.0)
+        np.testing.assert_allclose(scaler.fit_transform(data).mean(axis=0), 0.0, atol=1e-12)
+        self.assertEqual(scaler.n_samples_seen_, 50)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            RunningScaler().transform(np.zeros((1, 4)))
+        scaler = RunningScaler().partial_fit(np.zeros((2, 4)))
+        with self.assertRaises(ValueError):
+            scaler.partial_fit(np.zeros((2, 3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Troll-vs-Troll Project
+Running Statistics Tests
+
+Unit tests for the sliding window statistics (src/sensors/running_stats.py),
+checked against numpy over several window sizes.
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：滑动窗口统计与numpy对比测试 - 成功
+
+import unittest
+
+import numpy as np
+
+from src.sensors.running_stats import SlidingWindowStats
+
+
+class SlidingWindowStatsTest(unittest.TestCase):
+    """
+    SlidingWindowStats against numpy mean/std of the same window.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.samples = rng.normal(9.81, 2.0, size=3000)
+
+    def assert_matches_numpy(self, stats, end):
+        window = self.samples[max(0, end - stats.window_size):end]
+        self.assertEqual(stats.count, len(window))
+        self.assertAlmostEqual(stats.mean, np.mean(window), delta=1e-9)
+        self.assertAlmostEqual(stats.std, np.std(window) if len(window) > 1 else 0.0, delta=1e-9)
+        self.assertAlmostEqual(stats.variance, np.var(window) if len(window) > 1 else 0.0, delta=1e-9)
+
+    def test_push_matches_numpy(self):
+        for window_size in (1, 2, 3, 10, 50, 257):
+            with self.subTest(window_size=window_size):
+                stats = SlidingWindowStats(window_size, resync_interval=1000)
+                for i, value in enumerate(self.samples):
+                    stats.push(value)
+                    self.assert_matches_numpy(stats, i + 1)
+
+    def test_without_resync(self):
+        # Add/remove updates alone stay within rounding over a long stream
+        stats = SlidingWindowStats(10, resync_interval=0)
+        for value in self.samples:
+            stats.push(value)
+        self.assert_matches_numpy(stats, len(self.samples))
+
+    def test_values_in_order(self):
+        stats = SlidingWindowStats(4)
+        for value in range(7):
+            stats.push(value)
+        self.assertEqual(stats.values(), [3.0, 4.0, 5.0, 6.0])
+
+    def test_reset(self):
+        stats = SlidingWindowStats(5)
+        for value in self.samples[:20]:
+            stats.push(value)
+        stats.reset()
+        self.assertEqual((stats.count, stats.mean, stats.std), (0, 0.0, 0.0))
+        stats.push(3.0)
+        self.assertEqual(stats.mean, 3.0)
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            SlidingWindowStats(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Troll-vs-Troll Project
+Fixed-Rate Scheduler Tests
+
+Unit tests for FixedRateScheduler (src/main/scheduler.py) and the
+scheduler runtime in src/main/main.py.
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：固定频率调度与传感器时间戳测试 - 成功
+
+import argparse
+import math
+import unittest
+
+from src.main.main import run_scheduler
+from src.main.scheduler import FixedRateScheduler
+
+
+class FakeClock:
+    """
+    Nanosecond clock that only advances when slept on or told to.
+    """
+
+    def __init__(self):
+        self.now_ns = 0
+
+    def __call__(self):
+        return self.now_ns
+
+    def sleep(self, seconds):
+        self.now_ns += int(round(seconds * 1e9))
+
+    def advance(self, seconds):
+        self.now_ns += int(round(seconds * 1e9))
+
+
+class FixedRateSchedulerTest(unittest.TestCase):
+    """
+    Scheduling in fake time, so the results are exact.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = FixedRateScheduler(clock_ns=self.clock, sleep=self.clock.sleep)
+
+    def test_rates_without_drift(self):
+        releases = {'sensor': [], 'control': []}
+        self.scheduler.add_task('sensor', 1000, lambda: releases['sensor'].append(self.clock.now_ns))
+        self.scheduler.add_task('control', 100, lambda: releases['control'].append(self.clock.now_ns))
+        self.scheduler.run(duration=1.0)
+
+        self.assertEqual(len(releases['sensor']), 1000)
+        self.assertEqual(len(releases['control']), 100)
+        self.assertEqual(releases['control'][-1], 990_000_000)
+        stats = self.scheduler.get_stats()
+        self.assertEqual(stats['sensor']['deadline_misses'], 0)
+        self.assertEqual(stats['sensor']['jitter_us']['max'], 0.0)
+
+    def test_overrun_is_missed_and_skipped(self):
+        calls = []
+
+        def slow():
+            calls.append(self.clock.now_ns)
+            if len(calls) == 3:
+                self.clock.advance(0.035)
+
+        self.scheduler.add_task('control', 100, slow)
+        self.scheduler.run(duration=0.1)
+
+        stats = self.scheduler.get_stats()['control']
+        self.assertEqual(stats['deadline_misses'], 1)
+        self.assertEqual(stats['skipped_releases'], 2)
+        # Releases at 30 and 40 ms are skipped; the 50 ms one runs 5 ms late
+        self.assertEqual(calls[3], 55_000_000)
+        self.assertEqual(stats['jitter_us']['max'], 5000.0)
+
+    def test_stop(self):
+        self.scheduler.add_task('once', 10, self.scheduler.stop)
+        self.scheduler.run()
+        self.assertEqual(self.scheduler.get_stats()['once']['releases'], 1)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.run()
+        with self.assertRaises(ValueError):
+            self.scheduler.add_task('bad', 0, lambda: None)
+
+
+class SchedulerRuntimeTest(unittest.TestCase):
+    """
+    run_scheduler() buffers every sample with its timestamp.
+    """
+
+    def test_samples_are_timestamped(self):
+        class Imu:
+            def read(self):
+                return (0.0, 0.0, 9.81), (0.0, 0.0, 0.0)
+
+        class Controller:
+            def __init__(self):
+                self.timestamps = []
+
+            def ingest_sensor_data(self, accel, gyro, timestamp=math.nan):
+                self.timestamps.append(timestamp)
+
+            def step_control(self):
+                pass
+
+        controller = Controller()
+        args = argparse.Namespace(sensor_rate=500.0, control_rate=50.0, duration=0.05)
+        run_scheduler(Imu(), controller, args)
+
+        self.assertGreater(len(controller.timestamps), 10)
+        self.assertTrue(all(math.isfinite(t) for t in controller.timestamps))
+        self.assertEqual(controller.timestamps, sorted(controller.timestamps))
+
+
+if __name__ == "__main__":
+    unittest.main()
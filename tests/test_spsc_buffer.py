@@ -0,0 +1,90 @@
+"""
+Troll-vs-Troll Project
+SPSC Ring Buffer Tests
+
+Unit tests for SPSCRingBuffer (src/sensors/spsc_buffer.py).
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：单生产者/单消费者缓冲区测试 - 成功
+
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from src.sensors.spsc_buffer import SPSCRingBuffer
+
+
+class SPSCRingBufferTest(unittest.TestCase):
+    """
+    Ordering, wraparound and overrun accounting.
+    """
+
+    def test_drain_in_order_across_wraparound(self):
+        buffer = SPSCRingBuffer(capacity=5, width=2)
+        expected = []
+        for round_size in (3, 4, 5, 2, 5):
+            start = len(expected)
+            for i in range(start, start + round_size):
+                self.assertTrue(buffer.push((i, -i), float(i)))
+                expected.append(float(i))
+            values, timestamps = buffer.drain()
+            np.testing.assert_array_equal(timestamps, expected[start:])
+            np.testing.assert_array_equal(values[:, 0], timestamps)
+            np.testing.assert_array_equal(values[:, 1], -timestamps)
+        self.assertEqual(len(buffer), 0)
+
+    def test_max_items(self):
+        buffer = SPSCRingBuffer(capacity=8, width=1)
+        for i in range(6):
+            buffer.push((i,), float(i))
+        _, first = buffer.drain(max_items=4)
+        _, rest = buffer.drain(max_items=4)
+        np.testing.assert_array_equal(first, [0, 1, 2, 3])
+        np.testing.assert_array_equal(rest, [4, 5])
+
+    def test_full_buffer_counts_overruns(self):
+        buffer = SPSCRingBuffer(capacity=4, width=1)
+        results = [buffer.push((i,), float(i)) for i in range(6)]
+        self.assertEqual(results, [True] * 4 + [False] * 2)
+        _, timestamps = buffer.drain()
+        np.testing.assert_array_equal(timestamps, [0, 1, 2, 3])
+        metrics = buffer.get_metrics()
+        self.assertEqual((metrics['pushed'], metrics['overruns'], metrics['high_water']), (4, 2, 4))
+        self.assertEqual((metrics['drained'], metrics['pending'], metrics['drains']), (4, 0, 1))
+
+    def test_two_threads(self):
+        buffer = SPSCRingBuffer(capacity=64, width=2)
+        total = 5000
+        received = []
+
+        def producer():
+            i = 0
+            while i < total:
+                if buffer.push((i, -i), float(i)):
+                    i += 1
+                else:
+                    time.sleep(0)
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        while len(received) < total:
+            values, timestamps = buffer.drain(max_items=50)
+            np.testing.assert_array_equal(values[:, 0], timestamps)
+            received.extend(timestamps.tolist())
+            if not len(timestamps):
+                time.sleep(0)
+        thread.join()
+        self.assertEqual(received, list(range(total)))
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            SPSCRingBuffer(capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Troll-vs-Troll Project
+Model Training Worker Tests
+
+Unit tests for ModelTrainingWorker (src/ml/training_worker.py).
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：后台训练与模型切换测试 - 成功
+
+import importlib.util
+import threading
+import unittest
+
+import numpy as np
+
+from src.ml.training_worker import ModelTrainingWorker, TrainedModel
+
+HAVE_SKLEARN = importlib.util.find_spec("sklearn") is not None
+
+
+@unittest.skipUnless(HAVE_SKLEARN, "scikit-learn not installed")
+class ModelTrainingWorkerTest(unittest.TestCase):
+    """
+    Background fits hand finished models to the callback.
+    """
+
+    def setUp(self):
+        self.data = np.random.default_rng(5).normal(size=(200, 6))
+        self.models = []
+        self.worker = ModelTrainingWorker(self.models.append)
+        self.addCleanup(self.worker.shutdown)
+
+    def test_fit_is_swapped_in(self):
+        self.assertTrue(self.worker.submit(self.data))
+        self.assertTrue(self.worker.wait(timeout=30))
+        self.assertEqual(len(self.models), 1)
+        model = self.models[0]
+        self.assertIsInstance(model, TrainedModel)
+        self.assertEqual(model.n_features, 6)
+        self.assertEqual(model.n_samples, len(self.data))
+
+        metrics = self.worker.get_metrics()
+        self.assertEqual(metrics['trainings_completed'], 1)
+        self.assertFalse(metrics['busy'])
+        self.assertGreaterEqual(metrics['last_swap_latency'], 0.0)
+
+    def test_submit_while_busy_is_skipped(self):
+        release = threading.Event()
+        worker = ModelTrainingWorker(lambda model: release.wait(30))
+        self.addCleanup(worker.shutdown)
+        self.assertTrue(worker.submit(self.data))
+        self.assertFalse(worker.submit(self.data))
+        release.set()
+        self.assertTrue(worker.wait(timeout=30))
+        self.assertEqual(worker.get_metrics()['trainings_skipped'], 1)
+
+    def test_failed_fit_is_counted(self):
+        self.worker.submit(np.empty((0, 6)))
+        self.assertTrue(self.worker.wait(timeout=30))
+        self.assertEqual(self.models, [])
+        self.assertEqual(self.worker.get_metrics()['trainings_failed'], 1)
+        self.assertIsNotNone(self.worker.last_error)
+
+
+if __name__ == "__main__":
+    unittest.main()
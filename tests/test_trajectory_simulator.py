@@ -0,0 +1,87 @@
+"""
+Troll-vs-Troll Project
+Trajectory Simulator Tests
+
+Unit tests for TrolleyDynamics and TrajectorySimulator
+(src/utils/trajectory_simulator.py).
+
+Version: 1.0.0
+"""
+
+## 版本日志
+# - v1.0.0 2026-10-17: 初始版本：侧翻动力学与轨迹仿真测试 - 成功
+
+import unittest
+
+import numpy as np
+
+from src.sensors import features as F
+from src.sensors.data_processor import SensorDataProcessor
+from src.utils.trajectory_simulator import (
+    GRAVITY, TrajectorySimulator, TrolleyDynamics, TrolleyParams, to_samples
+)
+
+
+class TrolleyDynamicsTest(unittest.TestCase):
+    """
+    Steady turns below and above the wheel lift limit.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.params = TrolleyParams()
+        cls.dynamics = TrolleyDynamics(3, cls.params)
+        speed = np.array([1.5, 2.0, 3.0])
+        curvature = np.array([0.5, 1.0, 1.0])  # a_lat = 1.1, 4.0 and 9.0 m/s^2
+        for _ in range(300):
+            cls.accel, cls.gyro = cls.dynamics.step(0.01, speed, curvature)
+        cls.measured_roll = np.degrees(np.arctan2(cls.accel[:, 1], cls.accel[:, 2]))
+
+    def test_left_turn_gives_positive_roll(self):
+        self.assertTrue(np.all(self.measured_roll[:2] > 0))
+
+    def test_tip_over_limit(self):
+        self.assertLess(4.0, self.params.lift_acceleration)
+        self.assertGreater(9.0, self.params.lift_acceleration)
+        np.testing.assert_array_equal(self.dynamics.tipped, [False, False, True])
+
+    def test_imu_roll_is_lateral_accel_plus_body_roll(self):
+        expected = np.degrees(np.arctan2(self.dynamics.lateral_accel[0], GRAVITY) + self.dynamics.roll[0])
+        self.assertAlmostEqual(self.measured_roll[0], expected, delta=1e-6)
+
+    def test_processor_uses_the_same_sign_convention(self):
+        processor = SensorDataProcessor()
+        processor.add_accel_data(tuple(self.accel[0]))
+        self.assertAlmostEqual(processor.get_feature_vector()[F.ROLL], self.measured_roll[0], delta=1e-9)
+
+
+class TrajectorySimulatorTest(unittest.TestCase):
+    """
+    Fleet runs are reproducible and temporally correlated.
+    """
+
+    def test_reproducible(self):
+        first = TrajectorySimulator(num_vehicles=50, seed=4).run(2.0)
+        second = TrajectorySimulator(num_vehicles=50, seed=4).run(1.0)
+        np.testing.assert_array_equal(second['accel'], first['accel'][:100])
+        np.testing.assert_array_equal(second['label'], first['label'][:100])
+
+    def test_result_layout(self):
+        result = TrajectorySimulator(num_vehicles=4, sample_rate=50.0, seed=1).run(2.0)
+        self.assertEqual(result['accel'].shape, (100, 4, 3))
+        self.assertEqual(result['tipped'].shape, (100, 4))
+        np.testing.assert_allclose(result['timestamp'], np.arange(1, 101) / 50.0)
+
+        samples = to_samples(result, vehicle=2)
+        np.testing.assert_array_equal(samples['gyro'], result['gyro'][:, 2])
+        np.testing.assert_array_equal(samples['label'], result['label'][:, 2])
+
+    def test_lateral_accel_is_correlated(self):
+        result = TrajectorySimulator(num_vehicles=10, seed=4, initial_scenario='turning').run(10.0)
+        lateral = result['accel'][:, :, 1]
+        lag1 = np.mean([np.corrcoef(lateral[:-1, v], lateral[1:, v])[0, 1] for v in range(10)])
+        self.assertGreater(lag1, 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()